@@ -13,6 +13,8 @@ from app.db.base import Base
 import app.models.breed  # noqa: F401 — registers Breed model
 import app.models.user   # noqa: F401 — registers User model
 import app.models.dog    # noqa: F401 — registers Dog model
+import app.models.breed_diversity  # noqa: F401 — registers BreedDiversityReport model
+import app.models.dog_ancestry  # noqa: F401 — registers DogAncestry model
 
 # Alembic Config object
 config = context.config
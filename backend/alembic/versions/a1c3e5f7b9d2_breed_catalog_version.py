@@ -0,0 +1,54 @@
+"""breed catalog version, bumped by a trigger on breeds
+
+Revision ID: a1c3e5f7b9d2
+Revises: f6a8b0c23d45
+Create Date: 2026-10-18 18:12:40.316904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b9d2'
+down_revision: Union[str, Sequence[str], None] = 'f6a8b0c23d45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('breed_catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('INSERT INTO breed_catalog_version (id, version) VALUES (1, 0)')
+    # Once per statement, so seeding a few hundred breeds is one bump
+    op.execute(
+        """
+        CREATE FUNCTION bump_breed_catalog_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE breed_catalog_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER breeds_bump_catalog_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON breeds
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_breed_catalog_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS breeds_bump_catalog_version ON breeds')
+    op.execute('DROP FUNCTION IF EXISTS bump_breed_catalog_version()')
+    op.drop_table('breed_catalog_version')
@@ -0,0 +1,107 @@
+"""
+Total-count strategies for paginated lists.
+
+An exact COUNT(*) evaluates the whole filter a second time on every page
+request. Instead, totals are resolved in this order:
+
+1. include_total=false — no counting at all;
+2. an exact count cached for COUNT_CACHE_TTL_SECONDS per normalized filter set;
+3. the planner's row estimate (EXPLAIN) when it is at least
+   COUNT_ESTIMATE_THRESHOLD — large results don't need an exact number;
+4. an exact COUNT(*), which is then cached.
+
+The cache is per process and not invalidated on writes, so a total can lag
+behind by up to the TTL.
+"""
+
+import enum
+import json
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.config import settings
+from app.core import metrics
+from app.core.cache import TTLCache
+
+TotalKind = Literal["exact", "estimated"]
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement> — plans the query without running it."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@dataclass
+class TotalCount:
+    total: int | None
+    kind: TotalKind | None
+
+
+# Exact totals keyed by (scope, filters)
+count_cache = TTLCache(ttl=settings.COUNT_CACHE_TTL_SECONDS)
+metrics.watch_cache("counts", count_cache)
+
+
+def cache_key(scope: str, filters: dict[str, Any]) -> tuple:
+    """Normalize a filter set — unset filters are dropped, order doesn't matter."""
+    return (scope,) + tuple(
+        sorted(
+            (name, value.value if isinstance(value, enum.Enum) else value)
+            for name, value in filters.items()
+            if value is not None
+        )
+    )
+
+
+async def estimate_rows(db: AsyncSession, query: Select) -> int:
+    """Return the planner's row estimate for a query (no rows are read)."""
+    result = await db.execute(
+        Explain(select(literal_column("1")).select_from(query.subquery()))
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(
+    db: AsyncSession,
+    query: Select,
+    scope: str,
+    filters: dict[str, Any],
+    include_total: bool = True,
+) -> TotalCount:
+    """Resolve the total number of rows a list query matches.
+
+    `query` must carry every filter; `filters` names them for the cache key.
+    """
+    if not include_total:
+        return TotalCount(total=None, kind=None)
+
+    key = cache_key(scope, filters)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return TotalCount(total=cached, kind="exact")
+
+    estimate = await estimate_rows(db, query)
+    if estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+        return TotalCount(total=estimate, kind="estimated")
+
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    total = result.scalar_one()
+    count_cache.set(key, total)
+    return TotalCount(total=total, kind="exact")
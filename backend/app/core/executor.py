@@ -0,0 +1,83 @@
+"""
+Bounded thread pools for CPU-heavy work called from async handlers.
+
+Running such work inline blocks the event loop and stalls every other
+request; run() hands it to a fixed number of worker threads instead and
+awaits the result. Work beyond the worker limit waits in the pool's queue,
+and the queue depth is tracked for monitoring.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ExecutorStats:
+    max_workers: int
+    queued: int
+    running: int
+    completed: int
+    max_queued: int
+
+
+class BoundedExecutor:
+    """Fixed-size thread pool with queue-depth counters.
+
+    The pool is created on first use, so importing the module starts no threads.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._max_queued = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name
+            )
+        return self._executor
+
+    def _call(self, func: Callable[..., Any], args: tuple) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) on a worker thread and await its result."""
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), self._call, func, args)
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self.max_workers,
+                queued=self._queued,
+                running=self._running,
+                completed=self._completed,
+                max_queued=self._max_queued,
+            )
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (a later run() starts a new pool)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,208 @@
+"""
+Pedigree genetics — inbreeding and kinship coefficients.
+
+Works on a compact, array-backed pedigree where every animal is an integer
+index and parents always precede their offspring. Unknown parents are
+represented by UNKNOWN (-1) and treated as unrelated, non-inbred founders.
+"""
+
+import heapq
+from collections.abc import Hashable, Mapping
+
+UNKNOWN = -1
+
+
+class Pedigree:
+    """Array-backed pedigree ordered so that parents precede offspring."""
+
+    def __init__(self, keys: list[Hashable], sires: list[int], dams: list[int]):
+        self.keys = keys
+        self.sires = sires
+        self.dams = dams
+        self.index = {key: i for i, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def generations(self) -> list[int]:
+        """Generation number of every animal — founders are 0, others are one
+        past their youngest known parent."""
+        generation = [0] * len(self.keys)
+        for i, (sire, dam) in enumerate(zip(self.sires, self.dams)):
+            generation[i] = 1 + max(
+                generation[sire] if sire != UNKNOWN else -1,
+                generation[dam] if dam != UNKNOWN else -1,
+            )
+        return generation
+
+    @classmethod
+    def from_parents(
+        cls, parents: Mapping[Hashable, tuple[Hashable | None, Hashable | None]]
+    ) -> "Pedigree":
+        """Build a pedigree from a {key: (sire_key, dam_key)} mapping.
+
+        Parents missing from the mapping are treated as unknown.
+
+        Raises:
+            ValueError: If the pedigree contains a cycle.
+        """
+        order: list[Hashable] = []
+        state: dict[Hashable, int] = {}  # 1 = visiting, 2 = done
+
+        for root in parents:
+            if state.get(root) == 2:
+                continue
+            # Iterative post-order DFS — pedigrees can be deeper than the recursion limit
+            stack: list[tuple[Hashable, bool]] = [(root, False)]
+            while stack:
+                key, expanded = stack.pop()
+                if expanded:
+                    state[key] = 2
+                    order.append(key)
+                    continue
+                if state.get(key) == 2:
+                    continue
+                if state.get(key) == 1:
+                    raise ValueError("Wykryto cykl w rodowodzie")
+                state[key] = 1
+                stack.append((key, True))
+                for parent in parents[key]:
+                    if parent is not None and parent in parents and state.get(parent) != 2:
+                        if state.get(parent) == 1:
+                            raise ValueError("Wykryto cykl w rodowodzie")
+                        stack.append((parent, False))
+
+        index = {key: i for i, key in enumerate(order)}
+        sires = [index.get(parents[key][0], UNKNOWN) for key in order]
+        dams = [index.get(parents[key][1], UNKNOWN) for key in order]
+        return cls(order, sires, dams)
+
+
+class InbreedingCalculator:
+    """Wright's inbreeding coefficients via Meuwissen & Luo (1992).
+
+    Each animal's coefficient is derived from the diagonal of the additive
+    relationship matrix, A_ii = sum_j L_ij^2 * D_j, where only ancestors of i
+    contribute. Coefficients and within-family variances (D) of every
+    ancestor are computed once and reused for all descendants, so a whole
+    pedigree costs roughly one ancestor traversal per animal.
+    """
+
+    def __init__(self, pedigree: Pedigree):
+        self.pedigree = pedigree
+        n = len(pedigree)
+        self.f: list[float] = [0.0] * n
+        self.d: list[float] = [0.0] * n
+        self._computed = False
+
+    def _parent_f(self, parent: int) -> float:
+        # Unknown parents get F = -1 so that D = 0.5 - 0.25 * (Fs + Fd)
+        # evaluates to 1.0 / 0.75 for founders / half-founders.
+        return -1.0 if parent == UNKNOWN else self.f[parent]
+
+    def _relationship_diagonal(self, sire: int, dam: int) -> float:
+        """A_ii for an animal with the given parents (ancestors must be computed)."""
+        sires, dams = self.pedigree.sires, self.pedigree.dams
+        total = 0.5 - 0.25 * (self._parent_f(sire) + self._parent_f(dam))  # L_ii^2 * D_i
+
+        contributions: dict[int, float] = {}
+        heap: list[int] = []
+        for parent in (sire, dam):
+            if parent != UNKNOWN:
+                if parent not in contributions:
+                    heapq.heappush(heap, -parent)
+                    contributions[parent] = 0.0
+                contributions[parent] += 0.5
+
+        # Visit ancestors youngest-first so each L_ij is complete when popped
+        while heap:
+            j = -heapq.heappop(heap)
+            r = contributions.pop(j)
+            total += r * r * self.d[j]
+            for parent in (sires[j], dams[j]):
+                if parent != UNKNOWN:
+                    if parent not in contributions:
+                        heapq.heappush(heap, -parent)
+                        contributions[parent] = 0.0
+                    contributions[parent] += 0.5 * r
+
+        return total
+
+    def coefficients(self) -> list[float]:
+        """Return F for every animal in pedigree order."""
+        if self._computed:
+            return self.f
+
+        sires, dams = self.pedigree.sires, self.pedigree.dams
+        for i in range(len(self.pedigree)):
+            s, d = sires[i], dams[i]
+            self.d[i] = 0.5 - 0.25 * (self._parent_f(s) + self._parent_f(d))
+            if s == UNKNOWN or d == UNKNOWN:
+                self.f[i] = 0.0
+            elif i > 0 and s == sires[i - 1] and d == dams[i - 1]:
+                # Full sibling of the previous animal — same coefficient
+                self.f[i] = self.f[i - 1]
+            else:
+                self.f[i] = self._relationship_diagonal(s, d) - 1.0
+
+        self._computed = True
+        return self.f
+
+    def inbreeding(self, key: Hashable) -> float:
+        """Return F for a single animal by key."""
+        return self.coefficients()[self.pedigree.index[key]]
+
+    def offspring_inbreeding(self, sire_key: Hashable, dam_key: Hashable) -> float:
+        """Return F of a hypothetical offspring — equal to the parents' kinship."""
+        self.coefficients()
+        sire = self.pedigree.index.get(sire_key, UNKNOWN)
+        dam = self.pedigree.index.get(dam_key, UNKNOWN)
+        if sire == UNKNOWN or dam == UNKNOWN:
+            return 0.0
+        return self._relationship_diagonal(sire, dam) - 1.0
+
+    def _lineage(self, i: int) -> dict[int, float]:
+        """Row i of L — the genetic contribution of i and each of its ancestors."""
+        sires, dams = self.pedigree.sires, self.pedigree.dams
+        lineage: dict[int, float] = {}
+        contributions = {i: 1.0}
+        heap = [-i]
+        while heap:
+            j = -heapq.heappop(heap)
+            r = contributions.pop(j)
+            lineage[j] = r
+            for parent in (sires[j], dams[j]):
+                if parent != UNKNOWN:
+                    if parent not in contributions:
+                        heapq.heappush(heap, -parent)
+                        contributions[parent] = 0.0
+                    contributions[parent] += 0.5 * r
+        return lineage
+
+    def offspring_inbreeding_many(
+        self, sire_keys: list[Hashable], dam_key: Hashable
+    ) -> list[float]:
+        """Return offspring F for one dam mated with each of many sires.
+
+        Uses A = L D L': the dam's lineage is traced once, and each sire only
+        needs its own lineage dotted against it — F = 0.5 * sum_j L_sj L_dj D_j.
+        """
+        self.coefficients()
+        dam = self.pedigree.index.get(dam_key, UNKNOWN)
+        if dam == UNKNOWN:
+            return [0.0] * len(sire_keys)
+
+        dam_weights = {j: r * self.d[j] for j, r in self._lineage(dam).items()}
+        results = []
+        for sire_key in sire_keys:
+            sire = self.pedigree.index.get(sire_key, UNKNOWN)
+            if sire == UNKNOWN:
+                results.append(0.0)
+                continue
+            relationship = sum(
+                r * dam_weights[j]
+                for j, r in self._lineage(sire).items()
+                if j in dam_weights
+            )
+            results.append(0.5 * relationship)
+        return results
@@ -0,0 +1,185 @@
+"""
+Vectorized kinship computations for whole-breed populations.
+
+The kinship matrix K = 0.5 * L D L' (Henderson's decomposition of the
+additive relationship matrix) is never materialized. Instead, columns of K
+are produced in blocks of `block_size` using one backward pass (L' E) and one
+forward pass (L H) over the pedigree. Animals are renumbered so that each
+generation is a contiguous slice, which turns every step of a pass into a
+single NumPy operation. Memory is O(N * block_size), not N².
+"""
+
+import numpy as np
+
+from app.core.genetics import UNKNOWN, Pedigree
+
+
+class KinshipEngine:
+    """Blocked kinship / inbreeding calculations over an array-backed pedigree.
+
+    Public methods take and return animals in Pedigree index order.
+    """
+
+    def __init__(self, pedigree: Pedigree, block_size: int = 256):
+        n = len(pedigree)
+        self.n = n
+        self.block_size = block_size
+
+        sires = np.asarray(pedigree.sires, dtype=np.int64)
+        dams = np.asarray(pedigree.dams, dtype=np.int64)
+        generation = np.asarray(pedigree.generations(), dtype=np.int64)
+
+        # Renumber animals so every generation is a contiguous slice.
+        # order[new] = pedigree index, rank[pedigree index] = new
+        self.order = np.argsort(generation, kind="stable")
+        self.rank = np.empty(n, dtype=np.int64)
+        self.rank[self.order] = np.arange(n)
+
+        # Unknown parents stay UNKNOWN (-1), which indexes the zero sentinel
+        # row appended to every working array
+        self.sires = self._renumber(sires[self.order])
+        self.dams = self._renumber(dams[self.order])
+
+        counts = np.bincount(generation) if n else np.zeros(0, dtype=np.int64)
+        self.bounds = np.concatenate(([0], np.cumsum(counts)))
+        self.generations = len(counts)
+        self._scatter = [self._scatter_plan(g) for g in range(self.generations)]
+        self._scatter_targets: dict[tuple[int, int], np.ndarray] = {}
+
+        # Inbreeding coefficients and Mendelian sampling variances (D) in
+        # renumbered order, each with a trailing sentinel entry
+        self._f: np.ndarray | None = None
+        self._d: np.ndarray | None = None
+
+    def _renumber(self, parents: np.ndarray) -> np.ndarray:
+        known = parents != UNKNOWN
+        renumbered = np.full_like(parents, UNKNOWN)
+        renumbered[known] = self.rank[parents[known]]
+        return renumbered
+
+    def _scatter_plan(self, g: int) -> tuple[np.ndarray, np.ndarray]:
+        """(child rows, parent rows) for every known parent link of generation g."""
+        start, stop = self.bounds[g], self.bounds[g + 1]
+        children = np.arange(start, stop)
+        parents = np.concatenate((self.sires[start:stop], self.dams[start:stop]))
+        rows = np.concatenate((children, children))
+        known = parents != UNKNOWN
+        return rows[known], parents[known]
+
+    def _backward(self, columns: np.ndarray, upto: int) -> np.ndarray:
+        """G = L' E — push each animal's weight to its ancestors, halving per step."""
+        width = columns.shape[1]
+        flat = columns.reshape(-1)
+        for g in range(upto - 1, 0, -1):
+            rows, parents = self._scatter[g]
+            if len(rows):
+                # Unbuffered add on the flattened array — a parent may appear
+                # many times per generation (popular sires)
+                contribution = columns[rows]
+                contribution *= 0.5
+                np.add.at(flat, self._flat_targets(g, parents, width), contribution.reshape(-1))
+        return columns
+
+    def _flat_targets(self, g: int, parents: np.ndarray, width: int) -> np.ndarray:
+        """Flattened (parent, column) positions, cached for full-width blocks."""
+        key = (g, width)
+        targets = self._scatter_targets.get(key)
+        if targets is None:
+            targets = (parents[:, None] * width + np.arange(width)).reshape(-1)
+            if width == self.block_size:
+                self._scatter_targets[key] = targets
+        return targets
+
+    def _forward(self, columns: np.ndarray, upto: int) -> np.ndarray:
+        """Y = L H — each animal inherits half of each parent's value."""
+        for g in range(1, upto):
+            start, stop = self.bounds[g], self.bounds[g + 1]
+            columns[start:stop] += 0.5 * (
+                columns[self.sires[start:stop]] + columns[self.dams[start:stop]]
+            )
+        return columns
+
+    def _relationship_columns(
+        self, targets: np.ndarray, d: np.ndarray, upto: int
+    ) -> np.ndarray:
+        """A[:m, targets] (= 2K) within generations < upto; row m is the zero sentinel."""
+        m = self.bounds[upto]
+        columns = np.zeros((m + 1, len(targets)))
+        columns[targets, np.arange(len(targets))] = 1.0
+        columns = self._backward(columns, upto)
+        columns *= d[: m + 1, None]
+        return self._forward(columns, upto)
+
+    def _kinship_pairs(
+        self, left: np.ndarray, right: np.ndarray, d: np.ndarray, upto: int
+    ) -> np.ndarray:
+        """Kinship for each (left[k], right[k]) pair, all within generations < upto."""
+        result = np.zeros(len(left))
+        targets, inverse = np.unique(right, return_inverse=True)
+
+        for start in range(0, len(targets), self.block_size):
+            block = targets[start:start + self.block_size]
+            columns = self._relationship_columns(block, d, upto)
+            in_block = (inverse >= start) & (inverse < start + len(block))
+            result[in_block] = 0.5 * columns[left[in_block], inverse[in_block] - start]
+
+        return result
+
+    def _compute(self) -> None:
+        f = np.zeros(self.n + 1)
+        d = np.zeros(self.n + 1)
+        f[-1] = -1.0  # sentinel, so D = 0.5 - 0.25 * (Fs + Fd) is 1.0 for founders
+
+        for g in range(self.generations):
+            start, stop = self.bounds[g], self.bounds[g + 1]
+            sires, dams = self.sires[start:stop], self.dams[start:stop]
+            known = (sires != UNKNOWN) & (dams != UNKNOWN)
+            if known.any():
+                # F of an animal = kinship of its parents, who are all in older generations
+                f[start:stop][known] = self._kinship_pairs(sires[known], dams[known], d, g)
+            d[start:stop] = 0.5 - 0.25 * (f[sires] + f[dams])
+
+        f[-1] = 0.0
+        self._f, self._d = f, d
+
+    def _ensure_computed(self) -> None:
+        if self._f is None:
+            self._compute()
+
+    @property
+    def inbreeding(self) -> np.ndarray:
+        """Wright's inbreeding coefficient for every animal."""
+        self._ensure_computed()
+        return self._f[: self.n][self.rank]
+
+    @property
+    def generation(self) -> np.ndarray:
+        """Generation number of every animal (founders are 0)."""
+        generation = np.repeat(np.arange(self.generations), np.diff(self.bounds))
+        return generation[self.rank]
+
+    def mean_kinship(self, members: np.ndarray) -> float:
+        """Average kinship over all ordered pairs (self-pairs included) of members.
+
+        Uses 1' K 1 = 0.5 * sum_j D_j * (L' 1)_j^2, so a single backward pass
+        over one column is enough.
+        """
+        self._ensure_computed()
+        count = len(members)
+        if count == 0:
+            return 0.0
+        weights = np.zeros((self.n + 1, 1))
+        weights[self.rank[members], 0] = 1.0
+        contributions = self._backward(weights, self.generations)[:, 0]
+        return float(0.5 * np.sum(self._d * contributions**2) / count**2)
+
+    def kinship_columns(self, columns: np.ndarray) -> np.ndarray:
+        """Return K[:, columns] as an (N, len(columns)) array."""
+        self._ensure_computed()
+        block = self._relationship_columns(self.rank[columns], self._d, self.generations)
+        return 0.5 * block[self.rank]
+
+    def offspring_counts(self) -> np.ndarray:
+        """Number of recorded offspring sired by each animal."""
+        known = self.sires[self.sires != UNKNOWN]
+        return np.bincount(known, minlength=self.n)[self.rank]
@@ -0,0 +1,293 @@
+"""
+In-process metrics in the Prometheus text format (GET /metrics).
+
+Counters, gauges and histograms are plain numbers in dicts keyed by label
+values. They are only updated from the event loop thread, so no locks are
+needed, and a request touches the series it already has. Values owned by
+other objects (connection pool, caches, thread pools) are read by
+callbacks when /metrics is scraped, so they cost nothing per request.
+
+MetricsMiddleware records request latency by route template (not by raw
+path, so the number of series stays bounded), requests in flight and
+response status counts.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.executor import BoundedExecutor, ExecutorStats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, Labels, str, float]]:
+        """(suffix, label values, extra label, value) for every series."""
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for suffix, values, extra, value in self.samples():
+            labels = _format_labels(self.labels, values, extra)
+            yield f"{self.name}{suffix}{labels} {_format_value(value)}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        for values, value in self._values.items():
+            yield "", values, "", value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class CallbackGauge(Metric):
+    """Gauge whose values are read from `callback` ({label values: value}) on each scrape."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, help: str, labels: Labels, callback: Callable[[], dict[Labels, float]]
+    ):
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def samples(self):
+        for values, value in self.callback().items():
+            yield "", values, "", value
+
+
+class CallbackCounter(CallbackGauge):
+    kind = "counter"
+
+
+class _Series:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: Labels = (), buckets: tuple = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.bounds = tuple(buckets)
+        self._series: dict[Labels, _Series] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _Series(len(self.bounds) + 1)
+        # Per-bucket counts; made cumulative when rendered
+        series.buckets[bisect_left(self.bounds, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series.count if series is not None else 0
+
+    def samples(self):
+        for values, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.bounds, "+Inf"), series.buckets):
+                cumulative += count
+                le = bound if isinstance(bound, str) else _format_value(bound)
+                yield "_bucket", values, f'le="{le}"', cumulative
+            yield "_sum", values, "", series.sum
+            yield "_count", values, "", series.count
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "".join(line + "\n" for metric in self._metrics for line in metric.render())
+
+
+registry = Registry()
+
+requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "Requests currently being handled.")
+)
+requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "Finished requests by route template and status.",
+        ("method", "route", "status"),
+    )
+)
+request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Request latency by route template, until the response body is sent.",
+        ("method", "route"),
+    )
+)
+
+_caches: dict[str, TTLCache] = {}
+
+
+def watch_cache(name: str, cache: TTLCache) -> None:
+    """Expose a cache's hits, misses, hit ratio and size on /metrics."""
+    _caches[name] = cache
+
+
+def _cache_values(read: Callable[[TTLCache], float]) -> Callable[[], dict[Labels, float]]:
+    return lambda: {(name,): read(cache) for name, cache in _caches.items()}
+
+
+def _hit_ratio(cache: TTLCache) -> float:
+    lookups = cache.hits + cache.misses
+    return cache.hits / lookups if lookups else 0.0
+
+
+registry.register(
+    CallbackCounter(
+        "cache_hits_total", "Cache lookups served from memory.", ("cache",),
+        _cache_values(lambda cache: cache.hits),
+    )
+)
+registry.register(
+    CallbackCounter(
+        "cache_misses_total", "Cache lookups that missed.", ("cache",),
+        _cache_values(lambda cache: cache.misses),
+    )
+)
+registry.register(
+    CallbackGauge(
+        "cache_hit_ratio", "Hits / lookups since start.", ("cache",), _cache_values(_hit_ratio)
+    )
+)
+registry.register(
+    CallbackGauge(
+        "cache_entries", "Entries currently cached.", ("cache",), _cache_values(len)
+    )
+)
+
+
+_executors: dict[str, BoundedExecutor] = {}
+
+
+def watch_executor(executor: BoundedExecutor) -> None:
+    """Expose a thread pool's queue depth and throughput on /metrics."""
+    _executors[executor.name] = executor
+
+
+def _executor_values(
+    read: Callable[[ExecutorStats], float],
+) -> Callable[[], dict[Labels, float]]:
+    return lambda: {(name,): read(ex.stats()) for name, ex in _executors.items()}
+
+
+registry.register(
+    CallbackGauge(
+        "executor_queued", "Calls waiting for a worker thread.", ("executor",),
+        _executor_values(lambda stats: stats.queued),
+    )
+)
+registry.register(
+    CallbackGauge(
+        "executor_running", "Calls running on worker threads.", ("executor",),
+        _executor_values(lambda stats: stats.running),
+    )
+)
+registry.register(
+    CallbackCounter(
+        "executor_completed_total", "Calls finished.", ("executor",),
+        _executor_values(lambda stats: stats.completed),
+    )
+)
+
+
+def _route(scope: Scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label — raw paths would add a series per URL
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Record latency, in-flight requests and status counts per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.dec()
+            method, route = scope["method"], _route(scope)
+            request_duration.observe(time.perf_counter() - started_at, method, route)
+            requests_total.inc(method, route, str(status_code))
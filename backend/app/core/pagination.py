@@ -0,0 +1,185 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, HMAC-signed token holding the sort key of the row at
+the edge of a page, the direction to continue in and a scope naming the list
+and sort order it belongs to. Clients can't forge or reuse a cursor across
+lists, and seeks are served by composite indexes on the sort key instead of
+OFFSET scans.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.config import settings
+
+INVALID_CURSOR = "Nieprawidłowy kursor"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(scope: str, direction: str, values: list[Any]) -> str:
+    """Serialize and sign a cursor pointing after (next) or before (prev) a row."""
+    serialized = [
+        value.isoformat() if isinstance(value, (date, datetime)) else
+        str(value) if isinstance(value, uuid.UUID) else value
+        for value in values
+    ]
+    payload = json.dumps([scope, direction, serialized], separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(cursor: str, scope: str) -> tuple[str, list[Any]]:
+    """Verify a cursor and return (direction, raw key values).
+
+    Raises:
+        ValueError: If the cursor is malformed, tampered with or from another list.
+    """
+    try:
+        encoded_payload, encoded_signature = cursor.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        raise ValueError(INVALID_CURSOR)
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError(INVALID_CURSOR)
+
+    try:
+        cursor_scope, direction, values = json.loads(payload)
+    except ValueError:
+        raise ValueError(INVALID_CURSOR)
+    if cursor_scope != scope or direction not in ("next", "prev"):
+        raise ValueError(INVALID_CURSOR)
+    return direction, values
+
+
+def _parse_value(key: InstrumentedAttribute, value: Any) -> Any:
+    python_type = key.type.python_type
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is uuid.UUID:
+            return uuid.UUID(value)
+    except (TypeError, ValueError):
+        raise ValueError(INVALID_CURSOR)
+    return value
+
+
+@dataclass
+class KeysetPage:
+    items: list[Any]
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    query: Select,
+    keys: list[InstrumentedAttribute],
+    scope: str,
+    cursor: str,
+    limit: int,
+    descending: bool = False,
+) -> KeysetPage:
+    """Fetch one page of an ORM query ordered by `keys`, seeking from a cursor.
+
+    `keys` must end with a unique column (the primary key) so the order is
+    total. An empty cursor starts at the first page. The query must not have
+    an ORDER BY yet.
+
+    Raises:
+        ValueError: If the cursor is invalid for this scope.
+    """
+    direction, after = "next", None
+    if cursor:
+        direction, raw_values = decode_cursor(cursor, scope)
+        if len(raw_values) != len(keys):
+            raise ValueError(INVALID_CURSOR)
+        after = [_parse_value(key, value) for key, value in zip(keys, raw_values)]
+
+    # Walking backwards = seeking the opposite way in the reversed order
+    reverse = descending != (direction == "prev")
+    if after is not None:
+        row_key, bound = tuple_(*keys), tuple_(*after)
+        query = query.where(row_key < bound if reverse else row_key > bound)
+    query = query.order_by(*[key.desc() if reverse else key.asc() for key in keys])
+
+    # One extra row tells whether there is anything beyond this page
+    result = await db.execute(query.limit(limit + 1))
+    items = list(result.scalars().unique().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+    if direction == "prev":
+        items.reverse()
+
+    def key_of(item: Any) -> list[Any]:
+        return [getattr(item, key.key) for key in keys]
+
+    next_cursor = prev_cursor = None
+    if items:
+        if (direction == "next" and has_more) or direction == "prev":
+            next_cursor = encode_cursor(scope, "next", key_of(items[-1]))
+        if (direction == "prev" and has_more) or (direction == "next" and after is not None):
+            prev_cursor = encode_cursor(scope, "prev", key_of(items[0]))
+
+    return KeysetPage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def paginate_sequence(
+    items: Sequence[Any],
+    key: Callable[[Any], tuple],
+    scope: str,
+    cursor: str,
+    limit: int,
+) -> KeysetPage:
+    """Keyset pagination over an in-memory sequence already sorted by `key`.
+
+    Raises:
+        ValueError: If the cursor is invalid for this scope.
+    """
+    keys = [key(item) for item in items]
+    start, stop = 0, min(limit, len(items))
+    direction = "next"
+    if cursor:
+        direction, values = decode_cursor(cursor, scope)
+        bound = tuple(values)
+        try:
+            if direction == "next":
+                start = bisect_right(keys, bound)
+                stop = min(start + limit, len(items))
+            else:
+                stop = bisect_left(keys, bound)
+                start = max(stop - limit, 0)
+        except TypeError:
+            raise ValueError(INVALID_CURSOR)
+
+    page = list(items[start:stop])
+    next_cursor = prev_cursor = None
+    if page:
+        if stop < len(items):
+            next_cursor = encode_cursor(scope, "next", list(keys[stop - 1]))
+        if start > 0:
+            prev_cursor = encode_cursor(scope, "prev", list(keys[start]))
+    return KeysetPage(items=page, next_cursor=next_cursor, prev_cursor=prev_cursor)
@@ -0,0 +1,81 @@
+"""
+Per-endpoint query budgets.
+
+Endpoints declare with @query_budget(n) how many SQL statements one
+request may run in the worst case (every cache cold). QueryBudgetMiddleware,
+enabled by QUERY_BUDGET_CHECK, reports the count in an X-Query-Count header
+and turns a response that went over budget into a 500. Statements are
+counted by app.core.sql_metrics; tests count with the query_counter fixture.
+
+Statements run after the response has started (streamed bodies,
+background tasks) are not checked by the middleware. Breed catalog
+reloads happen at most once per TTL, not per request, and aren't counted.
+"""
+
+import logging
+from collections.abc import Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.sql_metrics import count_queries
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(limit: int | None) -> Callable:
+    """Declare the most statements one request to the endpoint may run.
+
+    None means the count grows with the input (e.g. bulk imports) and isn't checked.
+    """
+
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.query_budget = limit
+        return endpoint
+
+    return decorate
+
+
+class QueryBudgetMiddleware:
+    """Count statements per request and fail requests that exceed their endpoint's budget."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        replaced = False
+
+        async def send_with_count(message: Message) -> None:
+            nonlocal replaced
+            if message["type"] == "http.response.start":
+                # The router stores the matched endpoint in the scope
+                budget = getattr(scope.get("endpoint"), "query_budget", None)
+                if budget is not None and counter.count > budget:
+                    replaced = True
+                    logger.warning(
+                        "%s %s ran %d SQL statements (budget %d):\n%s",
+                        scope["method"],
+                        scope["path"],
+                        counter.count,
+                        budget,
+                        "\n".join(counter.statements),
+                    )
+                    response = JSONResponse(
+                        {"detail": f"Query budget exceeded: {counter.count} > {budget}"},
+                        status_code=500,
+                        headers={"X-Query-Count": str(counter.count)},
+                    )
+                    await response(scope, receive, send)
+                    return
+                MutableHeaders(scope=message).append("X-Query-Count", str(counter.count))
+            elif replaced:
+                return
+            await send(message)
+
+        with count_queries() as counter:
+            await self.app(scope, receive, send_with_count)
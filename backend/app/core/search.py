@@ -0,0 +1,118 @@
+"""
+Accent- and case-insensitive text search backed by pg_trgm.
+
+Searched columns are compared as f_unaccent(lower(column)) — f_unaccent is an
+IMMUTABLE wrapper around the unaccent extension created by a migration — and
+every such expression has a GIN gin_trgm_ops index. Trigram indexes serve
+both substring matches (LIKE '%term%') and the word-similarity operator
+(%>), so neither needs a sequential scan.
+
+Search terms are normalized in Python the same way unaccent normalizes the
+column ("Łódź" -> "lodz"), so only the column side runs through SQL functions.
+"""
+
+import unicodedata
+
+from sqlalchemy import ColumnElement, Index, func, or_, text
+
+# Relevance order has no stable sort key to seek on
+FUZZY_CURSOR_ERROR = "Wyszukiwanie przybliżone nie obsługuje paginacji kursorem"
+
+# pg_trgm's default similarity threshold, for the in-memory fallback below
+SIMILARITY_THRESHOLD = 0.3
+
+# Letters unaccent maps that NFKD decomposition leaves untouched
+_UNACCENT_EXTRA = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss"})
+
+# Wildcards typed by the user are matched literally in LIKE patterns
+_LIKE_ESCAPE = str.maketrans({"\\": "\\\\", "%": "\\%", "_": "\\_"})
+
+
+def normalize_text(value: str) -> str:
+    """Lower-case and strip diacritics: "Owczarek Łaciaty" -> "owczarek laciaty"."""
+    decomposed = unicodedata.normalize("NFKD", value.lower().translate(_UNACCENT_EXTRA))
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).strip()
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index on the search form of a column, for __table_args__."""
+    return Index(name, text(f"f_unaccent(lower({column})) gin_trgm_ops"), postgresql_using="gin")
+
+
+def searchable(column: ColumnElement) -> ColumnElement:
+    """The indexed search form of a column."""
+    return func.f_unaccent(func.lower(column))
+
+
+def prefix_key(column: ColumnElement) -> ColumnElement:
+    """Byte-ordered search form of a column — B-tree prefix indexes are built on it.
+
+    With the "C" collation a plain B-tree index serves both LIKE 'prefix%'
+    and ORDER BY, so a typeahead lookup is one short index range scan.
+    """
+    return searchable(column).collate("C")
+
+
+def starts_with(column: ColumnElement, prefix: str) -> ColumnElement:
+    """The column starts with the prefix, ignoring case and diacritics."""
+    escaped = normalize_text(prefix).translate(_LIKE_ESCAPE)
+    return prefix_key(column).like(f"{escaped}%", escape="\\")
+
+
+def contains(columns: list[ColumnElement], term: str) -> ColumnElement:
+    """Any of the columns contains the term, ignoring case and diacritics."""
+    pattern = f"%{normalize_text(term).translate(_LIKE_ESCAPE)}%"
+    return or_(*[searchable(column).like(pattern, escape="\\") for column in columns])
+
+
+def fuzzy_match(
+    columns: list[ColumnElement], term: str
+) -> tuple[ColumnElement, ColumnElement]:
+    """Typo-tolerant match of the term against any of the columns.
+
+    Returns (condition, rank). A row matches when a column contains the term
+    or one of its words is similar enough to it (pg_trgm.word_similarity_threshold);
+    rank is the best word similarity across the columns, for ORDER BY ... DESC.
+    """
+    normalized = normalize_text(term)
+    pattern = f"%{normalized.translate(_LIKE_ESCAPE)}%"
+    condition = or_(
+        *[searchable(column).like(pattern, escape="\\") for column in columns],
+        *[searchable(column).op("%>")(normalized) for column in columns],
+    )
+    scores = [func.word_similarity(normalized, searchable(column)) for column in columns]
+    rank = scores[0] if len(scores) == 1 else func.greatest(*scores)
+    return condition, rank
+
+
+def _trigrams(value: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two spaces before, one after."""
+    grams = set()
+    for word in value.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(left: str, right: str) -> float:
+    """Trigram similarity of two normalized strings, as pg_trgm's similarity()."""
+    a, b = _trigrams(left), _trigrams(right)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def fuzzy_score(term: str, names: list[str]) -> float:
+    """In-memory counterpart of fuzzy_match for already-normalized names.
+
+    Returns 1.0 for a substring match, otherwise the best trigram similarity
+    of the term to a whole name or one of its words; 0.0 below the threshold.
+    """
+    normalized = normalize_text(term)
+    best = 0.0
+    for name in names:
+        if normalized in name:
+            return 1.0
+        for candidate in (name, *name.split()):
+            best = max(best, similarity(normalized, candidate))
+    return best if best >= SIMILARITY_THRESHOLD else 0.0
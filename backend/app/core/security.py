@@ -4,11 +4,19 @@ import bcrypt
 from jose import jwt
 
 from app.config import settings
+from app.core import metrics
+from app.core.executor import BoundedExecutor
+
+# bcrypt releases the GIL while hashing, so worker threads run in parallel
+# and the event loop stays free to serve other requests
+password_executor = BoundedExecutor("password", max_workers=settings.PASSWORD_HASH_WORKERS)
+metrics.watch_executor(password_executor)
 
 
 def hash_password(password: str) -> str:
-    """Hash a plain-text password using bcrypt."""
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    """Hash a plain-text password using bcrypt with the configured cost."""
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -16,6 +24,26 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+def password_cost(hashed_password: str) -> int:
+    """Read the bcrypt cost factor from a hash ("$2b$12$..." -> 12)."""
+    return int(hashed_password.split("$")[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a cost other than BCRYPT_ROUNDS."""
+    return password_cost(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the password worker pool — use this in async code."""
+    return await password_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() on the password worker pool — use this in async code."""
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(subject: str) -> str:
     """Create a short-lived JWT access token.
 
@@ -29,16 +57,16 @@ def create_access_token(subject: str) -> str:
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
 
-def create_refresh_token(subject: str) -> str:
+def create_refresh_token(subject: str, jti: str, family_id: str, expire: datetime) -> str:
     """Create a long-lived JWT refresh token.
 
     Args:
         subject: The user ID to embed in the token payload.
+        jti: Unique token ID, recorded by the refresh token store.
+        family_id: ID shared by all tokens rotated from the same login.
+        expire: Expiry time (the store keeps the same value).
     """
-    expire = datetime.now(timezone.utc) + timedelta(
-        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-    )
-    payload = {"sub": subject, "exp": expire, "type": "refresh"}
+    payload = {"sub": subject, "exp": expire, "type": "refresh", "jti": jti, "fam": family_id}
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
 
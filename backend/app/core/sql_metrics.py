@@ -0,0 +1,200 @@
+"""
+Per-request SQL instrumentation and the slow-query log.
+
+Engine event hooks count and time every statement sent through an Engine.
+count_queries() collects them for the current context; blocks may be
+nested (the request, a query budget, a test) and each sees every
+statement run inside it. SqlMetricsMiddleware wraps each request in one:
+the statement count, total database time and the slowest statement go
+into a Server-Timing header and one structured log line per request.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged wherever they
+run, with normalized SQL (literals and parameters replaced by ?) and,
+with SLOW_QUERY_EXPLAIN, the plan from EXPLAIN. EXPLAIN without ANALYZE
+only plans the statement — nothing runs twice.
+"""
+
+import logging
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0  # seconds
+    slowest: float = 0.0
+    slowest_statement: str | None = None
+    statements: list[str] = field(default_factory=list)
+
+
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+_PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement with literals and parameters as ?, lists of them as ... and one-line spacing."""
+    sql = _LITERAL.sub("?", statement)
+    sql = _PARAMETER.sub("?", sql)
+    sql = _PARAMETER_LIST.sub("...", sql)
+    return " ".join(sql.split())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    for stats in _active.get():
+        stats.count += 1
+        stats.statements.append(statement)
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, "query_started_at", None)
+    if started_at is None:
+        return
+    duration = time.perf_counter() - started_at
+    for stats in _active.get():
+        stats.duration += duration
+        if duration > stats.slowest:
+            stats.slowest = duration
+            stats.slowest_statement = statement
+    if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _log_slow_query(conn, statement, parameters, context, executemany, duration)
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    # A separate DBAPI cursor: the statement's own results haven't been fetched
+    # yet, and going through the Connection would fire these hooks again
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _log_slow_query(conn, statement, parameters, context, executemany, duration) -> None:
+    sql = normalize_sql(statement)
+    plan = None
+    if (
+        settings.SLOW_QUERY_EXPLAIN
+        and not executemany
+        and not context.execution_options.get("stream_results")
+        and sql.upper().startswith(_EXPLAINABLE)
+    ):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception:
+            logger.exception("EXPLAIN failed for slow query: %s", sql)
+
+    logger.warning(
+        "slow query duration_ms=%.1f sql=%s%s",
+        duration * 1000,
+        sql,
+        f"\n{plan}" if plan else "",
+        extra={"sql": sql, "duration_ms": round(duration * 1000, 1), "plan": plan},
+    )
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count and time the statements executed in this context until the block exits."""
+    stats = QueryStats()
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def uncounted() -> Iterator[None]:
+    """Leave the statements executed in this block out of every active count."""
+    token = _active.set(())
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """Server-Timing header value: database time, slowest statement and the whole request."""
+    return (
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest * 1000:.1f}, "
+        f"app;dur={elapsed * 1000:.1f}"
+    )
+
+
+class SqlMetricsMiddleware:
+    """Report each request's SQL statements in a Server-Timing header and a log line."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", server_timing(stats, time.perf_counter() - started_at)
+                )
+            await send(message)
+
+        with count_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # Logged once the body is sent, so streamed responses are complete
+                elapsed = time.perf_counter() - started_at
+                route = getattr(scope.get("route"), "path", scope["path"])
+                slowest = normalize_sql(stats.slowest_statement or "")
+                logger.info(
+                    "request method=%s route=%s status=%d duration_ms=%.1f "
+                    "sql_count=%d sql_ms=%.1f slowest_ms=%.1f slowest_sql=%s",
+                    scope["method"],
+                    route,
+                    status_code,
+                    elapsed * 1000,
+                    stats.count,
+                    stats.duration * 1000,
+                    stats.slowest * 1000,
+                    slowest,
+                    extra={
+                        "method": scope["method"],
+                        "route": route,
+                        "status": status_code,
+                        "duration_ms": round(elapsed * 1000, 1),
+                        "sql_count": stats.count,
+                        "sql_ms": round(stats.duration * 1000, 1),
+                        "slowest_ms": round(stats.slowest * 1000, 1),
+                        "slowest_sql": slowest,
+                    },
+                )
@@ -0,0 +1,58 @@
+"""
+Prefix trie for in-memory typeahead over small, rarely changing catalogs.
+"""
+
+from typing import Any
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.values: list[Any] = []
+
+
+class PrefixTrie:
+    """Maps string keys to values and finds values by key prefix.
+
+    A value may be stored under several keys (e.g. every word of a name);
+    search() returns each value once, in key order.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: str, value: Any) -> None:
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+        node.values.append(value)
+        self._size += 1
+
+    def search(self, prefix: str, limit: int) -> list[Any]:
+        """Return up to `limit` distinct values whose key starts with prefix."""
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        found: list[Any] = []
+        seen: set[int] = set()
+        # Depth-first, children in character order — shorter keys come first
+        stack = [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            for value in node.values:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    found.append(value)
+                    if len(found) == limit:
+                        break
+            stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+        return found
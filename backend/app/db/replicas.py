@@ -0,0 +1,211 @@
+"""
+Read replicas for read-only endpoints.
+
+Routes that only read take their session from get_read_db, which picks a
+replica from DATABASE_READ_URLS — round robin, or the one with the fewest
+connections in use. A replica that can't be connected to
+DB_REPLICA_MAX_FAILURES times in a row is skipped for
+DB_REPLICA_RETRY_SECONDS; with no healthy replica, reads go to the primary.
+
+Replicas lag behind the primary, so after a request that committed, the
+response carries an X-Primary-Until timestamp (READ_YOUR_WRITES_SECONDS
+ahead). A client that sends it back has its reads served by the primary
+until then and sees its own writes. The header works whichever worker
+process serves the next request.
+"""
+
+import logging
+import math
+import time
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import AsyncExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+STRATEGIES = ("round_robin", "least_connections")
+
+# Errors that mean the replica can't be reached (refused, timed out, gone)
+CONNECT_ERRORS = (DBAPIError, OSError, TimeoutError)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: Callable[[], AsyncSession]
+    failures: int = 0
+    down_until: float = 0.0
+
+    @property
+    def in_use(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+
+
+class ReplicaSet:
+    """Replica choice and health tracking."""
+
+    def __init__(
+        self,
+        engines: Iterable[AsyncEngine],
+        strategy: str = "round_robin",
+        max_failures: int = 3,
+        retry_after: float = 30.0,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.replicas = [
+            Replica(
+                name=engine.url.render_as_string(hide_password=True),
+                engine=engine,
+                session_factory=async_sessionmaker(
+                    bind=engine, class_=AsyncSession, expire_on_commit=False
+                ),
+            )
+            for engine in engines
+        ]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.retry_after = retry_after
+        self._turn = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def healthy(self) -> list[Replica]:
+        now = time.monotonic()
+        return [replica for replica in self.replicas if replica.down_until <= now]
+
+    def choose(self) -> Replica | None:
+        """Next replica to read from, or None if none is healthy."""
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_use)
+        replica = healthy[self._turn % len(healthy)]
+        self._turn += 1
+        return replica
+
+    def mark_failed(self, replica: Replica) -> None:
+        replica.failures += 1
+        if replica.failures >= self.max_failures:
+            replica.failures = 0
+            replica.down_until = time.monotonic() + self.retry_after
+            logger.warning(
+                "Read replica %s marked unhealthy for %.0fs", replica.name, self.retry_after
+            )
+
+    def mark_ok(self, replica: Replica) -> None:
+        replica.failures = 0
+
+    async def session(self) -> AsyncSession | None:
+        """Session already connected to a healthy replica; None if none can be reached."""
+        for _ in range(len(self.replicas)):
+            replica = self.choose()
+            if replica is None:
+                return None
+            session = replica.session_factory()
+            try:
+                # Connect now, so a dead replica fails over before the handler runs
+                await session.connection()
+            except CONNECT_ERRORS:
+                await session.close()
+                logger.warning("Read replica %s unreachable", replica.name, exc_info=True)
+                self.mark_failed(replica)
+                continue
+            self.mark_ok(replica)
+            return session
+        return None
+
+    async def session_factory(self) -> Callable[[], AsyncSession] | None:
+        """Session factory of a replica that was just reached; None if none can be reached.
+
+        For sessions opened later, e.g. by a streamed response: one connection
+        is made now, so a dead replica fails over before the response starts.
+        """
+        for _ in range(len(self.replicas)):
+            replica = self.choose()
+            if replica is None:
+                return None
+            try:
+                async with replica.engine.connect():
+                    pass
+            except CONNECT_ERRORS:
+                logger.warning("Read replica %s unreachable", replica.name, exc_info=True)
+                self.mark_failed(replica)
+                continue
+            self.mark_ok(replica)
+            return replica.session_factory
+        return None
+
+    async def warm(self, connections: int) -> None:
+        """Open `connections` per replica; replicas that can't be reached count a failure."""
+        for replica in self.replicas:
+            try:
+                async with AsyncExitStack() as stack:
+                    for _ in range(connections):
+                        await stack.enter_async_context(replica.engine.connect())
+            except CONNECT_ERRORS:
+                logger.warning("Read replica %s unreachable", replica.name, exc_info=True)
+                self.mark_failed(replica)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def wants_primary(headers: Mapping[str, str]) -> bool:
+    """True while the client is inside the read-your-writes window of its last write."""
+    try:
+        return float(headers.get(PRIMARY_UNTIL_HEADER, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+# Set per request by ReadYourWritesMiddleware; [True] once a session commits
+_committed: ContextVar[list[bool] | None] = ContextVar("committed", default=None)
+
+
+@event.listens_for(Session, "after_commit")
+def _note_commit(session: Session) -> None:
+    committed = _committed.get()
+    if committed is not None:
+        committed[0] = True
+
+
+class ReadYourWritesMiddleware:
+    """Add X-Primary-Until to responses of requests that committed a transaction."""
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        committed = [False]
+
+        async def send_with_window(message: Message) -> None:
+            if message["type"] == "http.response.start" and committed[0]:
+                # Truncated, not rounded, so the window never grows past `window`
+                until = math.floor((time.time() + self.window) * 1000) / 1000
+                MutableHeaders(scope=message).append(PRIMARY_UNTIL_HEADER, f"{until:.3f}")
+            await send(message)
+
+        token = _committed.set(committed)
+        try:
+            await self.app(scope, receive, send_with_window)
+        finally:
+            _committed.reset(token)
@@ -1,11 +1,144 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import time
+import uuid
+from contextlib import AsyncExitStack
+from typing import Any
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import app.core.sql_metrics  # noqa: F401 — statement timing and the slow-query log
+from app.config import Settings, settings
+from app.core import metrics
+from app.db.replicas import ReplicaSet
+
+# Label of the primary's pool; replicas' pools are labelled with their URL
+PRIMARY = "primary"
+
+pool_wait = metrics.registry.register(
+    metrics.Histogram(
+        "db_pool_wait_seconds",
+        "Time to get a connection from the pool (queueing and opening new connections).",
+        ("pool",),
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    )
+)
+
+
+class TimedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout took in db_pool_wait_seconds.
+
+    Labelled with the pool's logging name (pool_logging_name), which survives
+    the pool being recreated by engine.dispose().
+    """
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_wait.observe(time.perf_counter() - started_at, self.logging_name or PRIMARY)
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(config: Settings, pool_name: str = PRIMARY) -> dict[str, Any]:
+    """Keyword arguments for create_async_engine from the DB_* settings.
+
+    `pool_name` labels the pool's series in the db_pool_* metrics.
+    """
+    if config.DB_PGBOUNCER:
+        # PgBouncer may run each transaction on a different server connection,
+        # where a cached (or same-named) prepared statement doesn't exist
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    else:
+        connect_args = {"statement_cache_size": config.DB_STATEMENT_CACHE_SIZE}
+    return {
+        "poolclass": TimedPool,
+        "pool_logging_name": pool_name,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def replica_engine_options(config: Settings, url: str) -> dict[str, Any]:
+    """engine_options for the read replica at `url`, which has to fail fast when it's down."""
+    # Same name as ReplicaSet gives the replica in its log lines
+    options = engine_options(config, make_url(url).render_as_string(hide_password=True))
+    # Fail over in seconds instead of waiting for asyncpg's 60s connect timeout
+    options["connect_args"]["timeout"] = config.DB_REPLICA_CONNECT_TIMEOUT
+    return options
 
-from app.config import settings
 
 # Create async engine — manages connection pool to PostgreSQL
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,  # Set to True to log all SQL queries (useful for debugging)
+    **engine_options(settings),
+)
+
+
+def _pool_stats() -> dict[tuple[str, ...], float]:
+    stats = {}
+    pools = [(PRIMARY, engine)] + [(r.name, r.engine) for r in read_replicas.replicas]
+    for name, pool_engine in pools:
+        # Read through the engine: dispose() replaces the pool
+        pool = pool_engine.sync_engine.pool
+        stats[(name, "size")] = pool.size()
+        stats[(name, "checked_out")] = pool.checkedout()
+        stats[(name, "checked_in")] = pool.checkedin()
+        # Negative while fewer than `size` connections have been opened
+        stats[(name, "overflow")] = pool.overflow()
+    return stats
+
+
+metrics.registry.register(
+    metrics.CallbackGauge(
+        "db_pool_connections",
+        "Connection pool state, for the primary and each read replica.",
+        ("pool", "state"),
+        _pool_stats,
+    )
+)
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open connections up front so the first requests don't pay for connecting.
+
+    They are held at the same time (so each one is a new connection) and then
+    returned to the pool.
+    """
+    async with AsyncExitStack() as stack:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(connections):
+                group.create_task(stack.enter_async_context(engine.connect()))
+
+
+# Read-only routes use these through get_read_db
+read_replicas = ReplicaSet(
+    [
+        create_async_engine(url, **replica_engine_options(settings, url))
+        for url in settings.DATABASE_READ_URLS
+    ],
+    strategy=settings.DB_REPLICA_STRATEGY,
+    max_failures=settings.DB_REPLICA_MAX_FAILURES,
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
 )
 
 # Session factory — each request gets its own session via get_db()
@@ -1,15 +1,17 @@
 import uuid
+from collections.abc import Callable
 from typing import AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_token
-from app.db.session import AsyncSessionLocal
+from app.db.replicas import wants_primary
+from app.db.session import AsyncSessionLocal, read_replicas
 from app.models.user import User
+from app.services import user_cache
 
 # Reads the Bearer token from the Authorization header
 bearer_scheme = HTTPBearer()
@@ -21,6 +23,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session for read-only routes — on a read replica when one is available.
+
+    Falls back to the primary when no replica is configured or healthy, and
+    while the client is in the read-your-writes window of its last write.
+    """
+    session = None
+    if read_replicas and not wants_primary(request.headers):
+        session = await read_replicas.session()
+    if session is None:
+        session = AsyncSessionLocal()
+    async with session:
+        yield session
+
+
+async def get_read_session_factory(request: Request) -> Callable[[], AsyncSession]:
+    """Session factory for reads that outlive the request handler (streamed responses).
+
+    The replica is reached once here, before the response starts, so a dead
+    one fails over to the next replica or the primary.
+    """
+    factory = None
+    if read_replicas and not wants_primary(request.headers):
+        factory = await read_replicas.session_factory()
+    return factory or AsyncSessionLocal
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
@@ -50,10 +79,9 @@ async def get_current_user(
     if not user_id:
         raise unauthorized
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
-
-    if user is None or not user.is_active:
+    # Served from the user cache on repeat requests — no query
+    user = await user_cache.get_active_user(db, uuid.UUID(user_id))
+    if user is None:
         raise unauthorized
 
     return user
@@ -0,0 +1,358 @@
+"""
+Importer: legacy pedigree registry dumps (CSV) into the dogs table.
+Run: python -m app.importers.registry FILE --owner-email EMAIL [--resume]
+
+Expected columns (header row): name, registration_number, sire_reg, dam_reg,
+breed, dob, sex; optional: call_name, color, microchip_number, titles.
+Breeds are matched by Polish or English name, sex is male/female (or M/F,
+pies/suka) and dob is YYYY-MM-DD. All dogs are assigned to one owner account.
+
+The file is read as a stream, never loaded whole:
+1. the first pass reads only registration numbers and parent references and
+   orders them into generations (parents before offspring);
+2. the second pass converts every row and spills it into one NDJSON file
+   per generation in the work directory;
+3. generations are imported in order, in chunks, through the bulk import
+   path of POST /api/dogs/bulk, so parents from earlier chunks are resolved
+   from the database by registration number. Dogs are written with COPY.
+
+Memory grows with the number of registration numbers, not with row data.
+The spill layout is saved to checkpoint.json and the position to the
+import_checkpoints table, in the same transaction as each chunk, so with
+--resume an interrupted import continues exactly after the last committed
+chunk. Both are removed when the import finishes. Rejected rows are written
+to errors.csv with their line number in the source file.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TextIO
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.config import settings
+from app.core.genetics import Pedigree
+from app.db.session import AsyncSessionLocal
+from app.models.dog import DogSex
+from app.models.import_checkpoint import ImportCheckpoint
+from app.models.user import User
+from app.services import dog_import_service
+from app.services.breed_catalog import breed_catalog
+
+# Short column names used by registry dumps -> DogImportRow fields
+COLUMN_ALIASES = {
+    "dob": "date_of_birth",
+    "sire_reg": "sire_registration_number",
+    "dam_reg": "dam_registration_number",
+    "breed": "breed_name",
+}
+OPTIONAL_COLUMNS = ("call_name", "color", "microchip_number", "titles")
+SEXES = {
+    "male": DogSex.male, "m": DogSex.male, "pies": DogSex.male,
+    "female": DogSex.female, "f": DogSex.female, "suka": DogSex.female,
+}
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def read_rows(path: Path) -> Iterator[tuple[int, dict[str, str]]]:
+    """Yield (line number, row) with canonical column names and blank cells dropped."""
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, {
+                COLUMN_ALIASES.get(key.strip(), key.strip()): value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            }
+
+
+def index_generations(path: Path) -> dict[str, int]:
+    """First pass: generation of every registration number in the file.
+
+    Parents that are not in the file (already in the database, or unknown)
+    count as founders.
+
+    Raises:
+        ValueError: If the parent references form a cycle.
+    """
+    parents: dict[str, tuple[str | None, str | None]] = {}
+    for _, row in read_rows(path):
+        number = row.get("registration_number")
+        if number:
+            parents[number] = (
+                row.get("sire_registration_number"),
+                row.get("dam_registration_number"),
+            )
+    pedigree = Pedigree.from_parents(parents)
+    return dict(zip(pedigree.keys, pedigree.generations()))
+
+
+def row_generation(row: dict[str, str], generations: dict[str, int]) -> int:
+    number = row.get("registration_number")
+    if number in generations:
+        return generations[number]
+    # Rows without a registration number can't be parents, only offspring
+    return 1 + max(
+        generations.get(row.get("sire_registration_number"), -1),
+        generations.get(row.get("dam_registration_number"), -1),
+    )
+
+
+def to_import_row(row: dict[str, str]) -> dict:
+    """Convert a CSV row into a DogImportRow payload.
+
+    Raises:
+        ValueError: If the breed or sex can't be recognized.
+    """
+    breed = breed_catalog.find_by_name(row.get("breed_name", ""))
+    if breed is None:
+        raise ValueError(f"Nieznana rasa: {row.get('breed_name', '')}")
+    sex = SEXES.get(row.get("sex", "").lower())
+    if sex is None:
+        raise ValueError(f"Nieznana płeć: {row.get('sex', '')}")
+
+    payload = {
+        "name": row.get("name", ""),
+        "sex": sex.value,
+        "date_of_birth": row.get("date_of_birth"),
+        "breed_id": breed.id,
+        "registration_number": row.get("registration_number"),
+        "sire_registration_number": row.get("sire_registration_number"),
+        "dam_registration_number": row.get("dam_registration_number"),
+    }
+    payload.update({column: row[column] for column in OPTIONAL_COLUMNS if column in row})
+    return payload
+
+
+def spill(path: Path, generations: dict[str, int], work_dir: Path, errors) -> list[int]:
+    """Second pass: write rows into gen-N.ndjson files; return the generation numbers.
+
+    Each line is "<source line>\\t<json>". Rows that can't be converted go to `errors`.
+    """
+    files = {}
+    try:
+        for line, row in read_rows(path):
+            try:
+                payload = to_import_row(row)
+            except ValueError as e:
+                errors.writerow([line, row.get("registration_number", ""), str(e)])
+                continue
+            generation = row_generation(row, generations)
+            if generation not in files:
+                files[generation] = (work_dir / f"gen-{generation}.ndjson").open("w")
+            files[generation].write(f"{line}\t{json.dumps(payload, ensure_ascii=False)}\n")
+    finally:
+        for f in files.values():
+            f.close()
+    return sorted(files)
+
+
+def read_chunks(path: Path, chunk_size: int, skip: int) -> Iterator[list[tuple[int, str]]]:
+    """Yield chunks of (source line, json) from a spill file, skipping `skip` rows."""
+    chunk: list[tuple[int, str]] = []
+    with path.open() as f:
+        for index, text in enumerate(f):
+            if index < skip:
+                continue
+            line, payload = text.rstrip("\n").split("\t", 1)
+            chunk.append((int(line), payload))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class Checkpoint:
+    """Import position: the spill layout in a file, the progress in the database.
+
+    The progress row is written in the transaction of the chunk it follows,
+    so a chunk is either committed with its position or not at all, and
+    --resume never imports a row twice.
+    """
+
+    def __init__(self, path: Path, source: Path):
+        self.path = path
+        stat = source.stat()
+        self.source = {"path": str(source.resolve()), "size": stat.st_size,
+                       "mtime": stat.st_mtime}
+        self.import_id = uuid.uuid4()
+        self.generations: list[int] = []
+        self.generation_index = 0
+        self.rows_done = 0
+
+    def load(self) -> bool:
+        """Restore the spill layout for the same source file; False if there is none."""
+        if not self.path.exists():
+            return False
+        data = json.loads(self.path.read_text())
+        if data["source"] != self.source:
+            return False
+        self.import_id = uuid.UUID(data["import_id"])
+        self.generations = data["generations"]
+        return True
+
+    def save(self) -> None:
+        data = {
+            "source": self.source,
+            "import_id": str(self.import_id),
+            "generations": self.generations,
+        }
+        # Write-then-rename so a crash never leaves a half-written checkpoint
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, self.path)
+
+    async def load_progress(self, db: AsyncSession) -> bool:
+        """Continue after the last committed chunk; False if the run already finished."""
+        result = await db.execute(
+            select(ImportCheckpoint.generation_index, ImportCheckpoint.rows_done).where(
+                ImportCheckpoint.id == self.import_id
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return False
+        self.generation_index, self.rows_done = row
+        return True
+
+    async def save_progress(self, db: AsyncSession) -> None:
+        """Write the position in the current transaction; it's committed with the chunk."""
+        stmt = insert(ImportCheckpoint).values(
+            id=self.import_id, generation_index=self.generation_index, rows_done=self.rows_done
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["id"],
+                set_={
+                    "generation_index": stmt.excluded.generation_index,
+                    "rows_done": stmt.excluded.rows_done,
+                },
+            )
+        )
+
+    async def finish(self, db: AsyncSession) -> None:
+        """Drop the progress row (in the run's last commit) and the checkpoint file."""
+        await db.execute(delete(ImportCheckpoint).where(ImportCheckpoint.id == self.import_id))
+        await db.commit()
+        # A file left by a crash right here has no progress row and is ignored
+        self.path.unlink(missing_ok=True)
+
+
+async def import_generations(
+    db: AsyncSession, owner_id: uuid.UUID, checkpoint: Checkpoint, work_dir: Path,
+    chunk_size: int, errors_file: TextIO,
+) -> tuple[int, int]:
+    """Third pass: import the spill files from the checkpoint on; return (created, rejected).
+
+    Rejected rows are on disk before their chunk commits, so none are lost in a
+    crash. Once every generation is in, the checkpoint is removed.
+    """
+    errors = csv.writer(errors_file)
+    created = failed = 0
+    start = time.perf_counter()
+    while checkpoint.generation_index < len(checkpoint.generations):
+        generation = checkpoint.generations[checkpoint.generation_index]
+        for chunk in read_chunks(
+            work_dir / f"gen-{generation}.ndjson", chunk_size, checkpoint.rows_done
+        ):
+            response = await dog_import_service.import_dogs(
+                db, owner_id, [payload for _, payload in chunk], commit=False, copy=True
+            )
+            for item in response.items:
+                if item.error is not None:
+                    errors.writerow([chunk[item.row][0], item.registration_number or "",
+                                     item.error])
+            errors_file.flush()
+            created += response.created
+            failed += response.failed
+            checkpoint.rows_done += len(chunk)
+            await checkpoint.save_progress(db)
+            await db.commit()
+        checkpoint.generation_index += 1
+        checkpoint.rows_done = 0
+        if checkpoint.generation_index < len(checkpoint.generations):
+            await checkpoint.save_progress(db)
+            await db.commit()
+        elapsed = time.perf_counter() - start
+        print(f"Generation {generation} done: {created} created, {failed} rejected so far "
+              f"({created / elapsed if elapsed else 0:.0f} dogs/s)")
+    await checkpoint.finish(db)
+    return created, failed
+
+
+async def run(
+    source: Path, owner_email: str, work_dir: Path, chunk_size: int, resume: bool
+) -> None:
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id).where(User.email == owner_email))
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            raise SystemExit(f"No user with email {owner_email}")
+        await breed_catalog.load(db)
+
+        checkpoint = Checkpoint(work_dir / "checkpoint.json", source)
+        resumed = resume and checkpoint.load() and await checkpoint.load_progress(db)
+        if not resumed:
+            # Nothing to resume (or that run finished): start over with a new run
+            checkpoint = Checkpoint(work_dir / "checkpoint.json", source)
+
+        with (work_dir / "errors.csv").open("a" if resumed else "w", newline="") as f:
+            errors = csv.writer(f)
+            if not resumed:
+                errors.writerow(["line", "registration_number", "error"])
+                start = time.perf_counter()
+                generations = index_generations(source)
+                print(f"Pass 1: {len(generations)} registration numbers "
+                      f"({time.perf_counter() - start:.1f}s)")
+                start = time.perf_counter()
+                checkpoint.generations = spill(source, generations, work_dir, errors)
+                del generations
+                checkpoint.save()
+                # The row exists from here on; it only disappears when the run finishes
+                await checkpoint.save_progress(db)
+                await db.commit()
+                print(f"Pass 2: {len(checkpoint.generations)} generations "
+                      f"({time.perf_counter() - start:.1f}s)")
+
+            created, failed = await import_generations(
+                db, owner_id, checkpoint, work_dir, chunk_size, f
+            )
+
+    print(f"Done: {created} dogs created, {failed} rejected; see {work_dir / 'errors.csv'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import a pedigree registry CSV dump")
+    parser.add_argument("file", type=Path, help="CSV file with a header row")
+    parser.add_argument("--owner-email", required=True, help="Account that will own the dogs")
+    parser.add_argument(
+        "--work-dir", type=Path, help="Spill files and checkpoint (default: FILE.import/)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=min(DEFAULT_CHUNK_SIZE, settings.DOG_IMPORT_MAX_ROWS),
+        help=f"Rows per transaction, at most DOG_IMPORT_MAX_ROWS ({settings.DOG_IMPORT_MAX_ROWS})",
+    )
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint")
+    args = parser.parse_args()
+    # import_dogs refuses bigger chunks, which would stop the import after pass 2
+    if not 1 <= args.chunk_size <= settings.DOG_IMPORT_MAX_ROWS:
+        parser.error(f"--chunk-size must be between 1 and {settings.DOG_IMPORT_MAX_ROWS}")
+    work_dir = args.work_dir or args.file.with_name(args.file.name + ".import")
+    asyncio.run(run(args.file, args.owner_email, work_dir, args.chunk_size, args.resume))
+
+
+if __name__ == "__main__":
+    main()
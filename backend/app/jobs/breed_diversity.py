@@ -0,0 +1,45 @@
+"""
+Batch job: recomputes population genetics reports (mean kinship, mean COI,
+effective population size, most-used sires) for breeds.
+Run: python -m app.jobs.breed_diversity [BREED_ID ...]
+Without arguments, every breed with at least one dog is processed.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.db.session import AsyncSessionLocal
+from app.models.dog import Dog
+from app.services import diversity_service
+
+
+async def run(breed_ids: list[int]) -> None:
+    async with AsyncSessionLocal() as db:
+        if not breed_ids:
+            result = await db.execute(select(Dog.breed_id).distinct().order_by(Dog.breed_id))
+            breed_ids = list(result.scalars().all())
+
+        for breed_id in breed_ids:
+            start = time.perf_counter()
+            report = await diversity_service.refresh_breed_diversity(db, breed_id)
+            elapsed = time.perf_counter() - start
+            print(
+                f"Breed {breed_id}: {report.population_size} active / "
+                f"{report.pedigree_size} dogs, mean kinship {report.mean_kinship:.4f}, "
+                f"mean COI {report.mean_coi:.4f} ({elapsed:.1f}s)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute breed diversity reports")
+    parser.add_argument("breed_ids", nargs="*", type=int, help="Breed IDs (default: all)")
+    args = parser.parse_args()
+    asyncio.run(run(args.breed_ids))
+
+
+if __name__ == "__main__":
+    main()
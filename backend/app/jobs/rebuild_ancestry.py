@@ -0,0 +1,25 @@
+"""
+Maintenance job: rebuilds the dog_ancestry closure table from dogs.sire_id
+and dogs.dam_id. Needed once after the closure-table migration, and after any
+bulk change to parent links made outside the API.
+Run: python -m app.jobs.rebuild_ancestry
+"""
+
+import asyncio
+import time
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.db.session import AsyncSessionLocal
+from app.services import ancestry_service
+
+
+async def run() -> None:
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        dog_count = await ancestry_service.rebuild(db)
+        await db.commit()
+        print(f"Rebuilt ancestry for {dog_count} dogs in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
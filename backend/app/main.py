@@ -1,14 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 import app.models  # noqa: F401 — registers all ORM models on startup
 from app.config import settings
-from app.routers import auth, breeds, dogs, users
+from app.core.metrics import MetricsMiddleware
+from app.core.query_budget import QueryBudgetMiddleware, query_budget
+from app.core.security import password_executor
+from app.core.sql_metrics import SqlMetricsMiddleware
+from app.db.replicas import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware
+from app.db.session import AsyncSessionLocal, engine, read_replicas, warm_pool
+from app.routers import auth, breeds, dogs, metrics, users
+from app.services import token_store
+from app.services.breed_catalog import breed_catalog
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect now rather than during the first requests
+    await warm_pool(engine, min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE))
+    await read_replicas.warm(min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE))
+    # Breeds are served from memory — load them before the first request
+    async with AsyncSessionLocal() as db:
+        await breed_catalog.load(db)
+    # Prunes expired refresh tokens and loads the revoked set, now and periodically
+    maintenance = asyncio.create_task(
+        token_store.run_maintenance(
+            AsyncSessionLocal, settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS
+        )
+    )
+    yield
+    maintenance.cancel()
+    # Let it close its session before the engine goes away
+    with suppress(asyncio.CancelledError):
+        await maintenance
+    password_executor.shutdown()
+    await engine.dispose()
+    await read_replicas.dispose()
+
 
 app = FastAPI(
     title="RodoWod API",
     description="API platformy dla hodowców psów rasowych",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Allow frontend (localhost:3000) to call backend (localhost:8000)
@@ -18,15 +55,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Sent back by the frontend so reads after a write skip the replicas
+    expose_headers=[PRIMARY_UNTIL_HEADER],
 )
 
+if read_replicas:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS)
+
+# Per-request SQL count and time (Server-Timing header, log line); in
+# development also enforce each endpoint's query budget
+if settings.QUERY_BUDGET_CHECK:
+    app.add_middleware(QueryBudgetMiddleware)
+if settings.SQL_METRICS_ENABLED:
+    app.add_middleware(SqlMetricsMiddleware)
+# Added last = outermost, so the recorded latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(dogs.router)
 app.include_router(breeds.router)
+app.include_router(metrics.router)
 
 
 @app.get("/api/health")
+@query_budget(0)
 async def health_check():
     return {"status": "ok"}
@@ -1,5 +1,9 @@
 # Import all models here so SQLAlchemy can resolve relationships
 # regardless of which model is imported first elsewhere in the app
-from app.models.breed import Breed  # noqa: F401
+from app.models.breed import Breed, BreedCatalogVersion  # noqa: F401
+from app.models.breed_diversity import BreedDiversityReport  # noqa: F401
 from app.models.dog import Dog  # noqa: F401
+from app.models.dog_ancestry import DogAncestry  # noqa: F401
+from app.models.import_checkpoint import ImportCheckpoint  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
 from app.models.user import User  # noqa: F401
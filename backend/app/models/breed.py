@@ -1,8 +1,9 @@
 import enum
 
-from sqlalchemy import Enum, Integer, String, Text
+from sqlalchemy import BigInteger, Enum, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.search import trigram_index
 from app.db.base import Base
 
 
@@ -31,3 +32,25 @@ class Breed(Base):
 
     # One breed can have many dogs
     dogs: Mapped[list["Dog"]] = relationship("Dog", back_populates="breed")
+
+    __table_args__ = (
+        # Keyset pagination of GET /api/breeds
+        Index("ix_breeds_name_pl_id", "name_pl", "id"),
+        # Accent-insensitive substring and fuzzy search (app.core.search)
+        trigram_index("ix_breeds_name_pl_trgm", "name_pl"),
+        trigram_index("ix_breeds_name_en_trgm", "name_en"),
+    )
+
+
+class BreedCatalogVersion(Base):
+    """One row whose version a trigger bumps on every change to the breeds table.
+
+    App processes compare it with the version their in-memory breed catalog
+    was loaded at (app.services.breed_catalog), so breeds changed by the seed
+    script or by hand show up without waiting for the catalog TTL.
+    """
+
+    __tablename__ = "breed_catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class BreedDiversityReport(Base):
+    """Population genetics summary for one breed, produced by the diversity job."""
+
+    __tablename__ = "breed_diversity_reports"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    breed_id: Mapped[int] = mapped_column(ForeignKey("breeds.id"), nullable=False, index=True)
+
+    # Active dogs of the breed (the reference population)
+    population_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    # All dogs of the breed used to build the pedigree, including inactive ancestors
+    pedigree_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    generations: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    mean_kinship: Mapped[float] = mapped_column(Float, nullable=False)
+    mean_coi: Mapped[float] = mapped_column(Float, nullable=False)
+    effective_population_size: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # [{"sire_id": ..., "name": ..., "offspring_count": ...}, ...]
+    top_sires: Mapped[list[dict]] = mapped_column(JSON, nullable=False, default=list)
+
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -2,9 +2,21 @@ import enum
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.search import trigram_index
 from app.db.base import Base
 
 
@@ -39,11 +51,12 @@ class Dog(Base):
 
     # Self-referential pedigree — sire (father) and dam (mother)
     # A dog can reference other dogs in the same table as parents
+    # Indexed so "children of X" lookups don't scan the whole table
     sire_id: Mapped[uuid.UUID | None] = mapped_column(
-        ForeignKey("dogs.id"), nullable=True
+        ForeignKey("dogs.id"), nullable=True, index=True
     )
     dam_id: Mapped[uuid.UUID | None] = mapped_column(
-        ForeignKey("dogs.id"), nullable=True
+        ForeignKey("dogs.id"), nullable=True, index=True
     )
 
     # Additional info
@@ -75,3 +88,25 @@ class Dog(Base):
     dam: Mapped["Dog | None"] = relationship(
         "Dog", foreign_keys=[dam_id], remote_side="Dog.id"
     )
+
+    __table_args__ = (
+        # Keyset pagination of GET /api/dogs — one index per sort order
+        Index("ix_dogs_created_at_id", "created_at", "id"),
+        Index("ix_dogs_name_id", "name", "id"),
+        # Accent-insensitive substring and fuzzy name search (app.core.search)
+        trigram_index("ix_dogs_name_trgm", "name"),
+        # Typeahead (dog_service.suggest_dogs) — byte-ordered prefix lookups,
+        # narrowed by breed and sex when the sire/dam picker knows them
+        Index(
+            "ix_dogs_breed_sex_name_prefix",
+            "breed_id",
+            "sex",
+            text('(f_unaccent(lower(name)) COLLATE "C")'),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_dogs_name_prefix",
+            text('(f_unaccent(lower(name)) COLLATE "C")'),
+            postgresql_where=text("is_active"),
+        ),
+    )
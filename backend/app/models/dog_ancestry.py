@@ -0,0 +1,33 @@
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DogAncestry(Base):
+    """Closure table of the pedigree graph — one row per (ancestor, descendant, depth).
+
+    Every dog has a self row at depth 0. path_count is the number of distinct
+    sire/dam paths of that length (greater than 1 when the pedigree is inbred).
+    Maintained incrementally by ancestry_service on dog writes.
+    """
+
+    __tablename__ = "dog_ancestry"
+
+    ancestor_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("dogs.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("dogs.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, primary_key=True)
+    path_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=1)
+
+    __table_args__ = (
+        # "Ancestors of X"
+        Index("ix_dog_ancestry_descendant_depth", "descendant_id", "depth"),
+        # "Descendants of X" in generation order — keyset pagination
+        Index("ix_dog_ancestry_ancestor_depth", "ancestor_id", "depth", "descendant_id"),
+    )
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ImportCheckpoint(Base):
+    """Progress of one registry import run (app.importers.registry).
+
+    Updated in the same transaction as each imported chunk, so after a crash
+    the position matches exactly what was committed. Created after the
+    spill pass and deleted in the run's last commit, so a checkpoint file
+    without a row belongs to a finished import.
+    """
+
+    __tablename__ = "import_checkpoints"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    generation_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    rows_done: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RefreshToken(Base):
+    """One issued refresh token, identified by the JWT "jti" claim.
+
+    Tokens issued from one login form a family. Using a token revokes it and
+    issues the next one in the same family; presenting a revoked token again
+    means it was stolen, so the whole family is revoked. Rows are deleted
+    once expired (token_store.prune_expired).
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    family_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        # Revoking a family on logout or token reuse
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        # Pruning expired tokens
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String, Text, func
+from sqlalchemy import Boolean, DateTime, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.search import trigram_index
 from app.db.base import Base
 
 
@@ -34,3 +35,12 @@ class User(Base):
 
     # One user can own many dogs
     dogs: Mapped[list["Dog"]] = relationship("Dog", back_populates="owner")
+
+    __table_args__ = (
+        # Keyset pagination of GET /api/users
+        Index("ix_users_last_name_first_name_id", "last_name", "first_name", "id"),
+        # Accent-insensitive substring and fuzzy search (app.core.search)
+        trigram_index("ix_users_first_name_trgm", "first_name"),
+        trigram_index("ix_users_last_name_trgm", "last_name"),
+        trigram_index("ix_users_kennel_name_trgm", "kennel_name"),
+    )
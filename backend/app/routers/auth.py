@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.query_budget import query_budget
 from app.dependencies import get_current_user, get_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RefreshRequest, RegisterRequest, TokenResponse
@@ -11,6 +12,7 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
     """Register a new user account and return JWT tokens."""
     try:
@@ -20,15 +22,21 @@ async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
+@query_budget(2)
+async def login(
+    data: LoginRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)
+):
     """Authenticate user and return JWT tokens."""
     try:
-        return await auth_service.login(db, data.email, data.password)
+        return await auth_service.login(
+            db, data.email, data.password, schedule=background_tasks.add_task
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 
 @router.post("/refresh", response_model=TokenResponse)
+@query_budget(3)
 async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
     """Issue a new token pair using a valid refresh token."""
     try:
@@ -37,7 +45,18 @@ async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(1)
+async def logout(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """Revoke the refresh token and all tokens rotated from the same login."""
+    try:
+        await auth_service.logout(db, data.refresh_token)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+
 @router.get("/me", response_model=UserResponse)
+@query_budget(1)
 async def me(current_user: User = Depends(get_current_user)):
     """Return the currently authenticated user's profile."""
     return current_user
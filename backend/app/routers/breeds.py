@@ -1,39 +1,84 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
+from app.core.query_budget import query_budget
+from app.dependencies import get_read_db
 from app.models.breed import SizeCategory
-from app.schemas.breed import BreedListResponse, BreedResponse, FciGroupResponse
-from app.services import breed_service
+from app.schemas.breed import (
+    BreedListResponse,
+    BreedResponse,
+    BreedSuggestion,
+    FciGroupResponse,
+)
+from app.schemas.genetics import BreedDiversityResponse
+from app.services import breed_service, diversity_service
 
 router = APIRouter(prefix="/api/breeds", tags=["breeds"])
 
 
 @router.get("/", response_model=BreedListResponse)
+@query_budget(0)
 async def list_breeds(
     q: str | None = Query(None, description="Search by Polish or English breed name"),
     fci_group: int | None = Query(None, ge=1, le=10, description="Filter by FCI group (1-10)"),
     size_category: SizeCategory | None = Query(None, description="Filter by size category"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=200, description="Results per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="Keyset cursor (empty = first page)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total"),
+    fuzzy: bool = Query(False, description="Typo-tolerant search ranked by similarity"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Return paginated list of dog breeds with optional filters."""
-    return await breed_service.list_breeds(
-        db, q=q, fci_group=fci_group, size_category=size_category, page=page, limit=limit
-    )
+    try:
+        return await breed_service.list_breeds(
+            db,
+            q=q,
+            fci_group=fci_group,
+            size_category=size_category,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            fuzzy=fuzzy,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/groups", response_model=list[FciGroupResponse])
-async def list_fci_groups(db: AsyncSession = Depends(get_db)):
+@query_budget(0)
+async def list_fci_groups(db: AsyncSession = Depends(get_read_db)):
     """Return all FCI groups with breed counts."""
     return await breed_service.list_fci_groups(db)
 
 
+@router.get("/suggest", response_model=list[BreedSuggestion])
+@query_budget(0)
+async def suggest_breeds(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Start of a name word"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return breeds matching a name prefix — typeahead for the breed picker."""
+    return await breed_service.suggest_breeds(db, prefix, limit=limit)
+
+
 @router.get("/{breed_id}", response_model=BreedResponse)
-async def get_breed(breed_id: int, db: AsyncSession = Depends(get_db)):
+@query_budget(0)
+async def get_breed(breed_id: int, db: AsyncSession = Depends(get_read_db)):
     """Return a single breed by ID."""
     try:
         return await breed_service.get_breed_by_id(db, breed_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/{breed_id}/diversity", response_model=BreedDiversityResponse)
+@query_budget(1)
+async def get_breed_diversity(breed_id: int, db: AsyncSession = Depends(get_read_db)):
+    """Return the latest population genetics report for a breed."""
+    try:
+        return await diversity_service.get_breed_diversity(db, breed_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
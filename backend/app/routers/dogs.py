@@ -1,19 +1,40 @@
 import uuid
+from collections.abc import Callable
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_user, get_db
+from app.core.query_budget import query_budget
+from app.dependencies import (
+    get_current_user,
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+)
 from app.models.breed import SizeCategory
 from app.models.dog import DogSex
 from app.models.user import User
-from app.schemas.dog import DogCreate, DogListResponse, DogResponse, DogUpdate, PedigreeNode
-from app.services import dog_service
+from app.schemas.dog import (
+    DescendantListResponse,
+    DogBatchRequest,
+    DogBatchResponse,
+    DogCreate,
+    DogImportResponse,
+    DogListResponse,
+    DogResponse,
+    DogSuggestion,
+    DogUpdate,
+    PedigreeNode,
+)
+from app.schemas.genetics import CoiResponse, TestMatingRequest, TestMatingResponse
+from app.services import coi_service, dog_export_service, dog_import_service, dog_service
 
 router = APIRouter(prefix="/api/dogs", tags=["dogs"])
 
 
 @router.get("/", response_model=DogListResponse)
+@query_budget(3)
 async def list_dogs(
     breed_id: int | None = Query(None, description="Filter by breed ID"),
     sex: DogSex | None = Query(None, description="Filter by sex"),
@@ -26,11 +47,70 @@ async def list_dogs(
     sort_by: str | None = Query(None, pattern="^(newest|name)$", description="Sort order: newest or name"),  # noqa: E501
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Results per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="Keyset cursor (empty = first page)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total"),
+    fuzzy: bool = Query(False, description="Typo-tolerant search ranked by similarity"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Return paginated list of dogs with optional filters and sorting."""
-    return await dog_service.list_dogs(
-        db,
+    try:
+        return await dog_service.list_dogs(
+            db,
+            breed_id=breed_id,
+            sex=sex,
+            is_available_for_breeding=is_available_for_breeding,
+            name=name,
+            voivodeship=voivodeship,
+            city=city,
+            size_category=size_category,
+            fci_group=fci_group,
+            sort_by=sort_by,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            fuzzy=fuzzy,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/suggest", response_model=list[DogSuggestion])
+@query_budget(1)
+async def suggest_dogs(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Start of the dog's name"),
+    sex: DogSex | None = Query(None, description="Filter by sex"),
+    breed_id: int | None = Query(None, description="Filter by breed ID"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return dogs whose name starts with prefix — typeahead for sire/dam pickers."""
+    return await dog_service.suggest_dogs(db, prefix, sex=sex, breed_id=breed_id, limit=limit)
+
+
+@router.get("/export")
+@query_budget(2)
+async def export_dogs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    breed_id: int | None = Query(None, description="Filter by breed ID"),
+    sex: DogSex | None = Query(None, description="Filter by sex"),
+    is_available_for_breeding: bool | None = Query(None, description="Filter by breeding availability"),  # noqa: E501
+    name: str | None = Query(None, description="Search by dog name (partial match)"),
+    voivodeship: str | None = Query(None, description="Filter by owner's voivodeship"),
+    city: str | None = Query(None, description="Filter by owner's city (partial match)"),
+    size_category: SizeCategory | None = Query(None, description="Filter by breed size category"),
+    fci_group: int | None = Query(None, ge=1, le=10, description="Filter by FCI group (1-10)"),
+    sort_by: str | None = Query(None, pattern="^(newest|name)$", description="Sort order: newest or name"),  # noqa: E501
+    fuzzy: bool = Query(False, description="Typo-tolerant name search"),
+    session_factory: Callable[[], AsyncSession] = Depends(get_read_session_factory),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream every dog matching the list filters, with parent links, as NDJSON or CSV.
+
+    Only for signed-in users — the export is unpaginated and includes microchip numbers.
+    """
+    chunks = dog_export_service.export_dogs(
+        format,
         breed_id=breed_id,
         sex=sex,
         is_available_for_breeding=is_available_for_breeding,
@@ -40,12 +120,18 @@ async def list_dogs(
         size_category=size_category,
         fci_group=fci_group,
         sort_by=sort_by,
-        page=page,
-        limit=limit,
+        fuzzy=fuzzy,
+        session_factory=session_factory,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=dog_export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="dogs.{format}"'},
     )
 
 
 @router.post("/", response_model=DogResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(7)  # user, parents, insert, closure rows (3), reload
 async def create_dog(
     data: DogCreate,
     db: AsyncSession = Depends(get_db),
@@ -58,8 +144,46 @@ async def create_dog(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/batch", response_model=DogBatchResponse)
+@query_budget(1)
+async def get_dogs_batch(data: DogBatchRequest, db: AsyncSession = Depends(get_read_db)):
+    """Return many public dog profiles by ID in one request, keyed by ID."""
+    try:
+        return await dog_service.get_dogs_by_ids(db, data.ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/bulk", response_model=DogImportResponse)
+@query_budget(None)  # grows with the number of rows
+async def bulk_import_dogs(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Import many dogs for the authenticated user.
+
+    The body is a JSON array of dogs, or NDJSON (one dog per line) with
+    Content-Type application/x-ndjson. Each dog has the DogCreate fields plus
+    optional sire_registration_number / dam_registration_number, which may
+    point at other dogs in the same import. Invalid rows are reported in
+    `items` and skipped; the rest are created. Bodies over
+    DOG_IMPORT_MAX_BYTES are refused with 400 before they are buffered.
+    """
+    try:
+        dog_import_service.check_content_length(request.headers.get("content-length"))
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            rows = await dog_import_service.read_ndjson(request.stream())
+        else:
+            rows = await dog_import_service.read_json_array(request.stream())
+        return await dog_import_service.import_dogs(db, current_user.id, rows)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{dog_id}", response_model=DogResponse)
-async def get_dog(dog_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+@query_budget(1)
+async def get_dog(dog_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
     """Return a public dog profile by ID."""
     try:
         return await dog_service.get_dog_by_id(db, dog_id)
@@ -68,6 +192,7 @@ async def get_dog(dog_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
 
 
 @router.put("/{dog_id}", response_model=DogResponse)
+@query_budget(11)  # user, load, parents, update, closure rows (6), reload
 async def update_dog(
     dog_id: uuid.UUID,
     data: DogUpdate,
@@ -78,15 +203,17 @@ async def update_dog(
     try:
         return await dog_service.update_dog(db, dog_id, current_user.id, data)
     except ValueError as e:
-        status_code = (
-            status.HTTP_403_FORBIDDEN
-            if "uprawnień" in str(e)
-            else status.HTTP_404_NOT_FOUND
-        )
+        if "uprawnień" in str(e):
+            status_code = status.HTTP_403_FORBIDDEN
+        elif str(e) == "Pies nie istnieje":
+            status_code = status.HTTP_404_NOT_FOUND
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
         raise HTTPException(status_code=status_code, detail=str(e))
 
 
 @router.delete("/{dog_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(3)
 async def delete_dog(
     dog_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
@@ -105,13 +232,73 @@ async def delete_dog(
 
 
 @router.get("/{dog_id}/pedigree", response_model=PedigreeNode)
+@query_budget(1)
 async def get_pedigree(
     dog_id: uuid.UUID,
     generations: int = Query(3, ge=1, le=5, description="Number of generations to load"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Return the pedigree tree for a dog up to N generations."""
     dog = await dog_service.get_pedigree(db, dog_id, generations)
     if dog is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pies nie istnieje")
     return dog
+
+
+@router.get("/{dog_id}/descendants", response_model=DescendantListResponse)
+@query_budget(3)
+async def list_descendants(
+    dog_id: uuid.UUID,
+    generations: int = Query(3, ge=1, le=10, description="Number of generations to include"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Results per page"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return a dog's offspring, grand-offspring and so on, page by page."""
+    try:
+        return await dog_service.list_descendants(db, dog_id, generations, cursor, limit)
+    except ValueError as e:
+        status_code = (
+            status.HTTP_400_BAD_REQUEST
+            if "kursor" in str(e)
+            else status.HTTP_404_NOT_FOUND
+        )
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+
+@router.get("/{dog_id}/coi", response_model=CoiResponse)
+@query_budget(1)
+async def get_coi(
+    dog_id: uuid.UUID,
+    generations: int = Query(10, ge=1, le=20, description="Number of generations to include"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return Wright's coefficient of inbreeding for a dog."""
+    try:
+        return await coi_service.get_coi(db, dog_id, generations)
+    except ValueError as e:
+        status_code = (
+            status.HTTP_409_CONFLICT
+            if "cykl" in str(e)
+            else status.HTTP_404_NOT_FOUND
+        )
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+
+@router.post("/{dam_id}/test-matings", response_model=TestMatingResponse)
+@query_budget(3)
+async def plan_test_matings(
+    dam_id: uuid.UUID,
+    data: TestMatingRequest,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Rank candidate sires by expected litter COI with the given dam."""
+    try:
+        return await coi_service.plan_test_matings(db, dam_id, data)
+    except ValueError as e:
+        status_code = (
+            status.HTTP_404_NOT_FOUND
+            if "nie istnieje" in str(e)
+            else status.HTTP_400_BAD_REQUEST
+        )
+        raise HTTPException(status_code=status_code, detail=str(e))
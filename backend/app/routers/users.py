@@ -3,7 +3,8 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_user, get_db
+from app.core.query_budget import query_budget
+from app.dependencies import get_current_user, get_db, get_read_db
 from app.models.user import User
 from app.schemas.dog import DogResponse
 from app.schemas.user import UserListResponse, UserResponse, UserUpdate
@@ -13,6 +14,7 @@ router = APIRouter(prefix="/api/users", tags=["users"])
 
 
 @router.get("/", response_model=UserListResponse)
+@query_budget(3)
 async def list_users(
     q: str | None = Query(None, description="Search by name or kennel name (partial match)"),
     is_breeder: bool | None = Query(None, description="Filter by breeder status"),
@@ -20,16 +22,32 @@ async def list_users(
     voivodeship: str | None = Query(None, description="Filter by voivodeship"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Results per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="Keyset cursor (empty = first page)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the total"),
+    fuzzy: bool = Query(False, description="Typo-tolerant search ranked by similarity"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Return paginated list of users with optional filters."""
-    return await user_service.list_users(
-        db, q=q, is_breeder=is_breeder, city=city, voivodeship=voivodeship, page=page, limit=limit
-    )
+    try:
+        return await user_service.list_users(
+            db,
+            q=q,
+            is_breeder=is_breeder,
+            city=city,
+            voivodeship=voivodeship,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            fuzzy=fuzzy,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+@query_budget(1)
+async def get_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
     """Return a public user profile by ID."""
     try:
         return await user_service.get_user_by_id(db, user_id)
@@ -38,6 +56,7 @@ async def get_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
 
 
 @router.put("/me", response_model=UserResponse)
+@query_budget(3)
 async def update_me(
     data: UserUpdate,
     db: AsyncSession = Depends(get_db),
@@ -47,12 +66,21 @@ async def update_me(
     return await user_service.update_user(db, current_user, data)
 
 
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(2)
+async def deactivate_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Deactivate the currently authenticated user's account."""
+    await user_service.deactivate_user(db, current_user)
+
+
 @router.get("/{user_id}/dogs", response_model=list[DogResponse])
-async def get_user_dogs(user_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+@query_budget(1)
+async def get_user_dogs(user_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
     """Return all active dogs owned by a user."""
     try:
-        await user_service.get_user_by_id(db, user_id)  # verify user exists
+        return await user_service.get_user_dogs(db, user_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-
-    return await user_service.get_user_dogs(db, user_id)
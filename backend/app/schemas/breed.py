@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 from app.models.breed import SizeCategory
@@ -19,10 +21,23 @@ class BreedResponse(BaseModel):
 
 class BreedListResponse(BaseModel):
     items: list[BreedResponse]
-    total: int
-    page: int
+    # None with include_total=false; "estimated" totals come from the planner
+    total: int | None
+    total_kind: Literal["exact", "estimated"] | None = "exact"
+    page: int | None = None
     limit: int
-    pages: int
+    pages: int | None = None
+    # Keyset mode (cursor=...) — page/pages are None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class BreedSuggestion(BaseModel):
+    id: int
+    name_pl: str
+    name_en: str | None
+
+    model_config = {"from_attributes": True}
 
 
 class FciGroupResponse(BaseModel):
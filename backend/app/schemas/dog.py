@@ -1,5 +1,6 @@
 import uuid
 from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, field_validator
 
@@ -40,6 +41,26 @@ class DogCreate(BaseModel):
         return v.strip()
 
 
+class DogImportRow(DogCreate):
+    # Parents may also be given by registration number — of an existing dog
+    # or of another row in the same import
+    sire_registration_number: str | None = None
+    dam_registration_number: str | None = None
+
+
+class DogImportResult(BaseModel):
+    row: int  # 0-based position in the input
+    id: uuid.UUID | None = None
+    registration_number: str | None = None
+    error: str | None = None
+
+
+class DogImportResponse(BaseModel):
+    created: int
+    failed: int
+    items: list[DogImportResult]
+
+
 class DogUpdate(BaseModel):
     name: str | None = None
     call_name: str | None = None
@@ -81,10 +102,47 @@ class DogResponse(BaseModel):
 
 class DogListResponse(BaseModel):
     items: list[DogResponse]
-    total: int
-    page: int
+    # None with include_total=false; "estimated" totals come from the planner
+    total: int | None
+    total_kind: Literal["exact", "estimated"] | None = "exact"
+    page: int | None = None
+    limit: int
+    pages: int | None = None
+    # Keyset mode (cursor=...) — page/pages are None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class DogBatchRequest(BaseModel):
+    ids: list[uuid.UUID]
+
+
+class DogBatchResponse(BaseModel):
+    # Keyed by dog ID; inactive and unknown IDs are listed in `missing`
+    items: dict[uuid.UUID, DogResponse]
+    missing: list[uuid.UUID]
+
+
+class DogSuggestion(BaseModel):
+    # Minimal record for typeahead pickers (sire/dam selection)
+    id: uuid.UUID
+    name: str
+    registration_number: str | None
+
+    model_config = {"from_attributes": True}
+
+
+class DescendantResponse(DogResponse):
+    # 1 = offspring, 2 = grand-offspring, ... (nearest path if several)
+    generation: int
+
+
+class DescendantListResponse(BaseModel):
+    items: list[DescendantResponse]
+    # {generation: number of descendants} — only returned with the first page
+    generation_counts: dict[int, int] | None
+    next_cursor: str | None
     limit: int
-    pages: int
 
 
 class PedigreeNode(BaseModel):
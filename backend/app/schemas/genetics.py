@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CoiResponse(BaseModel):
+    dog_id: uuid.UUID
+    generations: int
+    # Wright's coefficient of inbreeding, 0.0 – 1.0
+    coi: float
+    # Distinct ancestors found within the requested generations
+    ancestor_count: int
+
+
+class TestMatingRequest(BaseModel):
+    # Candidate sire filters — same meaning as in GET /api/dogs/.
+    # breed_id defaults to the dam's breed.
+    breed_id: int | None = None
+    is_available_for_breeding: bool | None = True
+    voivodeship: str | None = None
+    city: str | None = None
+    generations: int = Field(10, ge=1, le=20)
+    limit: int = Field(50, ge=1, le=500)
+
+
+class TestMatingCandidate(BaseModel):
+    sire_id: uuid.UUID
+    name: str
+    registration_number: str | None
+    # Expected COI of the litter (= kinship between sire and dam)
+    coi: float
+
+
+class TestMatingResponse(BaseModel):
+    dam_id: uuid.UUID
+    generations: int
+    candidate_count: int
+    # Sorted from the lowest expected COI
+    items: list[TestMatingCandidate]
+
+
+class SireUsage(BaseModel):
+    sire_id: uuid.UUID
+    name: str
+    offspring_count: int
+
+
+class BreedDiversityResponse(BaseModel):
+    breed_id: int
+    population_size: int
+    pedigree_size: int
+    generations: int
+    # Average kinship over all pairs of active dogs (self-pairs included)
+    mean_kinship: float
+    mean_coi: float
+    # None when inbreeding did not increase between the last two generations
+    effective_population_size: float | None
+    top_sires: list[SireUsage]
+    computed_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, EmailStr
 
@@ -25,10 +26,15 @@ class UserResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     items: list[UserResponse]
-    total: int
-    page: int
+    # None with include_total=false; "estimated" totals come from the planner
+    total: int | None
+    total_kind: Literal["exact", "estimated"] | None = "exact"
+    page: int | None = None
     limit: int
-    pages: int
+    pages: int | None = None
+    # Keyset mode (cursor=...) — page/pages are None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class UserUpdate(BaseModel):
@@ -2,6 +2,8 @@
 Seed script: populates the breeds table with FCI breed data.
 Run once after migrations: python -m app.seed.breeds
 Idempotent — safe to run multiple times.
+Running app processes pick up the new breeds within BREED_CATALOG_CHECK_SECONDS
+(the breeds table trigger bumps breed_catalog_version).
 """
 
 import asyncio
@@ -0,0 +1,211 @@
+import uuid
+
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.genetics import Pedigree
+from app.models.dog import Dog
+from app.models.dog_ancestry import DogAncestry
+
+
+def _paths_through_link(parent_id: uuid.UUID, child_id: uuid.UUID):
+    """Every (ancestor, descendant, depth, path_count) path that uses parent -> child.
+
+    Combines the ancestors of the parent (self row included) with the
+    descendants of the child (self row included), one step apart.
+    """
+    up = aliased(DogAncestry)
+    down = aliased(DogAncestry)
+    depth = up.depth + down.depth + 1
+    return (
+        select(
+            up.ancestor_id,
+            down.descendant_id,
+            depth.label("depth"),
+            func.sum(up.path_count * down.path_count).label("path_count"),
+        )
+        .select_from(up)
+        .join(down, down.ancestor_id == child_id)
+        .where(up.descendant_id == parent_id)
+        .group_by(up.ancestor_id, down.descendant_id, depth)
+    )
+
+
+async def add_self_row(db: AsyncSession, dog_id: uuid.UUID) -> None:
+    """Register a new dog in the closure table (depth 0)."""
+    await db.execute(
+        insert(DogAncestry).values(
+            ancestor_id=dog_id, descendant_id=dog_id, depth=0, path_count=1
+        )
+    )
+
+
+async def add_parent_link(db: AsyncSession, child_id: uuid.UUID, parent_id: uuid.UUID) -> None:
+    """Record parent -> child in the closure table for the child's whole subtree."""
+    paths = _paths_through_link(parent_id, child_id).subquery()
+    stmt = insert(DogAncestry).from_select(
+        ["ancestor_id", "descendant_id", "depth", "path_count"], select(paths)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ancestor_id", "descendant_id", "depth"],
+        set_={"path_count": DogAncestry.path_count + stmt.excluded.path_count},
+    )
+    await db.execute(stmt)
+
+
+async def remove_parent_link(
+    db: AsyncSession, child_id: uuid.UUID, parent_id: uuid.UUID
+) -> None:
+    """Remove parent -> child from the closure table for the child's whole subtree."""
+    paths = _paths_through_link(parent_id, child_id).subquery()
+    await db.execute(
+        update(DogAncestry)
+        .values(path_count=DogAncestry.path_count - paths.c.path_count)
+        .where(
+            DogAncestry.ancestor_id == paths.c.ancestor_id,
+            DogAncestry.descendant_id == paths.c.descendant_id,
+            DogAncestry.depth == paths.c.depth,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # Only rows inside the child's subtree can have dropped to zero
+    await db.execute(
+        delete(DogAncestry).where(
+            DogAncestry.path_count <= 0,
+            DogAncestry.descendant_id.in_(
+                select(DogAncestry.descendant_id).where(DogAncestry.ancestor_id == child_id)
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def sync_parents(
+    db: AsyncSession,
+    dog_id: uuid.UUID,
+    old_parents: tuple[uuid.UUID | None, uuid.UUID | None],
+    new_parents: tuple[uuid.UUID | None, uuid.UUID | None],
+) -> None:
+    """Apply sire/dam changes of one dog to the closure table."""
+    for old, new in zip(old_parents, new_parents):
+        if old == new:
+            continue
+        if old is not None:
+            await remove_parent_link(db, dog_id, old)
+        if new is not None:
+            await add_parent_link(db, dog_id, new)
+
+
+async def is_ancestor(
+    db: AsyncSession, ancestor_id: uuid.UUID, descendant_id: uuid.UUID
+) -> bool:
+    """Return True if ancestor_id appears anywhere in descendant_id's pedigree."""
+    result = await db.execute(
+        select(
+            exists().where(
+                DogAncestry.ancestor_id == ancestor_id,
+                DogAncestry.descendant_id == descendant_id,
+                DogAncestry.depth > 0,
+            )
+        )
+    )
+    return result.scalar_one()
+
+
+async def get_ancestor_ids(
+    db: AsyncSession, dog_id: uuid.UUID, max_depth: int | None = None
+) -> dict[uuid.UUID, int]:
+    """Return {ancestor_id: nearest depth} for a dog, optionally bounded by depth."""
+    query = (
+        select(DogAncestry.ancestor_id, func.min(DogAncestry.depth))
+        .where(DogAncestry.descendant_id == dog_id, DogAncestry.depth > 0)
+        .group_by(DogAncestry.ancestor_id)
+    )
+    if max_depth is not None:
+        query = query.where(DogAncestry.depth <= max_depth)
+    result = await db.execute(query)
+    return {row[0]: row[1] for row in result}
+
+
+async def get_descendant_ids(
+    db: AsyncSession, dog_id: uuid.UUID, max_depth: int | None = None
+) -> dict[uuid.UUID, int]:
+    """Return {descendant_id: nearest depth} for a dog, optionally bounded by depth."""
+    query = (
+        select(DogAncestry.descendant_id, func.min(DogAncestry.depth))
+        .where(DogAncestry.ancestor_id == dog_id, DogAncestry.depth > 0)
+        .group_by(DogAncestry.descendant_id)
+    )
+    if max_depth is not None:
+        query = query.where(DogAncestry.depth <= max_depth)
+    result = await db.execute(query)
+    return {row[0]: row[1] for row in result}
+
+
+async def rebuild(db: AsyncSession, batch_size: int = 5000) -> int:
+    """Recreate the whole closure table from dogs.sire_id / dogs.dam_id.
+
+    Dogs are processed generation by generation (parents before offspring),
+    so each dog's rows are derived set-wise from its parents' finished rows.
+    Returns the number of dogs processed.
+
+    Raises:
+        ValueError: If the pedigree contains a cycle.
+    """
+    result = await db.execute(select(Dog.id, Dog.sire_id, Dog.dam_id))
+    parents = {row.id: (row.sire_id, row.dam_id) for row in result}
+
+    pedigree = Pedigree.from_parents(parents)
+    levels: dict[int, list[uuid.UUID]] = {}
+    for key, level in zip(pedigree.keys, pedigree.generations()):
+        levels.setdefault(level, []).append(key)
+
+    await db.execute(delete(DogAncestry).execution_options(synchronize_session=False))
+    await add_generations(db, [levels[level] for level in sorted(levels)], batch_size)
+
+    return len(parents)
+
+
+async def add_generations(
+    db: AsyncSession, generations: list[list[uuid.UUID]], batch_size: int = 5000
+) -> None:
+    """Add closure rows for dogs already inserted into dogs, set-wise.
+
+    Each dog's parents must either have their rows already or belong to an
+    earlier generation of the list, so a generation's rows are derived from
+    its parents' finished rows with one INSERT ... SELECT per batch.
+    """
+    child = aliased(Dog)
+    for ids in generations:
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            await db.execute(
+                insert(DogAncestry),
+                [
+                    {"ancestor_id": i, "descendant_id": i, "depth": 0, "path_count": 1}
+                    for i in batch
+                ],
+            )
+            # One step down from every ancestor of either parent
+            inherited = (
+                select(
+                    DogAncestry.ancestor_id,
+                    child.id,
+                    DogAncestry.depth + 1,
+                    func.sum(DogAncestry.path_count),
+                )
+                .join(
+                    child,
+                    (DogAncestry.descendant_id == child.sire_id)
+                    | (DogAncestry.descendant_id == child.dam_id),
+                )
+                .where(child.id.in_(batch))
+                .group_by(DogAncestry.ancestor_id, child.id, DogAncestry.depth)
+            )
+            await db.execute(
+                insert(DogAncestry).from_select(
+                    ["ancestor_id", "descendant_id", "depth", "path_count"], inherited
+                )
+            )
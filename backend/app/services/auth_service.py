@@ -1,18 +1,21 @@
 import uuid
+from collections.abc import Callable
 
 from jose import JWTError
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import (
     create_access_token,
-    create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
 )
+from app.db.session import AsyncSessionLocal
 from app.models.user import User
 from app.schemas.auth import RegisterRequest, TokenResponse
+from app.services import token_store, user_cache
 
 
 async def register(db: AsyncSession, data: RegisterRequest) -> TokenResponse:
@@ -30,21 +33,32 @@ async def register(db: AsyncSession, data: RegisterRequest) -> TokenResponse:
     user = User(
         id=uuid.uuid4(),
         email=data.email,
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password_async(data.password),
         first_name=data.first_name,
         last_name=data.last_name,
     )
     db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    # Flushed so the refresh token's foreign key sees the user; one commit
+    # below, so a failure never leaves an account without a response
+    await db.flush()
 
     # Generate and return tokens
-    return _build_tokens(str(user.id))
+    tokens = _build_tokens(db, user.id)
+    await db.commit()
+    return tokens
 
 
-async def login(db: AsyncSession, email: str, password: str) -> TokenResponse:
+async def login(
+    db: AsyncSession,
+    email: str,
+    password: str,
+    schedule: Callable[..., None] | None = None,
+) -> TokenResponse:
     """Verify credentials and return JWT tokens.
 
+    If the stored hash uses an outdated bcrypt cost, rehash_password is passed
+    to `schedule` (e.g. BackgroundTasks.add_task) so it runs after the response.
+
     Raises:
         ValueError: If credentials are invalid.
     """
@@ -53,17 +67,40 @@ async def login(db: AsyncSession, email: str, password: str) -> TokenResponse:
     user = result.scalar_one_or_none()
 
     # Use same error message for wrong email and wrong password (security best practice)
-    if user is None or not verify_password(password, user.hashed_password):
+    if user is None or not await verify_password_async(password, user.hashed_password):
         raise ValueError("Nieprawidłowy email lub hasło")
 
     if not user.is_active:
         raise ValueError("Konto jest nieaktywne")
 
-    return _build_tokens(str(user.id))
+    if schedule is not None and needs_rehash(user.hashed_password):
+        schedule(rehash_password, user.id, password, user.hashed_password)
 
+    tokens = _build_tokens(db, user.id)
+    await db.commit()
+    return tokens
+
+
+async def rehash_password(user_id: uuid.UUID, password: str, old_hash: str) -> None:
+    """Store a new hash of a just-verified password with the current cost.
+
+    Runs in its own session, after the request's session is closed. The row is
+    only updated if the hash is still `old_hash`, so a password changed in the
+    meantime is never overwritten.
+    """
+    new_hash = await hash_password_async(password)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
+    user_cache.invalidate(user_id)
 
-async def refresh_tokens(db: AsyncSession, refresh_token: str) -> TokenResponse:
-    """Issue new token pair from a valid refresh token.
+
+def _decode_refresh_token(refresh_token: str) -> dict:
+    """Decode a refresh token and check its type.
 
     Raises:
         ValueError: If token is invalid, expired, or wrong type.
@@ -77,22 +114,50 @@ async def refresh_tokens(db: AsyncSession, refresh_token: str) -> TokenResponse:
     if payload.get("type") != "refresh":
         raise ValueError("Nieprawidłowy typ tokenu")
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise ValueError("Nieprawidłowy token")
+    return payload
 
-    # Verify user still exists and is active
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
-    if user is None or not user.is_active:
+
+async def refresh_tokens(db: AsyncSession, refresh_token: str) -> TokenResponse:
+    """Rotate a refresh token: revoke it and issue a new token pair.
+
+    Raises:
+        ValueError: If token is invalid, expired, wrong type, or already used.
+    """
+    payload = _decode_refresh_token(refresh_token)
+    user_id = uuid.UUID(payload["sub"])
+
+    # Verify user still exists and is active (cached — usually no query)
+    if await user_cache.get_active_user(db, user_id) is None:
         raise ValueError("Użytkownik nie istnieje lub jest nieaktywny")
 
-    return _build_tokens(user_id)
+    family_id = await token_store.rotate(db, payload)
+    tokens = _build_tokens(db, user_id, family_id)
+    await db.commit()
+    return tokens
 
 
-def _build_tokens(user_id: str) -> TokenResponse:
-    """Create access + refresh token pair for a given user ID."""
+async def logout(db: AsyncSession, refresh_token: str) -> None:
+    """Revoke the refresh token and every token rotated from the same login.
+
+    Raises:
+        ValueError: If token is invalid, expired, or wrong type.
+    """
+    payload = _decode_refresh_token(refresh_token)
+    _, family_id = token_store.token_ids(payload)
+    await token_store.revoke_family(db, family_id)
+    await db.commit()
+
+
+def _build_tokens(
+    db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID | None = None
+) -> TokenResponse:
+    """Create access + refresh token pair for a given user ID.
+
+    The refresh token is recorded in the token store; the caller commits.
+    """
     return TokenResponse(
-        access_token=create_access_token(user_id),
-        refresh_token=create_refresh_token(user_id),
+        access_token=create_access_token(str(user_id)),
+        refresh_token=token_store.issue(db, user_id, family_id),
     )
@@ -0,0 +1,190 @@
+"""
+In-process breed catalog.
+
+Breeds come from the seed script and practically never change, so the whole
+table is kept in memory (a few hundred rows) with lookups by id, FCI group,
+size category and normalized name, plus a prefix trie for typeahead. Breed
+endpoints are served from here, and dog queries attach breeds from the
+catalog instead of joining the breeds table.
+
+The catalog reloads on first use after invalidate(), once
+BREED_CATALOG_TTL_SECONDS have passed, or when the breeds table changed in
+any process: a trigger bumps breed_catalog_version on every change (the
+seed script included), and at most every BREED_CATALOG_CHECK_SECONDS that
+one-row version is compared with the one the catalog was loaded at.
+"""
+
+import time
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.core import search
+from app.core.sql_metrics import uncounted
+from app.core.trie import PrefixTrie
+from app.models.breed import Breed, BreedCatalogVersion, SizeCategory
+from app.models.dog import Dog
+from app.schemas.breed import BreedSuggestion, FciGroupResponse
+
+_version_query = select(BreedCatalogVersion.version).where(BreedCatalogVersion.id == 1)
+# Loaded with the breeds, so the version matches what the same snapshot returned
+_loaded_version = _version_query.scalar_subquery().label("catalog_version")
+
+
+class BreedCatalog:
+    """All breeds in memory, indexed for the breed endpoints."""
+
+    def __init__(self, ttl: float, check_interval: float):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        # breed_catalog_version.version the breeds were loaded at
+        self.version: int | None = None
+        self._loaded_at: float | None = None
+        self._checked_at = 0.0
+        self._by_id: dict[int, Breed] = {}
+        self._ordered: list[Breed] = []
+        self._by_fci_group: dict[int, list[Breed]] = {}
+        self._by_size: dict[SizeCategory, list[Breed]] = {}
+        self._by_name: dict[str, Breed] = {}
+        self._search_names: dict[int, list[str]] = {}
+        self._trie = PrefixTrie()
+        self._fci_groups: list[FciGroupResponse] = []
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def load(self, db: AsyncSession) -> None:
+        """(Re)load every breed and rebuild the indexes."""
+        # Plain rows turned into detached instances: they are shared across
+        # requests and never belong to (or get expunged from) any session.
+        # Not counted against the query budget of the request that triggers it
+        columns = Breed.__table__.columns
+        with uncounted():
+            result = await db.execute(select(*columns, _loaded_version))
+        breeds = []
+        version = None
+        for row in result.mappings():
+            version = row.get("catalog_version")
+            breed = Breed(**{column.key: row[column.key] for column in columns})
+            make_transient_to_detached(breed)
+            breeds.append(breed)
+        breeds.sort(key=self.sort_key)
+
+        by_fci_group: dict[int, list[Breed]] = {}
+        by_size: dict[SizeCategory, list[Breed]] = {}
+        by_name: dict[str, Breed] = {}
+        search_names: dict[int, list[str]] = {}
+        trie = PrefixTrie()
+        for breed in breeds:
+            if breed.fci_group is not None:
+                by_fci_group.setdefault(breed.fci_group, []).append(breed)
+            if breed.size_category is not None:
+                by_size.setdefault(breed.size_category, []).append(breed)
+
+            names = [search.normalize_text(n) for n in (breed.name_pl, breed.name_en) if n]
+            search_names[breed.id] = names
+            suggestion = BreedSuggestion.model_validate(breed)
+            for name in names:
+                by_name.setdefault(name, breed)
+                words = name.split()
+                # "niem" should find "Owczarek niemiecki" as well
+                for start in range(len(words)):
+                    trie.insert(" ".join(words[start:]), suggestion)
+
+        # Swap everything at once so concurrent readers never see a mix
+        self._by_id = {breed.id: breed for breed in breeds}
+        self._ordered = breeds
+        self._by_fci_group = by_fci_group
+        self._by_size = by_size
+        self._by_name = by_name
+        self._search_names = search_names
+        self._trie = trie
+        self._fci_groups = [
+            FciGroupResponse(fci_group=group, breed_count=len(by_fci_group[group]))
+            for group in sorted(by_fci_group)
+        ]
+        self.version = version
+        self._loaded_at = self._checked_at = time.monotonic()
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.is_fresh:
+            await self.load(db)
+        elif time.monotonic() - self._checked_at >= self.check_interval:
+            await self.check_version(db)
+
+    async def check_version(self, db: AsyncSession) -> None:
+        """Reload if the breeds changed since the load (one primary-key lookup)."""
+        with uncounted():
+            version = (await db.execute(_version_query)).scalar()
+        self._checked_at = time.monotonic()
+        if version != self.version:
+            await self.load(db)
+
+    def invalidate(self) -> None:
+        """Force a reload on next use (call after changing breeds)."""
+        self._loaded_at = None
+
+    @staticmethod
+    def sort_key(breed: Breed) -> tuple[str, str, int]:
+        """Catalog order: by name with diacritics folded ("Łajka" next to "Labrador")."""
+        return (search.normalize_text(breed.name_pl), breed.name_pl, breed.id)
+
+    def get(self, breed_id: int) -> Breed | None:
+        return self._by_id.get(breed_id)
+
+    def find_by_name(self, name: str) -> Breed | None:
+        """Look up a breed by its Polish or English name, ignoring case and diacritics."""
+        return self._by_name.get(search.normalize_text(name))
+
+    def filter(
+        self, fci_group: int | None = None, size_category: SizeCategory | None = None
+    ) -> list[Breed]:
+        """Breeds in catalog order, narrowed through the group/size indexes."""
+        if fci_group is None and size_category is None:
+            return self._ordered
+        if fci_group is None:
+            return self._by_size.get(size_category, [])
+        breeds = self._by_fci_group.get(fci_group, [])
+        if size_category is not None:
+            breeds = [b for b in breeds if b.size_category == size_category]
+        return breeds
+
+    def search_names(self, breed: Breed) -> list[str]:
+        """Normalized Polish and English names of a breed."""
+        return self._search_names.get(breed.id, [])
+
+    def suggest(self, prefix: str, limit: int) -> list[BreedSuggestion]:
+        return self._trie.search(search.normalize_text(prefix), limit)
+
+    @property
+    def fci_groups(self) -> list[FciGroupResponse]:
+        return self._fci_groups
+
+    async def attach(self, db: AsyncSession, dogs: Iterable[Dog]) -> None:
+        """Make dog.breed resolve from the catalog without a query or a join.
+
+        The dogs' breeds are merged into the session without loading. Many-to-one
+        lazy loads check the identity map first, so dog.breed is then served
+        from memory. The session only weakly references its objects, so the
+        merged breeds are also kept in session.info for its lifetime.
+        """
+        await self.ensure_loaded(db)
+        breed_ids = {dog.breed_id for dog in dogs}
+        if not breed_ids <= self._by_id.keys():
+            # A breed added since the last load — refresh once
+            await self.load(db)
+
+        attached = db.info.setdefault("catalog_breeds", {})
+        for breed_id in breed_ids - attached.keys():
+            breed = self._by_id.get(breed_id)
+            if breed is not None:
+                attached[breed_id] = await db.merge(breed, load=False)
+
+
+breed_catalog = BreedCatalog(
+    ttl=settings.BREED_CATALOG_TTL_SECONDS, check_interval=settings.BREED_CATALOG_CHECK_SECONDS
+)
@@ -1,8 +1,10 @@
-from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import search
+from app.core.pagination import paginate_sequence
 from app.models.breed import Breed, SizeCategory
-from app.schemas.breed import BreedListResponse, FciGroupResponse
+from app.schemas.breed import BreedListResponse, BreedSuggestion, FciGroupResponse
+from app.services.breed_catalog import breed_catalog
 
 
 async def list_breeds(
@@ -12,43 +14,79 @@ async def list_breeds(
     size_category: SizeCategory | None = None,
     page: int = 1,
     limit: int = 50,
+    cursor: str | None = None,
+    include_total: bool = True,
+    fuzzy: bool = False,
 ) -> BreedListResponse:
-    """Return paginated list of breeds with optional filters."""
-    query = select(Breed).order_by(Breed.name_pl)
+    """Return paginated list of breeds with optional filters.
 
-    if q is not None:
-        term = f"%{q}%"
-        query = query.where(
-            Breed.name_pl.ilike(term) | Breed.name_en.ilike(term)
-        )
-    if fci_group is not None:
-        query = query.where(Breed.fci_group == fci_group)
-    if size_category is not None:
-        query = query.where(Breed.size_category == size_category)
+    Served from the in-memory breed catalog, so totals are always exact.
+    A cursor (empty to start) switches from page numbers to keyset pagination;
+    include_total=False omits the total. The q search ignores case and Polish
+    diacritics; fuzzy=True also tolerates typos and orders by similarity.
 
-    count_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = count_result.scalar_one()
+    Raises:
+        ValueError: If the cursor is invalid or combined with fuzzy search.
+    """
+    ranked = fuzzy and q is not None
+    if ranked and cursor is not None:
+        raise ValueError(search.FUZZY_CURSOR_ERROR)
 
-    offset = (page - 1) * limit
-    result = await db.execute(query.offset(offset).limit(limit))
-    breeds = list(result.scalars().all())
+    await breed_catalog.ensure_loaded(db)
+    breeds = breed_catalog.filter(fci_group=fci_group, size_category=size_category)
+
+    if ranked:
+        scored = [(search.fuzzy_score(q, breed_catalog.search_names(b)), b) for b in breeds]
+        # sorted() is stable, so equal scores keep the name order
+        breeds = [b for score, b in sorted(scored, key=lambda pair: -pair[0]) if score > 0]
+    elif q is not None:
+        term = search.normalize_text(q)
+        breeds = [
+            b for b in breeds if any(term in name for name in breed_catalog.search_names(b))
+        ]
+
+    total = len(breeds) if include_total else None
+    total_kind = "exact" if include_total else None
+
+    if cursor is not None:
+        keyset = paginate_sequence(breeds, breed_catalog.sort_key, "breeds", cursor, limit)
+        return BreedListResponse(
+            items=keyset.items,
+            total=total,
+            total_kind=total_kind,
+            limit=limit,
+            next_cursor=keyset.next_cursor,
+            prev_cursor=keyset.prev_cursor,
+        )
 
+    offset = (page - 1) * limit
     return BreedListResponse(
-        items=breeds,
+        items=breeds[offset:offset + limit],
         total=total,
+        total_kind=total_kind,
         page=page,
         limit=limit,
-        pages=max(1, -(-total // limit)),
+        pages=None if total is None else max(1, -(-total // limit)),
     )
 
 
+async def suggest_breeds(db: AsyncSession, prefix: str, limit: int = 10) -> list[BreedSuggestion]:
+    """Return breeds with a (Polish or English) name word starting with prefix.
+
+    Served from the catalog's in-memory trie.
+    """
+    await breed_catalog.ensure_loaded(db)
+    return breed_catalog.suggest(prefix, limit)
+
+
 async def get_breed_by_id(db: AsyncSession, breed_id: int) -> Breed:
-    """Fetch a single breed by ID.
+    """Fetch a single breed by ID from the breed catalog.
 
     Raises:
         ValueError: If breed does not exist.
     """
-    breed = await db.get(Breed, breed_id)
+    await breed_catalog.ensure_loaded(db)
+    breed = breed_catalog.get(breed_id)
     if breed is None:
         raise ValueError("Rasa nie istnieje")
     return breed
@@ -56,14 +94,5 @@ async def get_breed_by_id(db: AsyncSession, breed_id: int) -> Breed:
 
 async def list_fci_groups(db: AsyncSession) -> list[FciGroupResponse]:
     """Return all FCI groups that have at least one breed, with breed counts."""
-    result = await db.execute(
-        select(Breed.fci_group, func.count(Breed.id).label("breed_count"))
-        .where(Breed.fci_group.is_not(None))
-        .group_by(Breed.fci_group)
-        .order_by(Breed.fci_group)
-    )
-    rows = result.all()
-    return [
-        FciGroupResponse(fci_group=row.fci_group, breed_count=row.breed_count)
-        for row in rows
-    ]
+    await breed_catalog.ensure_loaded(db)
+    return breed_catalog.fci_groups
@@ -0,0 +1,90 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.genetics import InbreedingCalculator, Pedigree
+from app.models.dog import Dog, DogSex
+from app.schemas.genetics import (
+    CoiResponse,
+    TestMatingCandidate,
+    TestMatingRequest,
+    TestMatingResponse,
+)
+from app.services import dog_service, pedigree_service
+
+
+async def get_coi(db: AsyncSession, dog_id: uuid.UUID, generations: int = 10) -> CoiResponse:
+    """Compute Wright's coefficient of inbreeding for a dog.
+
+    Ancestors up to N generations back are loaded in one query; anything
+    older is treated as unrelated founders.
+
+    Raises:
+        ValueError: If dog does not exist or its pedigree contains a cycle.
+    """
+    # +1 because the dog itself is the first level of the ancestor walk
+    parents = await pedigree_service.load_parent_links(db, [dog_id], generations + 1)
+    if dog_id not in parents:
+        raise ValueError("Pies nie istnieje")
+
+    calculator = InbreedingCalculator(Pedigree.from_parents(parents))
+    return CoiResponse(
+        dog_id=dog_id,
+        generations=generations,
+        coi=round(calculator.inbreeding(dog_id), 6),
+        ancestor_count=len(parents) - 1,
+    )
+
+
+async def plan_test_matings(
+    db: AsyncSession, dam_id: uuid.UUID, data: TestMatingRequest
+) -> TestMatingResponse:
+    """Rank candidate sires by the expected COI of a litter with the given dam.
+
+    The dam and every candidate share one ancestor query and one pedigree,
+    so common ancestors are processed once instead of once per sire.
+
+    Raises:
+        ValueError: If dam does not exist or is not female.
+    """
+    dam = await dog_service.get_dog_by_id(db, dam_id)
+    if dam.sex != DogSex.female:
+        raise ValueError("Matka (dam) musi być psem płci żeńskiej")
+
+    candidates_query = dog_service.apply_dog_filters(
+        select(Dog.id, Dog.name, Dog.registration_number),
+        breed_id=data.breed_id if data.breed_id is not None else dam.breed_id,
+        sex=DogSex.male,
+        is_available_for_breeding=data.is_available_for_breeding,
+        voivodeship=data.voivodeship,
+        city=data.city,
+    )
+    candidates = (await db.execute(candidates_query)).all()
+
+    sire_ids = [candidate.id for candidate in candidates]
+    parents = await pedigree_service.load_parent_links(
+        db, [dam_id, *sire_ids], data.generations + 1
+    )
+    calculator = InbreedingCalculator(Pedigree.from_parents(parents))
+    coefficients = calculator.offspring_inbreeding_many(sire_ids, dam_id)
+
+    ranked = sorted(
+        (
+            TestMatingCandidate(
+                sire_id=candidate.id,
+                name=candidate.name,
+                registration_number=candidate.registration_number,
+                coi=round(coi, 6),
+            )
+            for candidate, coi in zip(candidates, coefficients)
+        ),
+        key=lambda item: (item.coi, item.name),
+    )
+
+    return TestMatingResponse(
+        dam_id=dam_id,
+        generations=data.generations,
+        candidate_count=len(ranked),
+        items=ranked[: data.limit],
+    )
@@ -0,0 +1,105 @@
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.genetics import Pedigree
+from app.core.kinship import KinshipEngine
+from app.models.breed_diversity import BreedDiversityReport
+from app.models.dog import Dog
+
+# Generations with fewer dogs are ignored when estimating Ne — too noisy
+MIN_COHORT_SIZE = 20
+TOP_SIRES = 10
+
+
+def effective_population_size(
+    inbreeding: np.ndarray, generation: np.ndarray
+) -> float | None:
+    """Estimate Ne = 1 / (2 * ΔF) from the last two sufficiently large generations."""
+    counts = np.bincount(generation)
+    cohorts = [g for g in range(len(counts)) if counts[g] >= MIN_COHORT_SIZE]
+    if len(cohorts) < 2:
+        return None
+
+    previous = float(inbreeding[generation == cohorts[-2]].mean())
+    latest = float(inbreeding[generation == cohorts[-1]].mean())
+    delta = (latest - previous) / (1.0 - previous)
+    if delta <= 0:
+        return None
+    return 1.0 / (2.0 * delta)
+
+
+async def compute_breed_diversity(
+    db: AsyncSession, breed_id: int, block_size: int = 256
+) -> BreedDiversityReport:
+    """Build a population genetics report for one breed (not saved).
+
+    All dogs of the breed — including inactive ancestors — form the pedigree;
+    active dogs are the reference population for kinship and COI.
+    """
+    result = await db.execute(
+        select(Dog.id, Dog.sire_id, Dog.dam_id, Dog.is_active).where(Dog.breed_id == breed_id)
+    )
+    rows = result.all()
+    pedigree = Pedigree.from_parents({row.id: (row.sire_id, row.dam_id) for row in rows})
+    active = {row.id for row in rows if row.is_active}
+    members = np.fromiter(
+        (i for i, key in enumerate(pedigree.keys) if key in active), dtype=np.int64
+    )
+
+    engine = KinshipEngine(pedigree, block_size=block_size)
+    inbreeding = engine.inbreeding
+    generation = engine.generation
+
+    offspring = engine.offspring_counts()
+    top = [int(i) for i in np.argsort(-offspring, kind="stable")[:TOP_SIRES] if offspring[i] > 0]
+    top_ids = [pedigree.keys[i] for i in top]
+    names = {}
+    if top_ids:
+        names_result = await db.execute(select(Dog.id, Dog.name).where(Dog.id.in_(top_ids)))
+        names = {row.id: row.name for row in names_result}
+
+    return BreedDiversityReport(
+        breed_id=breed_id,
+        population_size=len(members),
+        pedigree_size=len(pedigree),
+        generations=engine.generations,
+        mean_kinship=engine.mean_kinship(members),
+        mean_coi=float(inbreeding[members].mean()) if len(members) else 0.0,
+        effective_population_size=effective_population_size(inbreeding, generation),
+        top_sires=[
+            {
+                "sire_id": str(pedigree.keys[i]),
+                "name": names.get(pedigree.keys[i], ""),
+                "offspring_count": int(offspring[i]),
+            }
+            for i in top
+        ],
+    )
+
+
+async def refresh_breed_diversity(db: AsyncSession, breed_id: int) -> BreedDiversityReport:
+    """Compute and store a new diversity report for a breed."""
+    report = await compute_breed_diversity(db, breed_id)
+    db.add(report)
+    await db.commit()
+    await db.refresh(report)
+    return report
+
+
+async def get_breed_diversity(db: AsyncSession, breed_id: int) -> BreedDiversityReport:
+    """Return the most recent diversity report for a breed.
+
+    Raises:
+        ValueError: If no report has been computed for this breed yet.
+    """
+    result = await db.execute(
+        select(BreedDiversityReport)
+        .where(BreedDiversityReport.breed_id == breed_id)
+        .order_by(BreedDiversityReport.computed_at.desc(), BreedDiversityReport.id.desc())
+        .limit(1)
+    )
+    report = result.scalar_one_or_none()
+    if report is None:
+        raise ValueError("Brak raportu różnorodności genetycznej dla tej rasy")
+    return report
@@ -0,0 +1,154 @@
+"""
+Full dog exports (GET /api/dogs/export) as NDJSON or CSV.
+
+Rows are read through a server-side cursor in partitions of PARTITION_SIZE
+and written out as they arrive, so memory use doesn't depend on the size of
+the export and the first rows are sent as soon as the first partition is
+fetched. Plain column rows are used instead of ORM objects — nothing is kept
+in the session's identity map. Parent links come with the parents'
+registration numbers, and breed names come from the breed catalog.
+
+The export runs in its own session: a streamed response outlives the
+request handler, and with it the request's session.
+"""
+
+import csv
+import enum
+import io
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.db.session import AsyncSessionLocal
+from app.models.breed import SizeCategory
+from app.models.dog import Dog, DogSex
+from app.services.breed_catalog import breed_catalog
+from app.services.dog_service import apply_dog_filters
+
+PARTITION_SIZE = 1000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+COLUMNS = (
+    "id",
+    "name",
+    "call_name",
+    "registration_number",
+    "microchip_number",
+    "sex",
+    "date_of_birth",
+    "breed_id",
+    "breed_name",
+    "color",
+    "titles",
+    "sire_id",
+    "sire_registration_number",
+    "dam_id",
+    "dam_registration_number",
+    "owner_id",
+    "created_at",
+)
+
+
+def export_query(sort_by: str | None = None, **filters: Any) -> Select:
+    """Column query for an export, with the list_dogs filters and sort order."""
+    sire = aliased(Dog)
+    dam = aliased(Dog)
+    query = (
+        select(
+            Dog.id,
+            Dog.name,
+            Dog.call_name,
+            Dog.registration_number,
+            Dog.microchip_number,
+            Dog.sex,
+            Dog.date_of_birth,
+            Dog.breed_id,
+            Dog.color,
+            Dog.titles,
+            Dog.sire_id,
+            sire.registration_number.label("sire_registration_number"),
+            Dog.dam_id,
+            dam.registration_number.label("dam_registration_number"),
+            Dog.owner_id,
+            Dog.created_at,
+        )
+        .outerjoin(sire, sire.id == Dog.sire_id)
+        .outerjoin(dam, dam.id == Dog.dam_id)
+    )
+    query = apply_dog_filters(query, **filters)
+    if sort_by == "name":
+        return query.order_by(Dog.name, Dog.id)
+    return query.order_by(Dog.created_at.desc(), Dog.id.desc())
+
+
+def _plain(value: Any) -> Any:
+    """JSON/CSV-friendly value: enums by value, dates in ISO format, UUIDs as text."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _record(row: Row) -> dict[str, Any]:
+    record = {key: _plain(value) for key, value in row._mapping.items()}
+    breed = breed_catalog.get(row.breed_id)
+    record["breed_name"] = breed.name_pl if breed is not None else None
+    return record
+
+
+def format_rows(rows: Sequence[Row], fmt: str) -> str:
+    """Render one partition of rows as NDJSON lines or CSV records."""
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps(_record(row), ensure_ascii=False) + "\n" for row in rows
+        )
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writerows(_record(row) for row in rows)
+    return buffer.getvalue()
+
+
+async def export_dogs(
+    fmt: str,
+    breed_id: int | None = None,
+    sex: DogSex | None = None,
+    is_available_for_breeding: bool | None = None,
+    name: str | None = None,
+    voivodeship: str | None = None,
+    city: str | None = None,
+    size_category: SizeCategory | None = None,
+    fci_group: int | None = None,
+    sort_by: str | None = None,
+    fuzzy: bool = False,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[str]:
+    """Yield the export in text chunks — a CSV header first, then one chunk per partition."""
+    query = export_query(
+        sort_by=sort_by,
+        breed_id=breed_id,
+        sex=sex,
+        is_available_for_breeding=is_available_for_breeding,
+        name=name,
+        voivodeship=voivodeship,
+        city=city,
+        size_category=size_category,
+        fci_group=fci_group,
+        fuzzy=fuzzy,
+    )
+    if fmt == "csv":
+        yield ",".join(COLUMNS) + "\r\n"
+
+    async with session_factory() as db:
+        await breed_catalog.ensure_loaded(db)
+        result = await db.stream(query.execution_options(yield_per=PARTITION_SIZE))
+        async for partition in result.partitions():
+            yield format_rows(partition, fmt)
@@ -0,0 +1,362 @@
+"""
+Bulk dog import (POST /api/dogs/bulk).
+
+Rows are validated set-wise rather than one dog at a time: breeds come from
+the in-memory breed catalog, one query finds registration and microchip
+numbers that are already taken, and one query loads every parent referenced
+outside the batch. Parents can also be other rows of the same import, given
+by registration number. Valid rows are inserted with multi-row INSERTs (or
+with COPY, for the registry importer's large chunks) and the ancestry
+closure table is extended one generation at a time.
+
+Invalid rows are reported with their position and skipped; the rest of the
+import goes through. Offspring of a skipped row are skipped too.
+"""
+
+import enum
+import json
+import uuid
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.dog import Dog, DogSex
+from app.schemas.dog import DogImportResponse, DogImportResult, DogImportRow
+from app.services import ancestry_service
+from app.services.breed_catalog import breed_catalog
+
+# Rows per INSERT statement (~20 parameters each, well below the protocol limit)
+INSERT_BATCH_SIZE = 1000
+
+TOO_MANY_ROWS = "Za dużo wierszy — maksymalnie {limit} w jednym imporcie"
+TOO_MANY_BYTES = "Za duży import — maksymalnie {limit} bajtów w jednym żądaniu"
+
+
+@dataclass
+class _Parent:
+    id: uuid.UUID
+    sex: DogSex
+    date_of_birth: date
+    row: int | None = None  # set for parents from the same import
+
+
+def check_content_length(value: str | None) -> None:
+    """Refuse a body whose declared size is over DOG_IMPORT_MAX_BYTES, before reading it.
+
+    Raises:
+        ValueError: If Content-Length is over the limit.
+    """
+    if value is not None and value.isdigit():
+        _check_size(int(value))
+
+
+async def read_json_array(chunks: AsyncIterable[bytes]) -> list[Any]:
+    """Rows of a JSON array body, read up to DOG_IMPORT_MAX_BYTES.
+
+    Raises:
+        ValueError: If the body is too large, not a JSON array or has too many rows.
+    """
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        _check_size(len(body))
+    return parse_json_array(bytes(body))
+
+
+def parse_json_array(body: bytes) -> list[Any]:
+    """Rows of a JSON array body.
+
+    Raises:
+        ValueError: If the body is not a JSON array or has too many rows.
+    """
+    try:
+        rows = json.loads(body)
+    except json.JSONDecodeError:
+        raise ValueError("Nieprawidłowy JSON")
+    if not isinstance(rows, list):
+        raise ValueError("Oczekiwano tablicy JSON z psami")
+    _check_row_count(len(rows))
+    return rows
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> list[str]:
+    """Lines of an NDJSON stream, read incrementally (each parsed later as a row).
+
+    Raises:
+        ValueError: If the stream has too many rows or bytes.
+    """
+    lines: list[str] = []
+    buffer = b""
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        _check_size(size)
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        lines.extend(line.decode("utf-8", "replace") for line in complete if line.strip())
+        _check_row_count(len(lines))
+    if buffer.strip():
+        lines.append(buffer.decode("utf-8", "replace"))
+        _check_row_count(len(lines))
+    return lines
+
+
+def _check_size(size: int) -> None:
+    if size > settings.DOG_IMPORT_MAX_BYTES:
+        raise ValueError(TOO_MANY_BYTES.format(limit=settings.DOG_IMPORT_MAX_BYTES))
+
+
+def _check_row_count(count: int) -> None:
+    if count > settings.DOG_IMPORT_MAX_ROWS:
+        raise ValueError(TOO_MANY_ROWS.format(limit=settings.DOG_IMPORT_MAX_ROWS))
+
+
+def _parse_row(raw: Any) -> DogImportRow:
+    """Validate one row — a JSON line (str) or an already decoded object."""
+    if isinstance(raw, str):
+        data = DogImportRow.model_validate_json(raw)
+    else:
+        data = DogImportRow.model_validate(raw)
+    if data.sire_id is not None and data.sire_registration_number is not None:
+        raise ValueError("Podaj ojca przez ID albo numer rejestracyjny, nie oba")
+    if data.dam_id is not None and data.dam_registration_number is not None:
+        raise ValueError("Podaj matkę przez ID albo numer rejestracyjny, nie oba")
+    return data
+
+
+def _describe(error: ValidationError) -> str:
+    """First validation error as "field: message"."""
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def _parent_error(
+    parent: _Parent | None,
+    sex: DogSex,
+    message: str,
+    date_of_birth: date,
+    errors: dict[int, str],
+) -> str | None:
+    """Why a parent can't be linked (same rules as dog_service), or None."""
+    if parent is None or parent.sex != sex:
+        return message
+    if parent.date_of_birth >= date_of_birth:
+        return "Rodzic musi urodzić się przed potomkiem"
+    if parent.row is not None and parent.row in errors:
+        return f"Rodzic z wiersza {parent.row} nie został zaimportowany"
+    return None
+
+
+async def _taken_numbers(
+    db: AsyncSession, registration_numbers: set[str], microchip_numbers: set[str]
+) -> tuple[set[str], set[str]]:
+    """Registration and microchip numbers from the import that already exist."""
+    if not registration_numbers and not microchip_numbers:
+        return set(), set()
+    result = await db.execute(
+        select(Dog.registration_number, Dog.microchip_number).where(
+            or_(
+                Dog.registration_number.in_(registration_numbers),
+                Dog.microchip_number.in_(microchip_numbers),
+            )
+        )
+    )
+    taken_registration: set[str] = set()
+    taken_microchip: set[str] = set()
+    for registration_number, microchip_number in result:
+        if registration_number in registration_numbers:
+            taken_registration.add(registration_number)
+        if microchip_number in microchip_numbers:
+            taken_microchip.add(microchip_number)
+    return taken_registration, taken_microchip
+
+
+async def _existing_parents(
+    db: AsyncSession, ids: set[uuid.UUID], registration_numbers: set[str]
+) -> tuple[dict[uuid.UUID, _Parent], dict[str, _Parent]]:
+    """Parents referenced from outside the import, by ID and by registration number."""
+    if not ids and not registration_numbers:
+        return {}, {}
+    result = await db.execute(
+        select(Dog.id, Dog.sex, Dog.date_of_birth, Dog.registration_number).where(
+            or_(Dog.id.in_(ids), Dog.registration_number.in_(registration_numbers))
+        )
+    )
+    by_id: dict[uuid.UUID, _Parent] = {}
+    by_registration: dict[str, _Parent] = {}
+    for row in result:
+        parent = _Parent(id=row.id, sex=row.sex, date_of_birth=row.date_of_birth)
+        by_id[row.id] = parent
+        if row.registration_number is not None:
+            by_registration[row.registration_number] = parent
+    return by_id, by_registration
+
+
+async def _copy_dogs(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert dogs with COPY on the session's connection, inside its transaction.
+
+    Binary COPY streams the rows without per-row statement overhead. It
+    bypasses the SQLAlchemy statement events, so it isn't counted or timed.
+    """
+    columns = list(rows[0])
+    connection = await (await db.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(
+        Dog.__tablename__,
+        columns=columns,
+        records=[
+            tuple(
+                value.value if isinstance(value, enum.Enum) else value
+                for value in (row[column] for column in columns)
+            )
+            for row in rows
+        ],
+    )
+
+
+async def import_dogs(
+    db: AsyncSession,
+    owner_id: uuid.UUID,
+    rows: list[Any],
+    commit: bool = True,
+    copy: bool = False,
+) -> DogImportResponse:
+    """Validate and insert many dogs for one owner in a single transaction.
+
+    With commit=False the transaction is left open for the caller to commit
+    together with its own writes. copy=True inserts the dogs with COPY
+    (PostgreSQL only), which pays off for thousands of rows.
+
+    Raises:
+        ValueError: If there are more rows than DOG_IMPORT_MAX_ROWS.
+    """
+    _check_row_count(len(rows))
+    errors: dict[int, str] = {}
+    parsed: dict[int, DogImportRow] = {}
+    for index, raw in enumerate(rows):
+        try:
+            parsed[index] = _parse_row(raw)
+        except ValidationError as e:
+            errors[index] = _describe(e)
+        except ValueError as e:
+            errors[index] = str(e)
+
+    await breed_catalog.ensure_loaded(db)
+    taken_registration, taken_microchip = await _taken_numbers(
+        db,
+        {d.registration_number for d in parsed.values() if d.registration_number},
+        {d.microchip_number for d in parsed.values() if d.microchip_number},
+    )
+
+    # Row checks that don't involve parents; numbers must also be unique in the batch
+    in_batch: dict[str, int] = {}
+    seen_microchips: set[str] = set()
+    for index, data in parsed.items():
+        if breed_catalog.get(data.breed_id) is None:
+            errors[index] = "Podana rasa nie istnieje"
+        elif data.registration_number and (
+            data.registration_number in taken_registration
+            or data.registration_number in in_batch
+        ):
+            errors[index] = "Pies z tym numerem rejestracyjnym już istnieje"
+        elif data.microchip_number and (
+            data.microchip_number in taken_microchip or data.microchip_number in seen_microchips
+        ):
+            errors[index] = "Pies z tym numerem mikroczipa już istnieje"
+        else:
+            if data.registration_number:
+                in_batch[data.registration_number] = index
+            if data.microchip_number:
+                seen_microchips.add(data.microchip_number)
+    candidates = {index: data for index, data in parsed.items() if index not in errors}
+
+    existing_by_id, existing_by_registration = await _existing_parents(
+        db,
+        {
+            parent_id
+            for data in candidates.values()
+            for parent_id in (data.sire_id, data.dam_id)
+            if parent_id is not None
+        },
+        {
+            number
+            for data in candidates.values()
+            for number in (data.sire_registration_number, data.dam_registration_number)
+            if number is not None and number not in in_batch
+        },
+    )
+
+    ids = {index: uuid.uuid4() for index in candidates}
+    accepted: list[dict[str, Any]] = []
+    generation: dict[int, int] = {}
+    generations: list[list[uuid.UUID]] = []
+
+    def resolve(parent_id: uuid.UUID | None, number: str | None) -> _Parent | None:
+        if parent_id is not None:
+            return existing_by_id.get(parent_id)
+        if number in in_batch:
+            row = in_batch[number]
+            data = candidates[row]
+            return _Parent(id=ids[row], sex=data.sex, date_of_birth=data.date_of_birth, row=row)
+        return existing_by_registration.get(number)
+
+    # Oldest first: a parent is always born before its offspring, so in-batch
+    # parents are settled (accepted or rejected) before their children
+    for index in sorted(candidates, key=lambda i: (candidates[i].date_of_birth, i)):
+        data = candidates[index]
+        parents: list[_Parent] = []
+        for parent_id, number, sex, message in (
+            (data.sire_id, data.sire_registration_number, DogSex.male,
+             "Ojciec (sire) musi być psem płci męskiej"),
+            (data.dam_id, data.dam_registration_number, DogSex.female,
+             "Matka (dam) musi być psem płci żeńskiej"),
+        ):
+            if parent_id is None and number is None:
+                continue
+            parent = resolve(parent_id, number)
+            error = _parent_error(parent, sex, message, data.date_of_birth, errors)
+            if error is not None:
+                errors[index] = error
+                break
+            parents.append(parent)
+        if index in errors:
+            continue
+
+        sire = next((p.id for p in parents if p.sex == DogSex.male), None)
+        dam = next((p.id for p in parents if p.sex == DogSex.female), None)
+        values = data.model_dump(exclude={"sire_registration_number", "dam_registration_number"})
+        values.update(id=ids[index], owner_id=owner_id, sire_id=sire, dam_id=dam, is_active=True)
+        accepted.append(values)
+
+        # Generation within the import: one more than the youngest in-batch parent
+        level = max((generation[p.row] + 1 for p in parents if p.row is not None), default=0)
+        generation[index] = level
+        if level == len(generations):
+            generations.append([])
+        generations[level].append(ids[index])
+
+    if copy and accepted:
+        await _copy_dogs(db, accepted)
+    else:
+        for start in range(0, len(accepted), INSERT_BATCH_SIZE):
+            await db.execute(insert(Dog).values(accepted[start:start + INSERT_BATCH_SIZE]))
+    await ancestry_service.add_generations(db, generations)
+    if commit:
+        await db.commit()
+
+    items = [
+        DogImportResult(
+            row=index,
+            id=ids.get(index) if index not in errors else None,
+            registration_number=parsed[index].registration_number if index in parsed else None,
+            error=errors.get(index),
+        )
+        for index in range(len(rows))
+    ]
+    return DogImportResponse(created=len(accepted), failed=len(errors), items=items)
@@ -1,40 +1,102 @@
 import uuid
+from datetime import date
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, any_, exists, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
+from app.config import settings
+from app.core import search
+from app.core.counting import count_total
+from app.core.pagination import INVALID_CURSOR, decode_cursor, encode_cursor, paginate_keyset
 from app.models.breed import Breed, SizeCategory
 from app.models.dog import Dog, DogSex
+from app.models.dog_ancestry import DogAncestry
 from app.models.user import User
-from app.schemas.dog import DogCreate, DogListResponse, DogUpdate
+from app.schemas.dog import (
+    DescendantListResponse,
+    DescendantResponse,
+    DogBatchResponse,
+    DogCreate,
+    DogListResponse,
+    DogResponse,
+    DogSuggestion,
+    DogUpdate,
+    PedigreeNode,
+)
+from app.services import ancestry_service, pedigree_service
+from app.services.breed_catalog import breed_catalog
+
+
+async def _validate_parents(
+    db: AsyncSession,
+    date_of_birth: date,
+    sire_id: uuid.UUID | None,
+    dam_id: uuid.UUID | None,
+    dog_id: uuid.UUID | None = None,
+) -> None:
+    """Check new parent links — shared by create_dog and update_dog.
+
+    Both parents are checked in a single query. For an existing dog the same
+    query also asks the ancestry closure table whether a proposed parent is
+    already the dog itself or one of its descendants, which would make the
+    pedigree cyclic. That is one indexed lookup however deep the pedigree is.
+
+    Raises:
+        ValueError: If a parent is missing, has the wrong sex, is not older
+            than the dog, or would create a cycle.
+    """
+    parent_ids = [parent_id for parent_id in (sire_id, dam_id) if parent_id is not None]
+    if not parent_ids:
+        return
+
+    columns = [Dog.id, Dog.sex, Dog.date_of_birth]
+    if dog_id is not None:
+        # The dog's own self row (depth 0) makes "parent of itself" a cycle too
+        columns.append(
+            exists()
+            .where(DogAncestry.ancestor_id == dog_id, DogAncestry.descendant_id == Dog.id)
+            .label("is_descendant")
+        )
+    result = await db.execute(select(*columns).where(Dog.id.in_(parent_ids)))
+    parents = {row.id: row for row in result}
+
+    for parent_id, sex, message in (
+        (sire_id, DogSex.male, "Ojciec (sire) musi być psem płci męskiej"),
+        (dam_id, DogSex.female, "Matka (dam) musi być psem płci żeńskiej"),
+    ):
+        if parent_id is None:
+            continue
+        parent = parents.get(parent_id)
+        if parent is None or parent.sex != sex:
+            raise ValueError(message)
+        if dog_id is not None and parent.is_descendant:
+            raise ValueError("Pies nie może być swoim własnym przodkiem")
+        if parent.date_of_birth >= date_of_birth:
+            raise ValueError("Rodzic musi urodzić się przed potomkiem")
 
 
 async def create_dog(db: AsyncSession, owner_id: uuid.UUID, data: DogCreate) -> Dog:
     """Create a new dog profile.
 
     Raises:
-        ValueError: If breed doesn't exist or parent sex is wrong.
+        ValueError: If breed doesn't exist or parents are invalid.
     """
     # Verify breed exists
-    breed = await db.get(Breed, data.breed_id)
-    if breed is None:
+    await breed_catalog.ensure_loaded(db)
+    if breed_catalog.get(data.breed_id) is None:
         raise ValueError("Podana rasa nie istnieje")
 
-    # Verify sire is male
-    if data.sire_id:
-        sire = await db.get(Dog, data.sire_id)
-        if sire is None or sire.sex != DogSex.male:
-            raise ValueError("Ojciec (sire) musi być psem płci męskiej")
-
-    # Verify dam is female
-    if data.dam_id:
-        dam = await db.get(Dog, data.dam_id)
-        if dam is None or dam.sex != DogSex.female:
-            raise ValueError("Matka (dam) musi być psem płci żeńskiej")
+    await _validate_parents(db, data.date_of_birth, data.sire_id, data.dam_id)
 
     dog = Dog(id=uuid.uuid4(), owner_id=owner_id, **data.model_dump())
     db.add(dog)
+    await db.flush()
+
+    # Keep the ancestry closure table in step within the same transaction
+    await ancestry_service.add_self_row(db, dog.id)
+    await ancestry_service.sync_parents(db, dog.id, (None, None), (dog.sire_id, dog.dam_id))
     await db.commit()
 
     # Reload with breed relationship
@@ -42,39 +104,85 @@ async def create_dog(db: AsyncSession, owner_id: uuid.UUID, data: DogCreate) ->
 
 
 async def get_dog_by_id(db: AsyncSession, dog_id: uuid.UUID) -> Dog:
-    """Fetch an active dog by ID with breed loaded.
+    """Fetch an active dog by ID with breed attached from the breed catalog.
 
     Raises:
         ValueError: If dog doesn't exist or is inactive.
     """
     result = await db.execute(
-        select(Dog)
-        .options(joinedload(Dog.breed))
-        .where(Dog.id == dog_id, Dog.is_active == True)  # noqa: E712
+        select(Dog).where(Dog.id == dog_id, Dog.is_active == True)  # noqa: E712
     )
     dog = result.scalar_one_or_none()
     if dog is None:
         raise ValueError("Pies nie istnieje")
+    await breed_catalog.attach(db, [dog])
     return dog
 
 
+async def get_dogs_by_ids(db: AsyncSession, ids: list[uuid.UUID]) -> DogBatchResponse:
+    """Fetch many active dogs in one query, keyed by ID, with breeds attached.
+
+    The IDs are bound as a single array parameter (id = ANY($1)), so the
+    statement is the same however many IDs are asked for.
+
+    Raises:
+        ValueError: If more than DOG_BATCH_MAX_IDS distinct IDs are given.
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > settings.DOG_BATCH_MAX_IDS:
+        raise ValueError(f"Można pobrać maksymalnie {settings.DOG_BATCH_MAX_IDS} psów naraz")
+    if not ids:
+        return DogBatchResponse(items={}, missing=[])
+
+    result = await db.execute(
+        select(Dog).where(
+            Dog.id == any_(literal(ids, ARRAY(Dog.id.type))),
+            Dog.is_active == True,  # noqa: E712
+        )
+    )
+    dogs = {dog.id: dog for dog in result.scalars()}
+    await breed_catalog.attach(db, dogs.values())
+    return DogBatchResponse(
+        items={dog_id: dogs[dog_id] for dog_id in ids if dog_id in dogs},
+        missing=[dog_id for dog_id in ids if dog_id not in dogs],
+    )
+
+
 async def update_dog(
     db: AsyncSession, dog_id: uuid.UUID, owner_id: uuid.UUID, data: DogUpdate
 ) -> Dog:
     """Apply partial update to a dog. Only the owner can edit.
 
     Raises:
-        ValueError: If dog not found or user is not the owner.
+        ValueError: If dog not found, user is not the owner or new parents are invalid.
     """
     dog = await get_dog_by_id(db, dog_id)
 
     if dog.owner_id != owner_id:
         raise ValueError("Nie masz uprawnień do edycji tego psa")
 
+    old_parents = (dog.sire_id, dog.dam_id)
     changes = data.model_dump(exclude_unset=True)
+
+    # Validate only the parent links that actually change
+    new_sire = changes.get("sire_id", dog.sire_id)
+    new_dam = changes.get("dam_id", dog.dam_id)
+    await _validate_parents(
+        db,
+        dog.date_of_birth,
+        new_sire if new_sire != dog.sire_id else None,
+        new_dam if new_dam != dog.dam_id else None,
+        dog_id=dog.id,
+    )
+
     for field, value in changes.items():
         setattr(dog, field, value)
 
+    new_parents = (dog.sire_id, dog.dam_id)
+    if new_parents != old_parents:
+        await db.flush()
+        await ancestry_service.sync_parents(db, dog.id, old_parents, new_parents)
+
     await db.commit()
     return await get_dog_by_id(db, dog_id)
 
@@ -96,8 +204,8 @@ async def delete_dog(
     await db.commit()
 
 
-async def list_dogs(
-    db: AsyncSession,
+def apply_dog_filters(
+    query: Select,
     breed_id: int | None = None,
     sex: DogSex | None = None,
     is_available_for_breeding: bool | None = None,
@@ -106,17 +214,14 @@ async def list_dogs(
     city: str | None = None,
     size_category: SizeCategory | None = None,
     fci_group: int | None = None,
-    sort_by: str | None = None,
-    page: int = 1,
-    limit: int = 20,
-) -> DogListResponse:
-    """Return paginated list of dogs with optional filters and sorting."""
-    # Base query — only active dogs with breed loaded
-    query = (
-        select(Dog)
-        .options(joinedload(Dog.breed))
-        .where(Dog.is_active == True)  # noqa: E712
-    )
+    fuzzy: bool = False,
+) -> Select:
+    """Restrict a Dog query to active dogs matching the list_dogs filters.
+
+    The name filter ignores case and Polish diacritics; with fuzzy=True it
+    also tolerates typos (see app.core.search).
+    """
+    query = query.where(Dog.is_active == True)  # noqa: E712
 
     # Apply filters dynamically — only add WHERE clauses for provided params
     if breed_id is not None:
@@ -126,9 +231,12 @@ async def list_dogs(
     if is_available_for_breeding is not None:
         query = query.where(Dog.is_available_for_breeding == is_available_for_breeding)
     if name is not None:
-        query = query.where(Dog.name.ilike(f"%{name}%"))
+        if fuzzy:
+            query = query.where(search.fuzzy_match([Dog.name], name)[0])
+        else:
+            query = query.where(search.contains([Dog.name], name))
 
-    # Breed attribute filters via subquery (avoids JOIN conflict with joinedload)
+    # Breed attribute filters via subquery (dog queries never join breeds)
     if size_category is not None:
         query = query.where(
             Dog.breed_id.in_(select(Breed.id).where(Breed.size_category == size_category))
@@ -147,54 +255,233 @@ async def list_dogs(
             owner_query = owner_query.where(User.city.ilike(f"%{city}%"))
         query = query.where(Dog.owner_id.in_(owner_query))
 
-    # Sorting
+    return query
+
+
+async def list_dogs(
+    db: AsyncSession,
+    breed_id: int | None = None,
+    sex: DogSex | None = None,
+    is_available_for_breeding: bool | None = None,
+    name: str | None = None,
+    voivodeship: str | None = None,
+    city: str | None = None,
+    size_category: SizeCategory | None = None,
+    fci_group: int | None = None,
+    sort_by: str | None = None,
+    page: int = 1,
+    limit: int = 20,
+    cursor: str | None = None,
+    include_total: bool = True,
+    fuzzy: bool = False,
+) -> DogListResponse:
+    """Return paginated list of dogs with optional filters and sorting.
+
+    Pages are numbered (OFFSET) unless a cursor is given — an empty cursor
+    starts keyset pagination, which seeks on the sort key index instead.
+    include_total=False skips counting; see app.core.counting. fuzzy=True
+    makes the name search typo-tolerant and orders results by similarity.
+
+    Raises:
+        ValueError: If the cursor is invalid or combined with fuzzy search.
+    """
+    ranked = fuzzy and name is not None
+    if ranked and cursor is not None:
+        raise ValueError(search.FUZZY_CURSOR_ERROR)
+
+    filters = {
+        "breed_id": breed_id,
+        "sex": sex,
+        "is_available_for_breeding": is_available_for_breeding,
+        "name": name,
+        "voivodeship": voivodeship,
+        "city": city,
+        "size_category": size_category,
+        "fci_group": fci_group,
+        "fuzzy": fuzzy,
+    }
+    # Base query — only active dogs; breeds are attached from the catalog
+    query = apply_dog_filters(select(Dog), **filters)
+
+    # Sorting — id breaks ties so the order (and every page) is stable
     if sort_by == "name":
-        query = query.order_by(Dog.name.asc())
+        scope, keys, descending = "dogs:name", [Dog.name, Dog.id], False
     else:
-        query = query.order_by(Dog.created_at.desc())
+        scope, keys, descending = "dogs:newest", [Dog.created_at, Dog.id], True
 
-    # Count total matching records (for pagination metadata)
-    count_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = count_result.scalar_one()
+    # Total matching records (for pagination metadata) — cached or estimated
+    count = await count_total(db, query, "dogs", filters, include_total)
 
-    # Apply pagination
+    if cursor is not None:
+        keyset = await paginate_keyset(
+            db, query, keys, scope, cursor, limit, descending=descending
+        )
+        await breed_catalog.attach(db, keyset.items)
+        return DogListResponse(
+            items=keyset.items,
+            total=count.total,
+            total_kind=count.kind,
+            limit=limit,
+            next_cursor=keyset.next_cursor,
+            prev_cursor=keyset.prev_cursor,
+        )
+
+    # Apply pagination — best matches first when searching fuzzily
+    if ranked:
+        query = query.order_by(search.fuzzy_match([Dog.name], name)[1].desc())
+    query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
     offset = (page - 1) * limit
     result = await db.execute(query.offset(offset).limit(limit))
-    dogs = list(result.scalars().unique().all())
+    dogs = list(result.scalars().all())
+    await breed_catalog.attach(db, dogs)
 
     return DogListResponse(
         items=dogs,
-        total=total,
+        total=count.total,
+        total_kind=count.kind,
         page=page,
         limit=limit,
-        pages=max(1, -(-total // limit)),  # ceiling division
+        pages=None if count.total is None else max(1, -(-count.total // limit)),  # ceiling division
     )
 
 
-async def get_pedigree(
-    db: AsyncSession, dog_id: uuid.UUID, generations: int = 3
-) -> Dog | None:
-    """Recursively load pedigree tree up to N generations.
+async def suggest_dogs(
+    db: AsyncSession,
+    prefix: str,
+    sex: DogSex | None = None,
+    breed_id: int | None = None,
+    limit: int = 10,
+) -> list[DogSuggestion]:
+    """Return active dogs whose name starts with prefix, for typeahead pickers.
 
-    Fetches sire and dam for each dog, going back `generations` levels.
-    Returns the root dog with nested sire/dam attributes populated.
+    Matching ignores case and Polish diacritics. Only id, name and
+    registration number are read, in one range scan of a prefix index
+    (breed_id, sex, name or name alone) — no count, no offset.
     """
-    if generations <= 0:
-        return None
+    query = (
+        select(Dog.id, Dog.name, Dog.registration_number)
+        .where(Dog.is_active == True, search.starts_with(Dog.name, prefix))  # noqa: E712
+        .order_by(search.prefix_key(Dog.name))
+        .limit(limit)
+    )
+    if breed_id is not None:
+        query = query.where(Dog.breed_id == breed_id)
+    if sex is not None:
+        query = query.where(Dog.sex == sex)
+
+    result = await db.execute(query)
+    return [DogSuggestion.model_validate(row) for row in result]
 
+
+def _encode_descendant_cursor(dog_id: uuid.UUID, generation: int, descendant_id: uuid.UUID) -> str:
+    return encode_cursor(f"descendants:{dog_id}", "next", [generation, descendant_id])
+
+
+def _decode_descendant_cursor(dog_id: uuid.UUID, cursor: str) -> tuple[int, uuid.UUID]:
+    _, values = decode_cursor(cursor, f"descendants:{dog_id}")
+    try:
+        generation, descendant_id = values
+        return int(generation), uuid.UUID(descendant_id)
+    except (TypeError, ValueError):
+        raise ValueError(INVALID_CURSOR)
+
+
+async def list_descendants(
+    db: AsyncSession,
+    dog_id: uuid.UUID,
+    generations: int = 3,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> DescendantListResponse:
+    """Return a page of a dog's active descendants, ordered by generation.
+
+    Reads the ancestry closure table in (generation, id) index order with
+    keyset pagination, so each page costs one bounded index range scan no
+    matter how large the subtree is. Dogs reachable by several paths are
+    listed once, at their nearest generation.
+
+    Raises:
+        ValueError: If dog doesn't exist or the cursor is malformed.
+    """
+    await get_dog_by_id(db, dog_id)
+
+    link = DogAncestry
+    nearer = aliased(DogAncestry)
+    conditions = [
+        link.ancestor_id == dog_id,
+        link.depth > 0,
+        link.depth <= generations,
+        # Skip rows for which a shorter path to the same descendant exists
+        ~exists().where(
+            nearer.ancestor_id == dog_id,
+            nearer.descendant_id == link.descendant_id,
+            nearer.depth < link.depth,
+        ),
+        Dog.is_active == True,  # noqa: E712
+    ]
+
+    query = (
+        select(Dog, link.depth)
+        .join(link, link.descendant_id == Dog.id)
+        .where(*conditions)
+    )
+    if cursor is not None:
+        after_generation, after_id = _decode_descendant_cursor(dog_id, cursor)
+        query = query.where(
+            tuple_(link.depth, link.descendant_id) > tuple_(after_generation, after_id)
+        )
+
+    # Fetch one extra row to know whether another page exists
     result = await db.execute(
-        select(Dog)
-        .options(joinedload(Dog.breed))
-        .where(Dog.id == dog_id)
+        query.order_by(link.depth, link.descendant_id).limit(limit + 1)
     )
-    dog = result.scalar_one_or_none()
-    if dog is None:
-        return None
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    await breed_catalog.attach(db, [dog for dog, _ in rows])
+
+    items = [
+        DescendantResponse(**DogResponse.model_validate(dog).model_dump(), generation=depth)
+        for dog, depth in rows
+    ]
+
+    # Per-generation totals only come with the first page
+    generation_counts = None
+    if cursor is None:
+        counts = await db.execute(
+            select(link.depth, func.count())
+            .select_from(link)
+            .join(Dog, Dog.id == link.descendant_id)
+            .where(*conditions)
+            .group_by(link.depth)
+            .order_by(link.depth)
+        )
+        generation_counts = {depth: count for depth, count in counts.all()}
 
-    # Recursively load parents
-    if dog.sire_id:
-        dog.sire = await get_pedigree(db, dog.sire_id, generations - 1)
-    if dog.dam_id:
-        dog.dam = await get_pedigree(db, dog.dam_id, generations - 1)
+    next_cursor = None
+    if has_more:
+        last_dog, last_depth = rows[-1]
+        next_cursor = _encode_descendant_cursor(dog_id, last_depth, last_dog.id)
 
-    return dog
+    return DescendantListResponse(
+        items=items,
+        generation_counts=generation_counts,
+        next_cursor=next_cursor,
+        limit=limit,
+    )
+
+
+async def get_pedigree(
+    db: AsyncSession, dog_id: uuid.UUID, generations: int = 3
+) -> PedigreeNode | None:
+    """Load pedigree tree up to N generations.
+
+    All ancestors are fetched in one recursive CTE query, their breeds are
+    attached from breed_catalog, then the sire/dam tree is assembled in memory.
+    Returns None if the root dog does not exist.
+    """
+    if generations <= 0:
+        return None
+
+    dogs = await pedigree_service.load_ancestors(db, dog_id, generations)
+    return pedigree_service.build_pedigree_tree(dogs, dog_id, generations)
@@ -0,0 +1,92 @@
+import uuid
+
+from sqlalchemy import CTE, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.dog import Dog
+from app.schemas.dog import BreedInfo, PedigreeNode
+from app.services.breed_catalog import breed_catalog
+
+
+def ancestors_cte(dog_ids: list[uuid.UUID], generations: int) -> CTE:
+    """Build a recursive CTE walking sire_id/dam_id up to N generations.
+
+    Rows are (id, sire_id, dam_id, depth) where the starting dogs have depth 1.
+    UNION (not UNION ALL) collapses repeated paths at the same depth, so heavily
+    inbred pedigrees don't blow up exponentially. The same ancestor can still
+    appear at several depths — callers needing the ancestor set use DISTINCT.
+    """
+    anchor = select(
+        Dog.id, Dog.sire_id, Dog.dam_id, literal(1).label("depth")
+    ).where(Dog.id.in_(dog_ids))
+    ancestors = anchor.cte("ancestors", recursive=True)
+
+    parent = aliased(Dog)
+    step = (
+        select(parent.id, parent.sire_id, parent.dam_id, (ancestors.c.depth + 1))
+        .select_from(ancestors)
+        .join(
+            parent,
+            or_(parent.id == ancestors.c.sire_id, parent.id == ancestors.c.dam_id),
+        )
+        .where(ancestors.c.depth < generations)
+    )
+    return ancestors.union(step)
+
+
+async def load_ancestors(
+    db: AsyncSession, dog_id: uuid.UUID, generations: int
+) -> dict[uuid.UUID, Dog]:
+    """Load a dog and all its ancestors up to N generations in a single query.
+
+    Returns a mapping of dog ID to Dog with breed attached from the breed catalog.
+    """
+    ancestors = ancestors_cte([dog_id], generations)
+    result = await db.execute(select(Dog).where(Dog.id.in_(select(ancestors.c.id))))
+    dogs = {dog.id: dog for dog in result.scalars().all()}
+    await breed_catalog.attach(db, dogs.values())
+    return dogs
+
+
+async def load_parent_links(
+    db: AsyncSession, dog_ids: list[uuid.UUID], generations: int
+) -> dict[uuid.UUID, tuple[uuid.UUID | None, uuid.UUID | None]]:
+    """Load {dog_id: (sire_id, dam_id)} for dogs and ancestors up to N generations.
+
+    Only parent links are fetched — no ORM objects — so this stays cheap
+    for deep pedigrees used in genetic calculations.
+    """
+    ancestors = ancestors_cte(dog_ids, generations)
+    result = await db.execute(
+        select(ancestors.c.id, ancestors.c.sire_id, ancestors.c.dam_id).distinct()
+    )
+    return {row.id: (row.sire_id, row.dam_id) for row in result}
+
+
+def build_pedigree_tree(
+    dogs: dict[uuid.UUID, Dog], dog_id: uuid.UUID | None, generations: int
+) -> PedigreeNode | None:
+    """Assemble a PedigreeNode tree from preloaded dogs.
+
+    Mirrors the old per-ancestor walk: each node gets parents only while
+    generations remain, and missing parents are left as None.
+    """
+    if generations <= 0 or dog_id is None:
+        return None
+
+    dog = dogs.get(dog_id)
+    if dog is None:
+        return None
+
+    return PedigreeNode(
+        id=dog.id,
+        name=dog.name,
+        sex=dog.sex,
+        date_of_birth=dog.date_of_birth,
+        breed=BreedInfo.model_validate(dog.breed),
+        registration_number=dog.registration_number,
+        photo_url=dog.photo_url,
+        sire=build_pedigree_tree(dogs, dog.sire_id, generations - 1),
+        dam=build_pedigree_tree(dogs, dog.dam_id, generations - 1),
+    )
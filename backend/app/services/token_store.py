@@ -0,0 +1,153 @@
+"""
+Refresh token store: rotation, reuse detection and revocation.
+
+Every refresh token has a row in refresh_tokens (see RefreshToken). A refresh
+revokes the presented token with one conditional UPDATE and issues the next
+token of the same family. If the UPDATE finds the token already revoked, it
+was used twice — someone holds a copy — and the whole family is revoked.
+
+Revoked token IDs are also kept in memory until they expire, so replayed
+and logged-out tokens are rejected with a set lookup before any query. The
+set is per process; revocations made by other processes are picked up by
+the periodic reload_revoked() and meanwhile still caught by the UPDATE.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.security import create_refresh_token
+from app.models.refresh_token import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+INVALID_TOKEN = "Nieprawidłowy token"
+REUSED_TOKEN = "Token został już użyty — zaloguj się ponownie"
+
+
+class RevokedTokens:
+    """Revoked token IDs with their expiry; membership checks are O(1)."""
+
+    def __init__(self) -> None:
+        self._expires: dict[uuid.UUID, datetime] = {}
+
+    def __contains__(self, jti: uuid.UUID) -> bool:
+        return jti in self._expires
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, jti: uuid.UUID, expires_at: datetime) -> None:
+        self._expires[jti] = expires_at
+
+    def prune(self, now: datetime) -> None:
+        """Forget tokens that have expired anyway."""
+        self._expires = {jti: exp for jti, exp in self._expires.items() if exp > now}
+
+    def replace(self, entries: dict[uuid.UUID, datetime]) -> None:
+        self._expires = entries
+
+
+revoked_tokens = RevokedTokens()
+
+
+def issue(db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID | None = None) -> str:
+    """Record a new refresh token (a new family unless given) and return it.
+
+    The caller commits.
+    """
+    jti = uuid.uuid4()
+    family_id = family_id or uuid.uuid4()
+    expires_at = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at))
+    return create_refresh_token(str(user_id), str(jti), str(family_id), expires_at)
+
+
+def token_ids(payload: dict) -> tuple[uuid.UUID, uuid.UUID]:
+    """Return (jti, family_id) from a decoded refresh token.
+
+    Raises:
+        ValueError: If the claims are missing (e.g. a token issued before the store).
+    """
+    try:
+        return uuid.UUID(payload["jti"]), uuid.UUID(payload["fam"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(INVALID_TOKEN)
+
+
+async def rotate(db: AsyncSession, payload: dict) -> uuid.UUID:
+    """Revoke the presented refresh token and return its family for the next one.
+
+    The caller issues the next token and commits.
+
+    Raises:
+        ValueError: If the token is unknown, or revoked (then its family is
+            revoked and committed as well).
+    """
+    jti, family_id = token_ids(payload)
+    if jti not in revoked_tokens:
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == jti, RefreshToken.revoked.is_(False))
+            .values(revoked=True)
+            .returning(RefreshToken.expires_at)
+        )
+        expires_at = result.scalar_one_or_none()
+        if expires_at is not None:
+            revoked_tokens.add(jti, expires_at)
+            return family_id
+
+    # Revoked already (or never issued): treat as reuse of a leaked token
+    await revoke_family(db, family_id)
+    await db.commit()
+    raise ValueError(REUSED_TOKEN)
+
+
+async def revoke_family(db: AsyncSession, family_id: uuid.UUID) -> None:
+    """Revoke every token from one login (logout, or reuse detected). The caller commits."""
+    result = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id)
+        .values(revoked=True)
+        .returning(RefreshToken.jti, RefreshToken.expires_at)
+    )
+    for jti, expires_at in result.all():
+        revoked_tokens.add(jti, expires_at)
+
+
+async def reload_revoked(db: AsyncSession) -> None:
+    """Reload the revoked set from the table (revocations by other processes)."""
+    result = await db.execute(
+        select(RefreshToken.jti, RefreshToken.expires_at).where(
+            RefreshToken.revoked.is_(True),
+            RefreshToken.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    revoked_tokens.replace(dict(result.all()))
+
+
+async def prune_expired(db: AsyncSession) -> int:
+    """Delete expired tokens and return how many were removed. The caller commits."""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+    revoked_tokens.prune(now)
+    return result.rowcount
+
+
+async def run_maintenance(session_factory, interval: float) -> None:
+    """Prune expired tokens and reload the revoked set every `interval` seconds."""
+    while True:
+        try:
+            async with session_factory() as db:
+                await prune_expired(db)
+                await db.commit()
+                await reload_revoked(db)
+        except Exception:
+            # Keep the loop alive through a database outage
+            logger.exception("Refresh token maintenance failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,54 @@
+"""
+Cache of active users for token authentication.
+
+The JWT already proves who the caller is; the cache saves the SELECT that
+get_current_user would otherwise run on every authenticated request. Entries
+are detached snapshots. On a hit the snapshot is merged into the request's
+session without loading, so the returned user can still be modified and
+committed as usual.
+
+Entries expire after USER_CACHE_TTL_SECONDS and are dropped right away when a
+user is updated or deactivated through user_service.
+"""
+
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.models.user import User
+
+user_cache = TTLCache(
+    ttl=settings.USER_CACHE_TTL_SECONDS, max_entries=settings.USER_CACHE_MAX_ENTRIES
+)
+metrics.watch_cache("users", user_cache)
+
+
+def _snapshot(user: User) -> User:
+    """Detached copy of a user's column values, safe to share between sessions."""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+async def get_active_user(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+    """Return the active user with this ID, attached to db, or None."""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None or not user.is_active:
+        return None
+    user_cache.set(user_id, _snapshot(user))
+    return user
+
+
+def invalidate(user_id: uuid.UUID) -> None:
+    """Drop a user's cached entry after their row changes."""
+    user_cache.delete(user_id)
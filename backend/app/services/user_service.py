@@ -1,11 +1,16 @@
 import uuid
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import search
+from app.core.counting import count_total
+from app.core.pagination import paginate_keyset
 from app.models.dog import Dog
 from app.models.user import User
 from app.schemas.user import UserListResponse, UserUpdate
+from app.services import user_cache
+from app.services.breed_catalog import breed_catalog
 
 
 async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> User:
@@ -33,10 +38,21 @@ async def update_user(db: AsyncSession, user: User, data: UserUpdate) -> User:
         setattr(user, field, value)
 
     await db.commit()
+    user_cache.invalidate(user.id)
     await db.refresh(user)
     return user
 
 
+async def deactivate_user(db: AsyncSession, user: User) -> None:
+    """Deactivate a user's account (sets is_active=False).
+
+    Their tokens stop working immediately — the cached entry is dropped too.
+    """
+    user.is_active = False
+    await db.commit()
+    user_cache.invalidate(user.id)
+
+
 async def list_users(
     db: AsyncSession,
     q: str | None = None,
@@ -45,21 +61,32 @@ async def list_users(
     voivodeship: str | None = None,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
+    include_total: bool = True,
+    fuzzy: bool = False,
 ) -> UserListResponse:
-    """Return paginated list of active users with optional filters."""
-    query = (
-        select(User)
-        .where(User.is_active == True)  # noqa: E712
-        .order_by(User.last_name.asc(), User.first_name.asc())
-    )
+    """Return paginated list of active users with optional filters.
 
-    if q is not None:
-        term = f"%{q}%"
-        query = query.where(
-            User.first_name.ilike(term)
-            | User.last_name.ilike(term)
-            | User.kennel_name.ilike(term)
-        )
+    A cursor (empty to start) switches from page numbers to keyset pagination;
+    include_total=False skips counting. The q search ignores case and Polish
+    diacritics; fuzzy=True also tolerates typos and orders by similarity.
+
+    Raises:
+        ValueError: If the cursor is invalid or combined with fuzzy search.
+    """
+    ranked = fuzzy and q is not None
+    if ranked and cursor is not None:
+        raise ValueError(search.FUZZY_CURSOR_ERROR)
+
+    query = select(User).where(User.is_active == True)  # noqa: E712
+    keys = [User.last_name, User.first_name, User.id]
+
+    search_columns = [User.first_name, User.last_name, User.kennel_name]
+    if ranked:
+        match, rank = search.fuzzy_match(search_columns, q)
+        query = query.where(match)
+    elif q is not None:
+        query = query.where(search.contains(search_columns, q))
     if is_breeder is not None:
         query = query.where(User.is_breeder == is_breeder)
     if city is not None:
@@ -67,25 +94,60 @@ async def list_users(
     if voivodeship is not None:
         query = query.where(User.voivodeship == voivodeship)
 
-    count_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = count_result.scalar_one()
+    filters = {
+        "q": q,
+        "is_breeder": is_breeder,
+        "city": city,
+        "voivodeship": voivodeship,
+        "fuzzy": fuzzy,
+    }
+    count = await count_total(db, query, "users", filters, include_total)
+
+    if cursor is not None:
+        keyset = await paginate_keyset(db, query, keys, "users", cursor, limit)
+        return UserListResponse(
+            items=keyset.items,
+            total=count.total,
+            total_kind=count.kind,
+            limit=limit,
+            next_cursor=keyset.next_cursor,
+            prev_cursor=keyset.prev_cursor,
+        )
 
+    if ranked:
+        query = query.order_by(rank.desc())
     offset = (page - 1) * limit
-    result = await db.execute(query.offset(offset).limit(limit))
+    result = await db.execute(query.order_by(*keys).offset(offset).limit(limit))
     users = list(result.scalars().all())
 
     return UserListResponse(
         items=users,
-        total=total,
+        total=count.total,
+        total_kind=count.kind,
         page=page,
         limit=limit,
-        pages=max(1, -(-total // limit)),
+        pages=None if count.total is None else max(1, -(-count.total // limit)),
     )
 
 
 async def get_user_dogs(db: AsyncSession, user_id: uuid.UUID) -> list[Dog]:
-    """Return all active dogs owned by a user."""
+    """Return all active dogs owned by a user, with breeds attached from the catalog.
+
+    The user check and the dogs come from one query: the user row is outer
+    joined to their dogs, so a user without dogs still yields one row.
+
+    Raises:
+        ValueError: If user does not exist or is inactive.
+    """
     result = await db.execute(
-        select(Dog).where(Dog.owner_id == user_id, Dog.is_active == True)  # noqa: E712
+        select(User.id, Dog)
+        .outerjoin(Dog, and_(Dog.owner_id == User.id, Dog.is_active == True))  # noqa: E712
+        .where(User.id == user_id, User.is_active == True)  # noqa: E712
     )
-    return list(result.scalars().all())
+    rows = result.all()
+    if not rows:
+        raise ValueError("Użytkownik nie istnieje")
+
+    dogs = [dog for _, dog in rows if dog is not None]
+    await breed_catalog.attach(db, dogs)
+    return dogs
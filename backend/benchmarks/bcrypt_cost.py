@@ -0,0 +1,61 @@
+"""
+Benchmark: bcrypt throughput per cost factor on this host.
+
+For each cost, reports the time per hash on one thread and the hashes per
+second of the whole password worker pool (PASSWORD_HASH_WORKERS threads).
+Pick the highest BCRYPT_ROUNDS whose time per hash fits the login latency
+target and whose pool throughput covers peak logins per second.
+
+Run from backend/: python -m benchmarks.bcrypt_cost [max_cost]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app.config import settings
+
+PASSWORD = b"correct horse battery staple"
+MIN_COST = 4
+# Stop sampling a cost after this much time
+BUDGET_SECONDS = 2.0
+
+
+def hash_rate(cost: int) -> tuple[float, float]:
+    """Return (ms per hash on one thread, pool hashes per second)."""
+    salt = bcrypt.gensalt(rounds=cost)
+    start = time.perf_counter()
+    count = 0
+    while count < 3 or time.perf_counter() - start < BUDGET_SECONDS / 2:
+        bcrypt.hashpw(PASSWORD, salt)
+        count += 1
+        if time.perf_counter() - start > BUDGET_SECONDS:
+            break
+    single_ms = (time.perf_counter() - start) * 1000 / count
+
+    workers = settings.PASSWORD_HASH_WORKERS
+    jobs = max(workers, count)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        list(pool.map(lambda _: bcrypt.hashpw(PASSWORD, salt), range(jobs)))
+        pool_rate = jobs / (time.perf_counter() - start)
+    return single_ms, pool_rate
+
+
+def main() -> None:
+    max_cost = int(sys.argv[1]) if len(sys.argv) > 1 else 14
+    print(
+        f"configured BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}, "
+        f"PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}"
+    )
+    print("cost  ms/hash  hashes/s (pool)")
+    for cost in range(MIN_COST, max_cost + 1):
+        single_ms, pool_rate = hash_rate(cost)
+        marker = "  <- configured" if cost == settings.BCRYPT_ROUNDS else ""
+        print(f"{cost:>4}  {single_ms:>7.1f}  {pool_rate:>15.1f}{marker}")
+
+
+if __name__ == "__main__":
+    main()
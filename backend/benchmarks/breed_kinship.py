@@ -0,0 +1,80 @@
+"""
+Benchmark: whole-breed kinship statistics with the blocked NumPy engine.
+
+Generates an in-memory breed with litter structure (each dam whelps a few
+litters of several puppies) and reports time and peak memory for mean COI
+and mean kinship at several block sizes.
+
+Run from backend/: python -m benchmarks.breed_kinship
+"""
+
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.core.genetics import Pedigree
+from app.core.kinship import KinshipEngine
+
+GENERATIONS = 15
+DOGS_PER_GENERATION = 2000
+LITTER_SIZE = 6
+LITTERS_PER_DAM = 2
+SIRES_PER_GENERATION = 60
+
+
+def synthetic_breed(seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    parents: dict[int, tuple[int | None, int | None]] = {}
+    males: list[int] = []
+    females: list[int] = []
+    next_id = 0
+
+    for _ in range(GENERATIONS):
+        new_males, new_females = [], []
+        # A few popular sires and a limited number of breeding dams per generation
+        sires = rng.sample(males, min(SIRES_PER_GENERATION, len(males))) if males else []
+        dam_count = DOGS_PER_GENERATION // (LITTER_SIZE * LITTERS_PER_DAM)
+        dams = rng.sample(females, min(dam_count, len(females))) if females else []
+
+        while len(new_males) + len(new_females) < DOGS_PER_GENERATION:
+            sire = rng.choice(sires) if sires else None
+            dam = rng.choice(dams) if dams else None
+            for _ in range(LITTER_SIZE):
+                parents[next_id] = (sire, dam)
+                (new_males if rng.random() < 0.5 else new_females).append(next_id)
+                next_id += 1
+
+        males, females = new_males, new_females
+
+    return parents
+
+
+def main() -> None:
+    parents = synthetic_breed()
+    pedigree = Pedigree.from_parents(parents)
+    members = np.arange(len(pedigree) - DOGS_PER_GENERATION * 3, len(pedigree))
+    print(f"breed: {len(pedigree)} dogs, {GENERATIONS} generations")
+
+    for block_size in (64, 256, 1024):
+        tracemalloc.start()
+        start = time.perf_counter()
+        engine = KinshipEngine(pedigree, block_size=block_size)
+        mean_coi = float(engine.inbreeding[members].mean())
+        coi_done = time.perf_counter()
+        mean_kinship = engine.mean_kinship(members)
+        done = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"  block={block_size:>5}: COI {coi_done - start:6.2f}s  "
+            f"kinship {(done - coi_done) * 1000:6.1f}ms  "
+            f"peak {peak / 2**20:7.1f} MiB  "
+            f"(mean COI {mean_coi:.4f}, mean kinship {mean_kinship:.4f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
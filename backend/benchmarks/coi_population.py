@@ -0,0 +1,102 @@
+"""
+Benchmark: Wright's COI on a synthetic 100k-dog population.
+
+Part 1 computes COI for a sample of dogs from an in-memory population,
+truncating each pedigree to N generations exactly like the endpoint does.
+Part 2 times the per-dog service call (one ancestor query + calculation)
+against the database at 8 and 10 generations.
+
+Run from backend/: python -m benchmarks.coi_population [--memory-only]
+"""
+
+import asyncio
+import random
+import sys
+
+from app.core.genetics import InbreedingCalculator, Pedigree
+from app.services import coi_service
+from benchmarks.common import Timer, count_statements, rollback_session, seed_population
+
+GENERATIONS = 25
+PER_GENERATION = 4000
+SAMPLES = 50
+
+
+def synthetic_parents(generations: int, per_generation: int, seed: int = 42) -> dict:
+    """Random-mating population with a closed gene pool (no DB involved)."""
+    rng = random.Random(seed)
+    parents: dict[int, tuple[int | None, int | None]] = {}
+    males: list[int] = []
+    females: list[int] = []
+    next_id = 0
+    for _ in range(generations):
+        new_males, new_females = [], []
+        for i in range(per_generation):
+            parents[next_id] = (
+                rng.choice(males) if males else None,
+                rng.choice(females) if females else None,
+            )
+            (new_males if i % 2 == 0 else new_females).append(next_id)
+            next_id += 1
+        males, females = new_males, new_females
+    return parents
+
+
+def truncated_parents(parents: dict, root: int, generations: int) -> dict:
+    """Ancestors of root within N generations (root included)."""
+    selected = {root: parents[root]}
+    frontier = [root]
+    for _ in range(generations):
+        next_frontier = []
+        for key in frontier:
+            for parent in parents[key]:
+                if parent is not None and parent not in selected:
+                    selected[parent] = parents[parent]
+                    next_frontier.append(parent)
+        frontier = next_frontier
+    return selected
+
+
+def bench_memory() -> None:
+    parents = synthetic_parents(GENERATIONS, PER_GENERATION)
+    roots = list(parents)[-SAMPLES:]
+    print(f"population: {len(parents)} dogs, {GENERATIONS} generations")
+
+    for generations in (8, 10):
+        timer = Timer()
+        ancestors = 0
+        for root in roots:
+            with timer.measure():
+                subset = truncated_parents(parents, root, generations)
+                InbreedingCalculator(Pedigree.from_parents(subset)).inbreeding(root)
+            ancestors += len(subset) - 1
+        print(
+            f"  in-memory COI, {generations} generations: "
+            f"{ancestors / len(roots):.0f} ancestors/dog  {timer.summary()}"
+        )
+
+
+async def bench_database() -> None:
+    async with rollback_session() as db:
+        population = await seed_population(
+            db, generations=GENERATIONS, per_generation=PER_GENERATION
+        )
+        await db.flush()
+        roots = population.newest[:SAMPLES]
+
+        for generations in (8, 10):
+            timer = Timer()
+            with count_statements() as counter:
+                for root in roots:
+                    with timer.measure():
+                        await coi_service.get_coi(db, root, generations)
+            print(
+                f"  GET /coi?generations={generations}: "
+                f"{counter.count / len(roots):.1f} queries/request  {timer.summary()}"
+            )
+
+
+if __name__ == "__main__":
+    bench_memory()
+    if "--memory-only" not in sys.argv:
+        asyncio.run(bench_database())
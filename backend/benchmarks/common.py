@@ -0,0 +1,163 @@
+"""
+Shared helpers for benchmark scripts.
+
+Benchmarks run against the database from settings.DATABASE_URL inside a
+transaction that is always rolled back, so they never leave data behind.
+"""
+
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.db.session import engine
+from app.models.breed import Breed
+from app.models.dog import Dog, DogSex
+from app.models.user import User
+
+
+@dataclass
+class StatementCounter:
+    count: int = 0
+
+
+@contextmanager
+def count_statements(target: AsyncEngine = engine) -> Iterator[StatementCounter]:
+    """Count SQL statements sent to the database while the block runs."""
+    counter = StatementCounter()
+
+    def _before_cursor_execute(*args, **kwargs):
+        counter.count += 1
+
+    event.listen(target.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(target.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@asynccontextmanager
+async def rollback_session() -> AsyncIterator[AsyncSession]:
+    """Yield a session whose work is rolled back when the block exits."""
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+@dataclass
+class Population:
+    owner_id: uuid.UUID
+    breed_id: int
+    # Dog IDs grouped by generation, founders first
+    generations: list[list[uuid.UUID]] = field(default_factory=list)
+
+    @property
+    def newest(self) -> list[uuid.UUID]:
+        return self.generations[-1]
+
+
+async def seed_population(
+    db: AsyncSession,
+    generations: int,
+    per_generation: int,
+    seed: int = 42,
+    batch_size: int = 5000,
+) -> Population:
+    """Insert a synthetic multi-generation population of one breed.
+
+    Each dog past the founders gets a random sire and dam from the previous
+    generation, which produces realistic amounts of pedigree overlap.
+    """
+    rng = random.Random(seed)
+
+    breed_id = (await db.execute(select(Breed.id).limit(1))).scalar_one_or_none()
+    if breed_id is None:
+        breed_id = (
+            await db.execute(
+                insert(Breed).values(name_pl="Benchmark").returning(Breed.id)
+            )
+        ).scalar_one()
+
+    owner_id = uuid.uuid4()
+    await db.execute(
+        insert(User).values(
+            id=owner_id,
+            email=f"bench-{owner_id}@example.com",
+            hashed_password="x",
+            first_name="Bench",
+            last_name="Mark",
+            is_breeder=True,
+            is_active=True,
+        )
+    )
+
+    population = Population(owner_id=owner_id, breed_id=breed_id)
+    born = date(2000, 1, 1)
+    males: list[uuid.UUID] = []
+    females: list[uuid.UUID] = []
+
+    for generation in range(generations):
+        rows = []
+        new_males: list[uuid.UUID] = []
+        new_females: list[uuid.UUID] = []
+        for i in range(per_generation):
+            dog_id = uuid.uuid4()
+            sex = DogSex.male if i % 2 == 0 else DogSex.female
+            (new_males if sex == DogSex.male else new_females).append(dog_id)
+            rows.append(
+                {
+                    "id": dog_id,
+                    "owner_id": owner_id,
+                    "breed_id": breed_id,
+                    "name": f"G{generation}-{i}",
+                    "sex": sex,
+                    "date_of_birth": born + timedelta(days=365 * 2 * generation),
+                    "sire_id": rng.choice(males) if males else None,
+                    "dam_id": rng.choice(females) if females else None,
+                    "is_active": True,
+                }
+            )
+        for start in range(0, len(rows), batch_size):
+            await db.execute(insert(Dog), rows[start:start + batch_size])
+
+        population.generations.append([row["id"] for row in rows])
+        males, females = new_males, new_females
+
+    return population
+
+
+class Timer:
+    """Collect wall-clock samples and report simple percentiles (ms)."""
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.samples.append((time.perf_counter() - start) * 1000)
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> str:
+        return (
+            f"p50={self.percentile(50):.2f}ms "
+            f"p95={self.percentile(95):.2f}ms "
+            f"n={len(self.samples)}"
+        )
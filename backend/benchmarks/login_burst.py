@@ -0,0 +1,66 @@
+"""
+Benchmark: event-loop latency of cheap requests during a burst of logins.
+
+A burst of bcrypt verifications runs next to a stream of "read requests"
+(coroutines that only need the event loop for a moment). With inline
+hashing each verification blocks the loop; with the password worker pool
+the reads keep their latency. No database is needed.
+
+Run from backend/: python -m benchmarks.login_burst
+"""
+
+import asyncio
+import time
+
+import bcrypt
+
+from app.core.security import password_executor, verify_password, verify_password_async
+from benchmarks.common import Timer
+
+LOGINS = 32
+PASSWORD = "correct horse battery staple"
+
+
+async def reads(stop: asyncio.Event, timer: Timer) -> None:
+    """Stand-in for a read endpoint: wake up every 5 ms and record the delay."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        timer.samples.append((time.perf_counter() - start) * 1000 - 5)
+
+
+async def burst(hashed: str, offloaded: bool) -> Timer:
+    async def login() -> None:
+        if offloaded:
+            await verify_password_async(PASSWORD, hashed)
+        else:
+            verify_password(PASSWORD, hashed)
+
+    timer = Timer()
+    stop = asyncio.Event()
+    reader = asyncio.create_task(reads(stop, timer))
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    stop.set()
+    await reader
+    return timer
+
+
+async def main() -> None:
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt()).decode()
+    print(f"{LOGINS} concurrent logins, {password_executor.max_workers} password workers")
+
+    for offloaded in (False, True):
+        start = time.perf_counter()
+        timer = await burst(hashed, offloaded)
+        elapsed = time.perf_counter() - start
+        label = "worker pool" if offloaded else "inline     "
+        print(f"{label}: read delay {timer.summary()}, burst took {elapsed:.2f}s")
+
+    stats = password_executor.stats()
+    print(f"max queue depth: {stats.max_queued}")
+    password_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Benchmark: pedigree loading — per-ancestor recursion vs single recursive CTE.
+
+Run from backend/: python -m benchmarks.pedigree_queries
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.dog import Dog
+from app.services import dog_service
+from benchmarks.common import Timer, count_statements, rollback_session, seed_population
+
+GENERATIONS = 5
+SAMPLES = 50
+
+
+async def get_pedigree_recursive(
+    db: AsyncSession, dog_id: uuid.UUID, generations: int = 3
+) -> Dog | None:
+    """Previous implementation — one SELECT per ancestor, kept as baseline."""
+    if generations <= 0:
+        return None
+
+    result = await db.execute(
+        select(Dog)
+        .options(joinedload(Dog.breed))
+        .where(Dog.id == dog_id)
+        .execution_options(populate_existing=True)
+    )
+    dog = result.scalar_one_or_none()
+    if dog is None:
+        return None
+
+    if dog.sire_id:
+        await get_pedigree_recursive(db, dog.sire_id, generations - 1)
+    if dog.dam_id:
+        await get_pedigree_recursive(db, dog.dam_id, generations - 1)
+
+    return dog
+
+
+async def main() -> None:
+    async with rollback_session() as db:
+        population = await seed_population(db, generations=8, per_generation=200)
+        await db.flush()
+        roots = population.newest[:SAMPLES]
+
+        for label, loader in (
+            ("recursive", get_pedigree_recursive),
+            ("cte", dog_service.get_pedigree),
+        ):
+            timer = Timer()
+            with count_statements() as counter:
+                for root in roots:
+                    with timer.measure():
+                        await loader(db, root, GENERATIONS)
+                    db.expunge_all()
+            print(
+                f"{label:>10}: {counter.count / len(roots):5.1f} queries/request  "
+                f"{timer.summary()}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
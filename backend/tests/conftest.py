@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.sql_metrics import count_queries
+from app.services.breed_catalog import breed_catalog as catalog
+
+BEAGLE = {
+    "id": 7, "name_pl": "Beagle", "name_en": "Beagle", "fci_number": None,
+    "fci_group": 6, "fci_section": None, "size_category": None,
+    "description_pl": None, "image_url": None,
+}
+
+
+class BreedSession:
+    """Returns one breed row for the catalog query."""
+
+    def __init__(self, row: dict):
+        self.row = row
+
+    async def execute(self, query):
+        return SimpleNamespace(mappings=lambda: iter([self.row]))
+
+
+@pytest.fixture
+def query_counter():
+    """Counts the SQL statements the test runs (see app.core.sql_metrics)."""
+    with count_queries() as counter:
+        yield counter
+
+
+@pytest.fixture
+async def breed_catalog(request):
+    """The breed catalog loaded with one breed: BEAGLE, or the row given by indirect parametrize."""
+    await catalog.load(BreedSession(getattr(request, "param", BEAGLE)))
+    yield catalog
+    catalog.invalidate()
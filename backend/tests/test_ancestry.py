@@ -0,0 +1,188 @@
+import os
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.breed import Breed
+from app.models.dog import Dog, DogSex
+from app.models.dog_ancestry import DogAncestry
+from app.models.user import User
+from app.services import ancestry_service, dog_service
+from app.services.breed_catalog import breed_catalog
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"),
+    reason="needs TEST_DATABASE_URL (a local PostgreSQL database at alembic head)",
+)
+
+
+@pytest.fixture
+async def db():
+    """Session in a transaction that is rolled back after the test.
+
+    The breed catalog is invalidated too, as it may have loaded rolled-back breeds.
+    """
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+                    yield session
+            finally:
+                await transaction.rollback()
+    finally:
+        breed_catalog.invalidate()
+        await engine.dispose()
+
+
+class Kennel:
+    """Inserts dogs of one owner and keeps their closure rows up to date."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.ids: list[uuid.UUID] = []
+
+    async def setup(self) -> "Kennel":
+        suffix = uuid.uuid4().hex
+        self.owner_id = uuid.uuid4()
+        await self.db.execute(
+            insert(User).values(
+                id=self.owner_id, email=f"{suffix}@example.com", hashed_password="x",
+                first_name="Jan", last_name="Kowalski",
+            )
+        )
+        self.breed_id = (
+            await self.db.execute(
+                insert(Breed).values(name_pl=f"Rasa {suffix}").returning(Breed.id)
+            )
+        ).scalar_one()
+        return self
+
+    async def dog(self, sire=None, dam=None) -> uuid.UUID:
+        dog_id = uuid.uuid4()
+        await self.db.execute(
+            insert(Dog).values(
+                id=dog_id, owner_id=self.owner_id, breed_id=self.breed_id,
+                name=f"Pies {len(self.ids)}", sex=DogSex.male, date_of_birth=date(2020, 1, 1),
+                sire_id=sire, dam_id=dam,
+            )
+        )
+        await ancestry_service.add_self_row(self.db, dog_id)
+        for parent in (sire, dam):
+            if parent is not None:
+                await ancestry_service.add_parent_link(self.db, dog_id, parent)
+        self.ids.append(dog_id)
+        return dog_id
+
+    async def set_parents(self, dog_id, sire, dam) -> None:
+        """Change a dog's parents in dogs and in the closure table, as the dog service does."""
+        old = (
+            await self.db.execute(select(Dog.sire_id, Dog.dam_id).where(Dog.id == dog_id))
+        ).one()
+        await self.db.execute(update(Dog).where(Dog.id == dog_id).values(sire_id=sire, dam_id=dam))
+        await ancestry_service.sync_parents(self.db, dog_id, tuple(old), (sire, dam))
+
+    async def closure(self) -> set[tuple]:
+        result = await self.db.execute(
+            select(
+                DogAncestry.ancestor_id,
+                DogAncestry.descendant_id,
+                DogAncestry.depth,
+                DogAncestry.path_count,
+            ).where(DogAncestry.descendant_id.in_(self.ids))
+        )
+        return {tuple(row) for row in result}
+
+
+async def path_count(db, ancestor_id, descendant_id, depth) -> int | None:
+    return (
+        await db.execute(
+            select(DogAncestry.path_count).where(
+                DogAncestry.ancestor_id == ancestor_id,
+                DogAncestry.descendant_id == descendant_id,
+                DogAncestry.depth == depth,
+            )
+        )
+    ).scalar_one_or_none()
+
+
+async def test_diamond_link_removal_lowers_path_count_before_deleting(db):
+    """A grandparent reached through both parents keeps its row until the second link goes."""
+    kennel = await Kennel(db).setup()
+    grandsire = await kennel.dog()
+    sire = await kennel.dog(sire=grandsire)
+    dam = await kennel.dog(sire=grandsire)
+    puppy = await kennel.dog(sire=sire, dam=dam)
+    assert await path_count(db, grandsire, puppy, 2) == 2
+
+    await ancestry_service.remove_parent_link(db, puppy, sire)
+    assert await path_count(db, grandsire, puppy, 2) == 1
+    assert await path_count(db, sire, puppy, 1) is None
+
+    await ancestry_service.remove_parent_link(db, puppy, dam)
+    assert await path_count(db, grandsire, puppy, 2) is None
+    assert await ancestry_service.get_ancestor_ids(db, puppy) == {}
+    assert await path_count(db, puppy, puppy, 0) == 1
+
+
+async def test_sync_parents_relinks_the_whole_subtree(db):
+    """Replacing a sire moves the dog and its offspring under the new sire's line."""
+    kennel = await Kennel(db).setup()
+    old_grandsire = await kennel.dog()
+    old_sire = await kennel.dog(sire=old_grandsire)
+    new_grandsire = await kennel.dog()
+    new_sire = await kennel.dog(sire=new_grandsire)
+    dam = await kennel.dog()
+    dog = await kennel.dog(sire=old_sire, dam=dam)
+    puppy = await kennel.dog(sire=dog)
+
+    await kennel.set_parents(dog, new_sire, dam)
+
+    assert await ancestry_service.get_ancestor_ids(db, dog) == {
+        new_sire: 1, dam: 1, new_grandsire: 2,
+    }
+    assert await ancestry_service.get_ancestor_ids(db, puppy) == {
+        dog: 1, new_sire: 2, dam: 2, new_grandsire: 3,
+    }
+    assert await ancestry_service.get_descendant_ids(db, old_grandsire) == {old_sire: 1}
+    assert not await ancestry_service.is_ancestor(db, old_sire, puppy)
+
+
+async def test_incremental_maintenance_matches_rebuild(db):
+    """Inserts, relinks and removals leave the same closure rows rebuild() derives from dogs."""
+    kennel = await Kennel(db).setup()
+    founder = await kennel.dog()
+    a = await kennel.dog(sire=founder)
+    b = await kennel.dog(sire=founder)
+    c = await kennel.dog(sire=a, dam=b)
+    d = await kennel.dog(sire=a, dam=c)
+    outsider = await kennel.dog()
+    e = await kennel.dog(sire=d, dam=b)
+    await kennel.dog(sire=e, dam=c)
+    await kennel.set_parents(c, outsider, b)
+    await kennel.set_parents(d, None, c)
+    await kennel.set_parents(e, d, a)
+
+    incremental = await kennel.closure()
+    await ancestry_service.rebuild(db)
+
+    assert incremental == await kennel.closure()
+
+
+async def test_descendants_are_listed_once_at_their_nearest_generation(db):
+    """A dog that is both a child and a grandchild is listed once, as a child."""
+    kennel = await Kennel(db).setup()
+    root = await kennel.dog()
+    child = await kennel.dog(sire=root)
+    both = await kennel.dog(sire=root, dam=child)
+    grandchild = await kennel.dog(sire=both)
+
+    page = await dog_service.list_descendants(db, root, generations=3)
+
+    expected = sorted([(child, 1), (both, 1), (grandchild, 2)], key=lambda x: (x[1], x[0]))
+    assert [(item.id, item.generation) for item in page.items] == expected
+    assert page.generation_counts == {1: 2, 2: 1}
@@ -0,0 +1,110 @@
+import uuid
+from types import SimpleNamespace
+
+import bcrypt
+import pytest
+
+from app.config import settings
+from app.core import security
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.schemas.auth import RegisterRequest
+from app.services import auth_service
+
+
+class FakeSession:
+    """Returns the given user for the login query and records added rows."""
+
+    def __init__(self, user):
+        self.user = user
+        self.added = []
+        self.calls = []
+
+    async def execute(self, query):
+        user = self.user
+        return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def flush(self):
+        self.calls.append("flush")
+
+    async def commit(self):
+        self.calls.append("commit")
+
+
+def make_user(rounds):
+    hashed = bcrypt.hashpw(b"haslo123", bcrypt.gensalt(rounds=rounds)).decode()
+    return User(
+        id=uuid.uuid4(),
+        email="jan@example.com",
+        hashed_password=hashed,
+        first_name="Jan",
+        last_name="Kowalski",
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def rounds(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    return 5
+
+
+def test_hash_password_uses_configured_cost(rounds):
+    """New hashes should carry BCRYPT_ROUNDS and not need a rehash."""
+    hashed = security.hash_password("haslo123")
+
+    assert security.password_cost(hashed) == rounds
+    assert not security.needs_rehash(hashed)
+
+
+async def test_login_schedules_rehash_for_outdated_cost(rounds):
+    """A hash with a different cost should be rehashed after a successful login."""
+    user = make_user(rounds=4)
+    scheduled = []
+
+    tokens = await auth_service.login(
+        FakeSession(user), user.email, "haslo123", schedule=lambda *args: scheduled.append(args)
+    )
+
+    assert tokens.access_token
+    assert scheduled == [(auth_service.rehash_password, user.id, "haslo123", user.hashed_password)]
+
+
+async def test_login_leaves_current_hash_alone(rounds):
+    """A hash with the configured cost should not be touched."""
+    user = make_user(rounds=rounds)
+    scheduled = []
+
+    await auth_service.login(
+        FakeSession(user), user.email, "haslo123", schedule=lambda *args: scheduled.append(args)
+    )
+
+    assert scheduled == []
+
+
+async def test_wrong_password_never_rehashes(rounds):
+    """Failed logins should not schedule anything."""
+    user = make_user(rounds=4)
+    scheduled = []
+
+    with pytest.raises(ValueError):
+        await auth_service.login(
+            FakeSession(user), user.email, "zle-haslo", schedule=lambda *a: scheduled.append(a)
+        )
+    assert scheduled == []
+
+
+async def test_register_commits_user_and_refresh_token_together(rounds):
+    """The user is only flushed, so the account and its first token commit at once."""
+    db = FakeSession(None)
+    data = RegisterRequest(
+        email="jan@example.com", password="haslo123", first_name="Jan", last_name="Kowalski"
+    )
+
+    await auth_service.register(db, data)
+
+    assert [type(row) for row in db.added] == [User, RefreshToken]
+    assert db.calls == ["flush", "commit"]
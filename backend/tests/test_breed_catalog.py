@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.breed import SizeCategory
+from app.services import breed_service
+from app.services.breed_catalog import breed_catalog
+
+
+class FakeSession:
+    """Serves the breed rows for the catalog query and counts queries."""
+
+    def __init__(self, *rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        rows = self.rows
+        return SimpleNamespace(mappings=lambda: iter(rows))
+
+
+def breed(breed_id, name_pl, name_en=None, fci_group=None, size_category=None):
+    return {
+        "id": breed_id,
+        "name_pl": name_pl,
+        "name_en": name_en,
+        "fci_number": None,
+        "fci_group": fci_group,
+        "fci_section": None,
+        "size_category": size_category,
+        "description_pl": None,
+        "image_url": None,
+    }
+
+
+@pytest.fixture
+def db():
+    breed_catalog.invalidate()
+    yield FakeSession(
+        breed(1, "Owczarek Niemiecki", "German Shepherd Dog", 1, SizeCategory.large),
+        breed(2, "Łajka Zachodniosyberyjska", "West Siberian Laika", 5, SizeCategory.medium),
+        breed(3, "Labrador Retriever", "Labrador Retriever", 8, SizeCategory.large),
+        breed(4, "Owczarek Podhalański", "Tatra Shepherd Dog", 1, SizeCategory.large),
+    )
+    breed_catalog.invalidate()
+
+
+async def test_breed_endpoints_hit_the_database_once(db):
+    """Listing, lookups and FCI groups should all be served from one catalog load."""
+    response = await breed_service.list_breeds(db, fci_group=1)
+    groups = await breed_service.list_fci_groups(db)
+    found = await breed_service.get_breed_by_id(db, 3)
+
+    assert [b.id for b in response.items] == [1, 4]
+    assert (response.total, response.total_kind) == (2, "exact")
+    assert [(g.fci_group, g.breed_count) for g in groups] == [(1, 2), (5, 1), (8, 1)]
+    assert found.name_pl == "Labrador Retriever"
+    assert db.queries == 1
+
+
+async def test_search_ignores_diacritics_and_orders_by_folded_name(db):
+    """Searching "lajka" should find "Łajka", and Ł should sort next to L."""
+    response = await breed_service.list_breeds(db, q="lajka")
+    everything = await breed_service.list_breeds(db)
+
+    assert [b.id for b in response.items] == [2]
+    assert [b.id for b in everything.items] == [3, 2, 1, 4]
+
+
+async def test_fuzzy_search_tolerates_typos(db):
+    """A misspelled name should still find the breed."""
+    response = await breed_service.list_breeds(db, q="owczrek podhalanski", fuzzy=True)
+    assert response.items[0].id == 4
+
+
+async def test_cursor_pages_walk_forward_and_back(db):
+    """next/prev cursors should page through the in-memory list."""
+    large = {"size_category": SizeCategory.large, "limit": 2}
+    first = await breed_service.list_breeds(db, cursor="", **large)
+    second = await breed_service.list_breeds(db, cursor=first.next_cursor, **large)
+    back = await breed_service.list_breeds(db, cursor=second.prev_cursor, **large)
+
+    assert [b.id for b in first.items] == [3, 1]
+    assert [b.id for b in second.items] == [4]
+    assert second.next_cursor is None
+    assert [b.id for b in back.items] == [3, 1]
+    assert back.prev_cursor is None
+
+
+class VersionedSession:
+    """Serves breed rows with the catalog version, and the version on its own."""
+
+    def __init__(self, version, *rows):
+        self.version = version
+        self.rows = rows
+        self.loads = 0
+
+    async def execute(self, query):
+        if "breeds.name_pl" not in str(query):
+            return SimpleNamespace(scalar=lambda: self.version)
+        self.loads += 1
+        rows = [{**row, "catalog_version": self.version} for row in self.rows]
+        return SimpleNamespace(mappings=lambda: iter(rows))
+
+
+async def test_catalog_reloads_when_the_breeds_version_changes(monkeypatch):
+    """Breeds changed by another process (e.g. the seed script) show up at the next check."""
+    monkeypatch.setattr(breed_catalog, "check_interval", 0)
+    breed_catalog.invalidate()
+    db = VersionedSession(1, breed(1, "Owczarek Niemiecki"))
+
+    await breed_catalog.ensure_loaded(db)
+    await breed_catalog.ensure_loaded(db)
+    assert (db.loads, breed_catalog.version) == (1, 1)
+
+    db.version, db.rows = 2, (breed(1, "Owczarek Niemiecki"), breed(2, "Beagle"))
+    await breed_catalog.ensure_loaded(db)
+    assert (db.loads, breed_catalog.version) == (2, 2)
+    assert breed_catalog.get(2).name_pl == "Beagle"
+    breed_catalog.invalidate()
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.counting import cache_key, count_cache, count_total
+from app.models.breed import Breed, SizeCategory
+
+
+class FakeSession:
+    """Answers EXPLAIN with a fixed row estimate and COUNT with a fixed total."""
+
+    def __init__(self, estimate, total):
+        self.estimate = estimate
+        self.total = total
+        self.statements = []
+
+    async def execute(self, query):
+        sql = str(query.compile())
+        self.statements.append(sql)
+        if sql.startswith("EXPLAIN"):
+            value = f'[{{"Plan": {{"Plan Rows": {self.estimate}}}}}]'
+        else:
+            value = self.total
+        return SimpleNamespace(scalar_one=lambda: value)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    count_cache.clear()
+    yield
+    count_cache.clear()
+
+
+def test_cache_key_ignores_unset_filters_and_order():
+    """Equivalent filter sets should share one cache entry."""
+    filters = {"q": None, "size_category": SizeCategory.small, "fci_group": 1}
+    assert cache_key("breeds", filters) == cache_key(
+        "breeds", {"fci_group": 1, "size_category": "small"}
+    )
+
+
+async def test_small_result_is_counted_once_then_cached():
+    """Below the threshold the exact count is used and reused from the cache."""
+    db = FakeSession(estimate=40, total=37)
+    first = await count_total(db, select(Breed), "breeds", {"fci_group": 1})
+    second = await count_total(db, select(Breed), "breeds", {"fci_group": 1})
+
+    assert (first.total, first.kind) == (37, "exact")
+    assert (second.total, second.kind) == (37, "exact")
+    assert len(db.statements) == 2  # EXPLAIN + COUNT, nothing for the cache hit
+
+
+async def test_large_result_uses_planner_estimate():
+    """At or above the threshold the EXPLAIN estimate is returned without counting."""
+    db = FakeSession(estimate=settings.COUNT_ESTIMATE_THRESHOLD, total=0)
+    count = await count_total(db, select(Breed), "breeds", {})
+
+    assert (count.total, count.kind) == (settings.COUNT_ESTIMATE_THRESHOLD, "estimated")
+    assert len(db.statements) == 1
+
+
+async def test_include_total_false_skips_counting():
+    """include_total=False should not touch the database."""
+    db = FakeSession(estimate=1, total=1)
+    count = await count_total(db, select(Breed), "breeds", {}, include_total=False)
+
+    assert (count.total, count.kind) == (None, None)
+    assert db.statements == []
@@ -0,0 +1,127 @@
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.dog import Dog, DogSex
+from app.services import dog_service
+from app.services.breed_catalog import breed_catalog
+
+pytestmark = pytest.mark.usefixtures("breed_catalog")
+
+DOG_ID = uuid.uuid4()
+
+
+class FakeSession:
+    """Serves the dog lookup, the page of (dog, depth) rows and the generation counts."""
+
+    def __init__(self, rows=(), counts=()):
+        self.rows = rows
+        self.counts = counts
+        self.sql = []
+        self.info = {}
+
+    async def execute(self, query):
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        self.sql.append(sql)
+        if len(self.sql) == 1:
+            return SimpleNamespace(scalar_one_or_none=lambda: make_dog("Rex", DOG_ID))
+        rows = self.counts if "count(*)" in sql else self.rows
+        return SimpleNamespace(all=lambda: list(rows))
+
+    async def merge(self, instance, load=True):
+        return instance
+
+
+def make_dog(name, dog_id=None):
+    """Stand-in for a loaded Dog whose breed resolves from the catalog."""
+    fields = dict.fromkeys(Dog.__table__.columns.keys())
+    fields.update(
+        id=dog_id or uuid.uuid4(), name=name, sex=DogSex.male, date_of_birth=date(2020, 1, 1),
+        breed_id=7, owner_id=uuid.uuid4(), is_active=True,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), breed=breed_catalog.get(7),
+    )
+    return SimpleNamespace(**fields)
+
+
+def ordered(*names):
+    """Dogs with ascending IDs, in the order the keyset query returns them."""
+    return [make_dog(name, uuid.UUID(int=i + 1)) for i, name in enumerate(names)]
+
+
+async def test_descendant_query_seeks_the_closure_table_nearest_first():
+    """One bounded, index-ordered query over the closure table, skipping longer paths."""
+    db = FakeSession()
+    await dog_service.list_descendants(db, DOG_ID, generations=4, limit=10)
+    page_sql = db.sql[1]
+
+    assert "JOIN dog_ancestry ON dog_ancestry.descendant_id = dogs.id" in page_sql
+    assert "dog_ancestry.depth > " in page_sql and "dog_ancestry.depth <= " in page_sql
+    # A row only counts if no shorter path from the same ancestor reaches the dog
+    assert "NOT (EXISTS (SELECT" in page_sql
+    assert "dog_ancestry_1.descendant_id = dog_ancestry.descendant_id" in page_sql
+    assert "dog_ancestry_1.depth < dog_ancestry.depth" in page_sql
+    assert "ORDER BY dog_ancestry.depth, dog_ancestry.descendant_id" in page_sql
+    assert "LIMIT " in page_sql
+
+
+async def test_first_page_has_generation_counts_and_next_cursor():
+    """The first page counts every generation; an extra row means there is a next page."""
+    azor, burek, cezar = ordered("Azor", "Burek", "Cezar")
+    db = FakeSession(rows=[(azor, 1), (burek, 1), (cezar, 2)], counts=[(1, 2), (2, 5)])
+
+    page = await dog_service.list_descendants(db, DOG_ID, limit=2)
+
+    assert [(item.name, item.generation) for item in page.items] == [("Azor", 1), ("Burek", 1)]
+    assert page.items[0].breed.name_pl == "Beagle"
+    assert page.generation_counts == {1: 2, 2: 5}
+    assert decode_cursor(page.next_cursor, f"descendants:{DOG_ID}") == (
+        "next", [1, str(burek.id)],
+    )
+    assert len(db.sql) == 3
+
+
+async def test_later_pages_seek_past_the_cursor_without_counting():
+    """A cursor continues after (depth, descendant_id); counts aren't repeated."""
+    (cezar,) = ordered("Cezar")
+    cursor = encode_cursor(f"descendants:{DOG_ID}", "next", [1, str(uuid.UUID(int=9))])
+    db = FakeSession(rows=[(cezar, 2)])
+
+    page = await dog_service.list_descendants(db, DOG_ID, cursor=cursor, limit=2)
+
+    assert [(item.name, item.generation) for item in page.items] == [("Cezar", 2)]
+    assert page.generation_counts is None
+    assert page.next_cursor is None
+    assert len(db.sql) == 2
+    assert "(dog_ancestry.depth, dog_ancestry.descendant_id) > (" in db.sql[1]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        # Signed for another dog's descendants
+        encode_cursor(f"descendants:{uuid.uuid4()}", "next", [1, str(uuid.uuid4())]),
+        # Signed, but not a (depth, id) pair
+        encode_cursor(f"descendants:{DOG_ID}", "next", [1, "not-a-uuid"]),
+        encode_cursor(f"descendants:{DOG_ID}", "next", [1]),
+        "garbage",
+    ],
+)
+async def test_foreign_or_malformed_cursor_rejected(cursor):
+    """Cursors that don't belong to this dog's list are refused before the page query."""
+    db = FakeSession()
+    with pytest.raises(ValueError, match="kursor"):
+        await dog_service.list_descendants(db, DOG_ID, cursor=cursor)
+    assert len(db.sql) == 1
+
+
+async def test_tampered_cursor_rejected():
+    """A cursor whose payload was edited fails the signature check."""
+    cursor = encode_cursor(f"descendants:{DOG_ID}", "next", [1, str(uuid.uuid4())])
+    forged = encode_cursor(f"descendants:{DOG_ID}", "next", [0, str(uuid.uuid4())])
+    tampered = f"{forged.split('.')[0]}.{cursor.split('.')[1]}"
+    with pytest.raises(ValueError, match="kursor"):
+        await dog_service.list_descendants(FakeSession(), DOG_ID, cursor=tampered)
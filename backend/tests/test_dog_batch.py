@@ -0,0 +1,70 @@
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.config import settings
+from app.models.dog import Dog, DogSex
+from app.services import dog_service
+from app.services.breed_catalog import breed_catalog
+
+pytestmark = pytest.mark.usefixtures("breed_catalog")
+
+
+class FakeSession:
+    """Returns the given dogs for the batch query and keeps the compiled SQL."""
+
+    def __init__(self, *dogs):
+        self.dogs = dogs
+        self.sql = []
+        self.info = {}
+
+    async def execute(self, query):
+        self.sql.append(str(query.compile(dialect=asyncpg.dialect())))
+        dogs = self.dogs
+        return SimpleNamespace(scalars=lambda: iter(dogs))
+
+    async def merge(self, instance, load=True):
+        return instance
+
+
+def make_dog(name):
+    """Stand-in for a loaded Dog whose breed resolves from the catalog."""
+    fields = dict.fromkeys(Dog.__table__.columns.keys())
+    fields.update(
+        id=uuid.uuid4(), name=name, sex=DogSex.male, date_of_birth=date(2020, 1, 1),
+        breed_id=7, owner_id=uuid.uuid4(), is_active=True,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), breed=breed_catalog.get(7),
+    )
+    return SimpleNamespace(**fields)
+
+
+async def test_batch_is_one_query_keyed_by_id():
+    """Found dogs are keyed by ID in request order; the rest are listed as missing."""
+    rex, azor = make_dog("Rex"), make_dog("Azor")
+    unknown = uuid.uuid4()
+    db = FakeSession(azor, rex)
+
+    response = await dog_service.get_dogs_by_ids(db, [rex.id, unknown, azor.id, rex.id])
+
+    assert list(response.items) == [rex.id, azor.id]
+    assert response.items[rex.id].breed.name_pl == "Beagle"
+    assert response.missing == [unknown]
+    assert len(db.sql) == 1
+    assert "dogs.id = ANY ($1::UUID[])" in db.sql[0]
+
+
+async def test_batch_limit(monkeypatch):
+    """More distinct IDs than DOG_BATCH_MAX_IDS should be refused."""
+    monkeypatch.setattr(settings, "DOG_BATCH_MAX_IDS", 2)
+    with pytest.raises(ValueError):
+        await dog_service.get_dogs_by_ids(FakeSession(), [uuid.uuid4() for _ in range(3)])
+
+
+async def test_empty_batch_skips_the_query():
+    """No IDs, no query."""
+    db = FakeSession()
+    response = await dog_service.get_dogs_by_ids(db, [])
+    assert (response.items, response.missing, db.sql) == ({}, [], [])
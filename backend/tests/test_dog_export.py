@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.models.dog import DogSex
+from app.services import dog_export_service
+
+pytestmark = pytest.mark.usefixtures("breed_catalog")
+
+SIRE_ID = uuid.uuid4()
+
+
+def make_row(name):
+    mapping = {
+        "id": uuid.uuid4(), "name": name, "call_name": None, "registration_number": "PKR-1",
+        "microchip_number": None, "sex": DogSex.female, "date_of_birth": date(2021, 3, 1),
+        "breed_id": 7, "color": None, "titles": None,
+        "sire_id": SIRE_ID, "sire_registration_number": "PKR-0",
+        "dam_id": None, "dam_registration_number": None,
+        "owner_id": uuid.uuid4(), "created_at": datetime(2024, 1, 2, tzinfo=timezone.utc),
+    }
+    return SimpleNamespace(_mapping=mapping, breed_id=7)
+
+
+class FakeStream:
+    def __init__(self, partitions):
+        self._partitions = partitions
+
+    async def partitions(self):
+        for partition in self._partitions:
+            yield partition
+
+
+class FakeSession:
+    """Streams prepared partitions; the breed catalog is already loaded."""
+
+    opened = 0
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.statement = None
+
+    async def __aenter__(self):
+        FakeSession.opened += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, statement):
+        self.statement = statement
+        return FakeStream(self.partitions)
+
+
+def test_export_query_joins_parents_and_applies_filters():
+    """Parent registration numbers come from outer joins; list filters still apply."""
+    query = dog_export_service.export_query(sort_by="name", breed_id=7)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("LEFT OUTER JOIN dogs AS") == 2
+    assert "dogs.is_active = true" in sql and "dogs.breed_id =" in sql
+    assert sql.endswith("ORDER BY dogs.name, dogs.id")
+
+
+async def test_ndjson_export_streams_one_chunk_per_partition():
+    """Each server-side partition should become one chunk of NDJSON lines."""
+    session = FakeSession([[make_row("A"), make_row("B")], [make_row("C")]])
+
+    chunks = [
+        chunk async for chunk in dog_export_service.export_dogs(
+            "ndjson", session_factory=lambda: session
+        )
+    ]
+
+    assert len(chunks) == 2
+    records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [r["name"] for r in records] == ["A", "B", "C"]
+    assert records[0]["breed_name"] == "Beagle"
+    assert records[0]["sex"] == "female"
+    assert records[0]["sire_id"] == str(SIRE_ID)
+    assert session.statement.get_execution_options()["yield_per"] == 1000
+
+
+async def test_csv_header_is_sent_before_the_query():
+    """The first byte shouldn't wait for the database."""
+    FakeSession.opened = 0
+    session = FakeSession([[make_row("A")]])
+    chunks = dog_export_service.export_dogs("csv", session_factory=lambda: session)
+
+    header = await anext(chunks)
+    assert FakeSession.opened == 0
+    body = "".join([header] + [chunk async for chunk in chunks])
+
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert rows[0]["name"] == "A"
+    assert rows[0]["date_of_birth"] == "2021-03-01"
+    assert rows[0]["sire_registration_number"] == "PKR-0"
+    assert rows[0]["dam_id"] == ""
+
+
+async def test_export_requires_authentication():
+    """Anonymous clients can't download the full dog table."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/dogs/export")
+    assert response.status_code in (401, 403)
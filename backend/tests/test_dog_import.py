@@ -0,0 +1,188 @@
+import uuid
+from collections import namedtuple
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.sql import Insert
+
+from app.config import settings
+from app.models.dog import DogSex
+from app.services import ancestry_service, dog_import_service
+
+pytestmark = pytest.mark.usefixtures("breed_catalog")
+
+ParentRow = namedtuple("ParentRow", "id sex date_of_birth registration_number")
+NumberRow = namedtuple("NumberRow", "registration_number microchip_number")
+
+
+class FakeSession:
+    """Serves taken numbers / existing parents and records INSERTs and COPYs."""
+
+    def __init__(self, parents=(), taken=()):
+        self.parents = list(parents)
+        self.taken = list(taken)
+        self.selects = 0
+        self.inserted = []
+        self.copied = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            for values in statement._multi_values[0]:
+                self.inserted.append({getattr(k, "key", k): v for k, v in values.items()})
+            return None
+        self.selects += 1
+        return iter(self.parents if "date_of_birth" in str(statement) else self.taken)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def connection(self):
+        async def get_raw_connection():
+            return SimpleNamespace(driver_connection=self)
+
+        return SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    async def copy_records_to_table(self, table, columns, records):
+        self.copied += [dict(zip(columns, record)) for record in records]
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    recorded = []
+
+    async def add_generations(db, levels, batch_size=5000):
+        recorded.extend(levels)
+
+    monkeypatch.setattr(ancestry_service, "add_generations", add_generations)
+    return recorded
+
+
+def dog(name, sex, born, **extra):
+    return {"name": name, "sex": sex, "date_of_birth": born, "breed_id": 7, **extra}
+
+
+async def test_parents_resolve_inside_the_batch(generations):
+    """Offspring listed before their parents should still be linked, oldest first."""
+    rows = [
+        dog("Puppy", "female", "2022-05-01",
+            sire_registration_number="PKR-1", dam_registration_number="PKR-2"),
+        dog("Sire", "male", "2019-01-01", registration_number="PKR-1"),
+        dog("Dam", "female", "2019-06-01", registration_number="PKR-2"),
+    ]
+    db = FakeSession()
+
+    response = await dog_import_service.import_dogs(db, uuid.uuid4(), rows)
+
+    assert (response.created, response.failed) == (3, 0)
+    ids = {item.row: item.id for item in response.items}
+    assert [row["name"] for row in db.inserted] == ["Sire", "Dam", "Puppy"]
+    puppy = db.inserted[2]
+    assert (puppy["sire_id"], puppy["dam_id"]) == (ids[1], ids[2])
+    assert generations == [[ids[1], ids[2]], [ids[0]]]
+    assert db.selects == 1 and db.commits == 1
+
+
+async def test_parents_from_the_database_are_loaded_in_one_query(generations):
+    """Parents referenced by ID or registration number come from a single SELECT."""
+    sire_id, dam_id = uuid.uuid4(), uuid.uuid4()
+    db = FakeSession(parents=[
+        ParentRow(sire_id, DogSex.male, date(2018, 1, 1), "PKR-S"),
+        ParentRow(dam_id, DogSex.female, date(2018, 2, 1), None),
+    ])
+    rows = [dog("Puppy", "male", "2021-01-01", sire_registration_number="PKR-S", dam_id=dam_id)]
+
+    response = await dog_import_service.import_dogs(db, uuid.uuid4(), rows)
+
+    assert response.created == 1
+    assert (db.inserted[0]["sire_id"], db.inserted[0]["dam_id"]) == (sire_id, dam_id)
+    assert db.selects == 1
+
+
+async def test_copy_inserts_plain_values_and_leaves_the_commit(generations):
+    """copy=True sends the dogs through COPY on the session's connection, enums as text."""
+    rows = [
+        dog("Sire", "male", "2019-01-01", registration_number="PKR-1"),
+        dog("Puppy", "female", "2022-05-01", sire_registration_number="PKR-1"),
+    ]
+    db = FakeSession()
+
+    response = await dog_import_service.import_dogs(
+        db, uuid.uuid4(), rows, commit=False, copy=True
+    )
+
+    assert response.created == 2
+    assert db.inserted == []
+    assert [(row["name"], row["sex"]) for row in db.copied] == [
+        ("Sire", "male"), ("Puppy", "female"),
+    ]
+    assert type(db.copied[0]["sex"]) is str
+    assert db.copied[0]["date_of_birth"] == date(2019, 1, 1)
+    assert db.copied[1]["sire_id"] == db.copied[0]["id"]
+    assert db.commits == 0
+
+
+async def test_invalid_rows_are_reported_and_skipped(generations):
+    """Each bad row gets its own error; offspring of a rejected row are rejected too."""
+    rows = [
+        dog("", "male", "2020-01-01"),
+        dog("Unknown breed", "male", "2020-01-01", breed_id=99),
+        dog("Taken", "male", "2020-01-01", registration_number="PKR-9"),
+        dog("First", "male", "2020-01-01", registration_number="PKR-3"),
+        dog("Duplicate", "male", "2020-01-01", registration_number="PKR-3"),
+        dog("Not a sire", "male", "2021-01-01", dam_registration_number="PKR-3"),
+        dog("Bad parent", "female", "2020-01-01", registration_number="PKR-4",
+            sire_registration_number="PKR-404"),
+        dog("Orphaned", "male", "2022-01-01", dam_registration_number="PKR-4"),
+    ]
+    db = FakeSession(taken=[NumberRow("PKR-9", None)])
+
+    response = await dog_import_service.import_dogs(db, uuid.uuid4(), rows)
+
+    errors = {item.row: item.error for item in response.items}
+    assert (response.created, response.failed) == (1, 7)
+    assert errors[0].startswith("name:")
+    assert errors[1] == "Podana rasa nie istnieje"
+    assert errors[2] == errors[4] == "Pies z tym numerem rejestracyjnym już istnieje"
+    assert errors[3] is None
+    assert errors[5] == "Matka (dam) musi być psem płci żeńskiej"
+    assert errors[6] == "Ojciec (sire) musi być psem płci męskiej"
+    assert errors[7] == "Rodzic z wiersza 6 nie został zaimportowany"
+    assert [row["name"] for row in db.inserted] == ["First"]
+
+
+async def test_ndjson_lines_split_across_chunks():
+    """Lines should be reassembled however the stream is chunked."""
+    async def chunks():
+        yield b'{"a": 1}\n{"b"'
+        yield b': 2}\n\n{"c": 3}'
+
+    assert await dog_import_service.read_ndjson(chunks()) == ['{"a": 1}', '{"b": 2}', '{"c": 3}']
+
+
+def test_row_limit(monkeypatch):
+    """Imports above DOG_IMPORT_MAX_ROWS should be refused as a whole."""
+    monkeypatch.setattr(settings, "DOG_IMPORT_MAX_ROWS", 2)
+    with pytest.raises(ValueError, match="maksymalnie 2"):
+        dog_import_service.parse_json_array(b"[{}, {}, {}]")
+
+
+async def test_oversized_bodies_are_refused_while_reading(monkeypatch):
+    """Both body formats stop at DOG_IMPORT_MAX_BYTES instead of buffering the rest."""
+    monkeypatch.setattr(settings, "DOG_IMPORT_MAX_BYTES", 10)
+    read = []
+
+    async def chunks():
+        for chunk in (b'[{"a": 1},', b' {"b": 2},', b' {"c": 3}]'):
+            read.append(chunk)
+            yield chunk
+
+    with pytest.raises(ValueError, match="maksymalnie 10 bajtów"):
+        await dog_import_service.read_json_array(chunks())
+    assert len(read) == 2
+    with pytest.raises(ValueError, match="maksymalnie 10 bajtów"):
+        await dog_import_service.read_ndjson(chunks())
+    with pytest.raises(ValueError, match="maksymalnie 10 bajtów"):
+        dog_import_service.check_content_length("11")
+    dog_import_service.check_content_length("10")
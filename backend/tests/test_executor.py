@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+import bcrypt
+
+from app.core.executor import BoundedExecutor
+from app.core.security import verify_password_async
+
+
+async def test_run_respects_worker_limit_and_tracks_queue():
+    """No more than max_workers calls should run at once; the rest queue up."""
+    executor = BoundedExecutor("test", max_workers=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work(value):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return value * 2
+
+    results = await asyncio.gather(*(executor.run(work, i) for i in range(6)))
+    stats = executor.stats()
+    executor.shutdown()
+
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert peak == 2
+    assert (stats.queued, stats.running, stats.completed) == (0, 0, 6)
+    assert stats.max_queued >= 4
+
+
+async def test_event_loop_stays_responsive_during_blocking_work():
+    """Other coroutines should keep running while a worker is busy."""
+    executor = BoundedExecutor("test", max_workers=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+    executor.shutdown()
+
+    assert ticks == 5
+
+
+async def test_verify_password_async():
+    """Offloaded verification should accept the right password only."""
+    hashed = bcrypt.hashpw(b"haslo123", bcrypt.gensalt(rounds=4)).decode()
+
+    assert await verify_password_async("haslo123", hashed)
+    assert not await verify_password_async("haslo124", hashed)
@@ -0,0 +1,95 @@
+import pytest
+
+from app.core.genetics import InbreedingCalculator, Pedigree
+
+
+def test_founders_are_not_inbred():
+    """Dogs with unknown parents should have COI 0."""
+    calc = InbreedingCalculator(Pedigree.from_parents({"a": (None, None), "b": (None, None)}))
+    assert calc.inbreeding("a") == 0.0
+
+
+def test_full_sibling_mating():
+    """Offspring of full siblings should have COI 0.25."""
+    parents = {
+        "sire": (None, None),
+        "dam": (None, None),
+        "brother": ("sire", "dam"),
+        "sister": ("sire", "dam"),
+        "puppy": ("brother", "sister"),
+    }
+    calc = InbreedingCalculator(Pedigree.from_parents(parents))
+    assert calc.inbreeding("puppy") == pytest.approx(0.25)
+
+
+def test_half_sibling_mating():
+    """Offspring of half siblings should have COI 0.125."""
+    parents = {
+        "sire": (None, None),
+        "dam1": (None, None),
+        "dam2": (None, None),
+        "son": ("sire", "dam1"),
+        "daughter": ("sire", "dam2"),
+        "puppy": ("son", "daughter"),
+    }
+    calc = InbreedingCalculator(Pedigree.from_parents(parents))
+    assert calc.inbreeding("puppy") == pytest.approx(0.125)
+
+
+def test_inbred_common_ancestor():
+    """An inbred common ancestor should raise the offspring's COI above 0.125."""
+    parents = {
+        "s": (None, None),
+        "d": (None, None),
+        "b": ("s", "d"),
+        "g": ("s", "d"),
+        "x": ("b", "g"),  # COI 0.25
+        "m1": (None, None),
+        "m2": (None, None),
+        "son": ("x", "m1"),
+        "daughter": ("x", "m2"),
+        "puppy": ("son", "daughter"),
+    }
+    calc = InbreedingCalculator(Pedigree.from_parents(parents))
+    # Half-sibs through an ancestor with F=0.25: (1/2)^3 * (1 + 0.25)
+    assert calc.inbreeding("puppy") == pytest.approx(0.15625)
+
+
+def test_offspring_inbreeding_matches_real_offspring():
+    """Hypothetical mating COI should equal the COI of an actual litter."""
+    parents = {
+        "sire": (None, None),
+        "dam": (None, None),
+        "brother": ("sire", "dam"),
+        "sister": ("sire", "dam"),
+    }
+    calc = InbreedingCalculator(Pedigree.from_parents(parents))
+    assert calc.offspring_inbreeding("brother", "sister") == pytest.approx(0.25)
+    assert calc.offspring_inbreeding("sire", "sister") == pytest.approx(0.25)
+
+
+def test_cycle_is_rejected():
+    """A dog that is its own ancestor should raise ValueError."""
+    with pytest.raises(ValueError):
+        Pedigree.from_parents({"a": ("b", None), "b": ("a", None)})
+
+
+def test_offspring_inbreeding_many_matches_single():
+    """Batched test-mating COI should agree with the one-at-a-time calculation."""
+    parents = {
+        "s": (None, None),
+        "d": (None, None),
+        "b": ("s", "d"),
+        "g": ("s", "d"),
+        "x": ("b", "g"),
+        "m": (None, None),
+        "son": ("x", "m"),
+        "outsider": (None, None),
+        "dam": ("x", "g"),
+    }
+    calc = InbreedingCalculator(Pedigree.from_parents(parents))
+    sires = ["son", "b", "outsider", "x"]
+    batched = calc.offspring_inbreeding_many(sires, "dam")
+    single = [calc.offspring_inbreeding(sire, "dam") for sire in sires]
+    assert batched == pytest.approx(single)
+    assert batched[2] == 0.0
@@ -0,0 +1,80 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and end with +Inf, followed by _sum and _count."""
+    histogram = metrics.Histogram("latency_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    assert list(histogram.render()) == [
+        "# HELP latency_seconds Test.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_metric_without_samples_cannot_be_created():
+    """An incomplete Metric subclass fails when created, not at scrape time."""
+
+    class Incomplete(metrics.Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Test.")
+
+
+async def test_middleware_labels_by_route_template():
+    """Requests are counted under the route template, unmatched paths under one label."""
+    test_app = FastAPI()
+    test_app.add_middleware(metrics.MetricsMiddleware)
+
+    @test_app.get("/test-metrics/{dog_id}")
+    async def get_dog(dog_id: int):
+        assert metrics.requests_in_flight.value() >= 1
+        return {}
+
+    route = "/test-metrics/{dog_id}"
+    before = metrics.requests_total.value("GET", route, "200")
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/test-metrics/1")
+        await client.get("/test-metrics/2")
+        await client.get("/nowhere")
+
+    assert metrics.requests_total.value("GET", route, "200") == before + 2
+    assert metrics.request_duration.count("GET", route) >= 2
+    assert metrics.requests_total.value("GET", "unmatched", "404") >= 1
+    assert metrics.requests_in_flight.value() == 0
+
+
+async def test_metrics_endpoint():
+    """/metrics reports request, pool, cache and thread pool metrics as text."""
+    cache = TTLCache(ttl=60)
+    cache.set("a", 1)
+    cache.get("a"), cache.get("a"), cache.get("b")
+    metrics.watch_cache("test", cache)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/api/health")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/health",status="200"}' in body
+    assert 'db_pool_connections{pool="primary",state="checked_out"} 0' in body
+    assert "# TYPE db_pool_wait_seconds histogram" in body
+    assert 'cache_hit_ratio{cache="test"} 0.6666666666666666' in body
+    assert 'cache_entries{cache="test"} 1' in body
+    assert 'executor_queued{executor="password"} 0' in body
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import decode_cursor, encode_cursor, paginate_keyset
+from app.models.breed import Breed
+
+
+class FakeSession:
+    """Returns the given rows for every query and keeps the compiled SQL."""
+
+    def __init__(self, *rows):
+        self.rows = rows
+        self.sql = []
+
+    async def execute(self, query):
+        self.sql.append(str(query.compile(dialect=postgresql.dialect())))
+        rows = self.rows
+        return SimpleNamespace(
+            scalars=lambda: SimpleNamespace(unique=lambda: SimpleNamespace(all=lambda: rows))
+        )
+
+
+def breed(breed_id, name_pl):
+    return SimpleNamespace(id=breed_id, name_pl=name_pl)
+
+
+def test_cursor_round_trip():
+    """A cursor should decode to the direction and values it was built from."""
+    cursor = encode_cursor("breeds", "next", ["Akita", 7])
+    assert decode_cursor(cursor, "breeds") == ("next", ["Akita", 7])
+
+
+def test_tampered_or_foreign_cursor_rejected():
+    """Edited cursors and cursors from another list should be refused."""
+    cursor = encode_cursor("breeds", "next", ["Akita", 7])
+    signature = cursor.split(".")[1]
+    forged = encode_cursor("breeds", "next", ["Beagle", 8]).split(".")[0]
+    with pytest.raises(ValueError, match="kursor"):
+        decode_cursor(f"{forged}.{signature}", "breeds")
+    with pytest.raises(ValueError, match="kursor"):
+        decode_cursor(cursor, "users")
+    with pytest.raises(ValueError, match="kursor"):
+        decode_cursor("garbage", "breeds")
+
+
+async def test_first_page_has_only_next_cursor():
+    """An empty cursor starts at the top; the extra row signals a next page."""
+    db = FakeSession(breed(1, "Akita"), breed(2, "Beagle"), breed(3, "Chart"))
+    page = await paginate_keyset(db, select(Breed), [Breed.name_pl, Breed.id], "breeds", "", 2)
+
+    assert [b.name_pl for b in page.items] == ["Akita", "Beagle"]
+    assert page.prev_cursor is None
+    assert decode_cursor(page.next_cursor, "breeds") == ("next", ["Beagle", 2])
+    assert "WHERE" not in db.sql[0]
+
+
+async def test_prev_cursor_seeks_backwards():
+    """A prev cursor should seek below the key in reverse order and restore the order."""
+    cursor = encode_cursor("breeds", "prev", ["Chart", 3])
+    db = FakeSession(breed(2, "Beagle"), breed(1, "Akita"))
+    page = await paginate_keyset(
+        db, select(Breed), [Breed.name_pl, Breed.id], "breeds", cursor, 2
+    )
+
+    assert [b.name_pl for b in page.items] == ["Akita", "Beagle"]
+    assert page.prev_cursor is None
+    assert decode_cursor(page.next_cursor, "breeds") == ("next", ["Beagle", 2])
+    assert "(breeds.name_pl, breeds.id) < (" in db.sql[0]
+    assert "ORDER BY breeds.name_pl DESC, breeds.id DESC" in db.sql[0]
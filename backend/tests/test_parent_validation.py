@@ -0,0 +1,64 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.dog import DogSex
+from app.services.dog_service import _validate_parents
+
+
+class FakeSession:
+    """Returns the given parent rows for the single validation query."""
+
+    def __init__(self, *rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        return self.rows
+
+
+def parent(sex, born=date(2018, 1, 1), is_descendant=False):
+    return SimpleNamespace(
+        id=uuid.uuid4(), sex=sex, date_of_birth=born, is_descendant=is_descendant
+    )
+
+
+async def test_valid_parents_use_one_query():
+    """Valid sire and dam should pass with a single database round trip."""
+    sire, dam = parent(DogSex.male), parent(DogSex.female)
+    db = FakeSession(sire, dam)
+    await _validate_parents(db, date(2021, 5, 1), sire.id, dam.id, dog_id=uuid.uuid4())
+    assert db.queries == 1
+
+
+async def test_wrong_sex_rejected():
+    """A female given as sire should raise ValueError."""
+    sire = parent(DogSex.female)
+    with pytest.raises(ValueError, match="Ojciec"):
+        await _validate_parents(FakeSession(sire), date(2021, 5, 1), sire.id, None)
+
+
+async def test_parent_born_after_offspring_rejected():
+    """A parent must be born before the dog."""
+    dam = parent(DogSex.female, born=date(2022, 1, 1))
+    with pytest.raises(ValueError, match="urodzić"):
+        await _validate_parents(FakeSession(dam), date(2021, 5, 1), None, dam.id)
+
+
+async def test_descendant_as_parent_rejected():
+    """Choosing one of the dog's descendants as its parent should be a cycle error."""
+    sire = parent(DogSex.male, is_descendant=True)
+    with pytest.raises(ValueError, match="przodkiem"):
+        await _validate_parents(
+            FakeSession(sire), date(2021, 5, 1), sire.id, None, dog_id=uuid.uuid4()
+        )
+
+
+async def test_no_parents_skips_query():
+    """Without parent changes no query should be made."""
+    db = FakeSession()
+    await _validate_parents(db, date(2021, 5, 1), None, None)
+    assert db.queries == 0
@@ -0,0 +1,56 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+from app.models.dog import DogSex
+from app.services.pedigree_service import build_pedigree_tree
+
+BREED = SimpleNamespace(id=1, name_pl="Border Collie", name_en="Border Collie", fci_group=1)
+
+
+def make_dog(sex=DogSex.male, sire_id=None, dam_id=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name="Pies",
+        sex=sex,
+        date_of_birth=date(2020, 1, 1),
+        breed=BREED,
+        registration_number=None,
+        photo_url=None,
+        sire_id=sire_id,
+        dam_id=dam_id,
+    )
+
+
+def test_build_tree_respects_generations():
+    """Parents beyond the generation limit should not be attached."""
+    grandsire = make_dog()
+    sire = make_dog(sire_id=grandsire.id)
+    dam = make_dog(sex=DogSex.female)
+    puppy = make_dog(sire_id=sire.id, dam_id=dam.id)
+    dogs = {d.id: d for d in (grandsire, sire, dam, puppy)}
+
+    tree = build_pedigree_tree(dogs, puppy.id, generations=2)
+
+    assert tree.sire.id == sire.id
+    assert tree.dam.id == dam.id
+    assert tree.sire.sire is None
+
+
+def test_build_tree_shared_ancestor_appears_on_both_sides():
+    """An ancestor reachable through sire and dam should appear in both branches."""
+    common = make_dog()
+    sire = make_dog(sire_id=common.id)
+    dam = make_dog(sex=DogSex.female, sire_id=common.id)
+    puppy = make_dog(sire_id=sire.id, dam_id=dam.id)
+    dogs = {d.id: d for d in (common, sire, dam, puppy)}
+
+    tree = build_pedigree_tree(dogs, puppy.id, generations=3)
+
+    assert tree.sire.sire.id == common.id
+    assert tree.dam.sire.id == common.id
+
+
+def test_build_tree_missing_root():
+    """Unknown root ID should return None."""
+    assert build_pedigree_tree({}, uuid.uuid4(), generations=3) is None
@@ -0,0 +1,111 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.core.query_budget import QueryBudgetMiddleware, query_budget
+from app.core.sql_metrics import uncounted
+from app.main import app
+from app.models.dog import DogSex
+from app.services import user_service
+
+engine = create_engine("sqlite://")
+
+
+def run_queries(n):
+    with engine.connect() as conn:
+        for _ in range(n):
+            conn.execute(text("SELECT 1"))
+
+
+def test_counter_sees_engine_statements(query_counter):
+    """Statements sent through any Engine are counted, except in uncounted() blocks."""
+    run_queries(2)
+    with uncounted():
+        run_queries(1)
+
+    assert query_counter.count == 2
+    assert query_counter.statements == ["SELECT 1", "SELECT 1"]
+
+
+def test_every_endpoint_declares_a_budget():
+    """New endpoints have to state how many statements they may run."""
+    missing = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute) and not hasattr(route.endpoint, "query_budget")
+    ]
+    assert missing == []
+
+
+def budget_app():
+    test_app = FastAPI()
+    test_app.add_middleware(QueryBudgetMiddleware)
+
+    @test_app.get("/within")
+    @query_budget(2)
+    async def within():
+        run_queries(2)
+        return {"ok": True}
+
+    @test_app.get("/over")
+    @query_budget(1)
+    async def over():
+        run_queries(2)
+        return {"ok": True}
+
+    return test_app
+
+
+@pytest.mark.parametrize(("path", "status", "count"), [("/within", 200, "2"), ("/over", 500, "2")])
+async def test_middleware_enforces_the_budget(path, status, count):
+    """Requests report their statement count and fail once they exceed the budget."""
+    transport = ASGITransport(app=budget_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(path)
+
+    assert response.status_code == status
+    assert response.headers["X-Query-Count"] == count
+
+
+class UserDogsSession:
+    """Answers the user/dogs query with the given rows and counts executions."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = 0
+        self.info = {}
+
+    async def execute(self, query):
+        self.executed += 1
+        return SimpleNamespace(all=lambda: self.rows)
+
+    async def merge(self, instance, load=True):
+        return instance
+
+
+async def test_user_dogs_is_one_query(breed_catalog):
+    """The user check and the dogs share one query; breeds come from the catalog."""
+    user_id = uuid.uuid4()
+    dog = SimpleNamespace(
+        id=uuid.uuid4(), name="Rex", sex=DogSex.male, date_of_birth=date(2020, 1, 1),
+        breed_id=7, owner_id=user_id,
+    )
+    db = UserDogsSession([(user_id, dog)])
+
+    assert await user_service.get_user_dogs(db, user_id) == [dog]
+    assert db.executed == 1
+    assert db.info["catalog_breeds"].keys() == {7}
+
+
+async def test_user_dogs_without_dogs_and_unknown_user(breed_catalog):
+    """A user without dogs gets an empty list; an unknown user is an error."""
+    user_id = uuid.uuid4()
+    assert await user_service.get_user_dogs(UserDogsSession([(user_id, None)]), user_id) == []
+    with pytest.raises(ValueError):
+        await user_service.get_user_dogs(UserDogsSession([]), user_id)
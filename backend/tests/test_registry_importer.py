@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.sql import Delete, Insert
+
+from app.config import settings
+from app.importers import registry
+from app.schemas.dog import DogImportResponse
+from app.services import dog_import_service
+
+pytestmark = pytest.mark.usefixtures("breed_catalog")
+
+CSV = """name,registration_number,sire_reg,dam_reg,breed,dob,sex
+Puppy,PKR-3,PKR-1,PKR-2,Beagle,2022-05-01,F
+Sire,PKR-1,,,beagle,2019-01-01,pies
+Dam,PKR-2,PKR-0,,Beagle,2019-06-01,suka
+No number,,PKR-3,,Beagle,2024-01-01,male
+Cat,PKR-4,,,Kot,2020-01-01,male
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "registry.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return path
+
+
+def test_first_pass_orders_parents_before_offspring(source):
+    """Generations follow the parent links, whatever the row order in the file."""
+    generations = registry.index_generations(source)
+
+    # PKR-0 is not in the file (an existing dog) and counts as a founder
+    assert generations == {"PKR-1": 0, "PKR-2": 0, "PKR-3": 1, "PKR-4": 0}
+
+
+def test_second_pass_spills_rows_per_generation(source, tmp_path):
+    """Rows land in gen-N files with their source line; unconvertible rows are rejected."""
+    errors_file = io.StringIO()
+    generations = registry.spill(
+        source, registry.index_generations(source), tmp_path, csv.writer(errors_file)
+    )
+
+    assert generations == [0, 1, 2]
+    gen0 = [line.split("\t") for line in (tmp_path / "gen-0.ndjson").read_text().splitlines()]
+    assert [int(line) for line, _ in gen0] == [3, 4]
+    sire = json.loads(gen0[0][1])
+    assert (sire["name"], sire["sex"], sire["breed_id"]) == ("Sire", "male", 7)
+    assert json.loads((tmp_path / "gen-2.ndjson").read_text().split("\t")[1])["name"] == "No number"
+    assert errors_file.getvalue().strip() == "6,PKR-4,Nieznana rasa: Kot"
+
+
+def test_chunks_resume_after_skipped_rows(tmp_path):
+    """read_chunks should skip already imported rows and keep source line numbers."""
+    path = tmp_path / "gen-0.ndjson"
+    path.write_text("".join(f"{line}\t{{}}\n" for line in range(2, 7)))
+
+    chunks = list(registry.read_chunks(path, chunk_size=2, skip=1))
+
+    assert [[line for line, _ in chunk] for chunk in chunks] == [[3, 4], [5, 6]]
+
+
+def test_checkpoint_only_restores_for_the_same_file(source, tmp_path):
+    """A checkpoint should be ignored once the source file changes."""
+    checkpoint = registry.Checkpoint(tmp_path / "checkpoint.json", source)
+    checkpoint.generations = [0, 1]
+    checkpoint.save()
+    checkpoint.save()
+
+    restored = registry.Checkpoint(tmp_path / "checkpoint.json", source)
+    assert restored.load()
+    assert (restored.import_id, restored.generations) == (checkpoint.import_id, [0, 1])
+
+    source.write_text(CSV + "Extra,PKR-9,,,Beagle,2020-01-01,M\n", encoding="utf-8")
+    assert not registry.Checkpoint(tmp_path / "checkpoint.json", source).load()
+
+
+DELETED = object()
+
+
+class ImportSession:
+    """Keeps imported rows and progress changes pending until commit; can fail a commit."""
+
+    def __init__(self, fail_commit=None):
+        self.fail_commit = fail_commit
+        self.commits = 0
+        self.pending_rows, self.rows = [], []
+        self.pending_progress = self.progress = None
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            params = statement.compile().params
+            self.pending_progress = (params["generation_index"], params["rows_done"])
+            return None
+        if isinstance(statement, Delete):
+            self.pending_progress = DELETED
+            return None
+        progress = self.progress
+        return SimpleNamespace(one_or_none=lambda: progress)
+
+    async def commit(self):
+        self.commits += 1
+        if self.commits == self.fail_commit:
+            self.pending_rows, self.pending_progress = [], None
+            raise ConnectionError("server closed the connection")
+        self.rows += self.pending_rows
+        self.pending_rows = []
+        if self.pending_progress is DELETED:
+            self.progress = None
+        else:
+            self.progress = self.pending_progress or self.progress
+        self.pending_progress = None
+
+
+async def test_resume_after_a_failed_commit_imports_every_row_once(tmp_path, monkeypatch):
+    """The position is committed with its chunk, so a resume repeats only the lost chunk."""
+    for generation, lines in ((0, range(2, 5)), (1, range(5, 7))):
+        (tmp_path / f"gen-{generation}.ndjson").write_text(
+            "".join(f"{line}\t{json.dumps({'line': line})}\n" for line in lines)
+        )
+
+    async def import_dogs(db, owner_id, rows, commit=True, copy=False):
+        assert copy and not commit
+        db.pending_rows += [json.loads(row)["line"] for row in rows]
+        return DogImportResponse(created=len(rows), failed=0, items=[])
+
+    monkeypatch.setattr(dog_import_service, "import_dogs", import_dogs)
+    source = tmp_path / "gen-0.ndjson"
+    db = ImportSession(fail_commit=2)
+    checkpoint = registry.Checkpoint(tmp_path / "checkpoint.json", source)
+    checkpoint.generations = [0, 1]
+    checkpoint.save()
+
+    with pytest.raises(ConnectionError):
+        await registry.import_generations(
+            db, uuid.uuid4(), checkpoint, tmp_path, 2, io.StringIO()
+        )
+    assert (db.rows, db.progress) == ([2, 3], (0, 2))
+
+    resumed = registry.Checkpoint(tmp_path / "checkpoint.json", source)
+    resumed.import_id, resumed.generations = checkpoint.import_id, [0, 1]
+    assert await resumed.load_progress(db)
+    await registry.import_generations(db, uuid.uuid4(), resumed, tmp_path, 2, io.StringIO())
+
+    assert db.rows == [2, 3, 4, 5, 6]
+    # A finished import leaves nothing to resume
+    assert db.progress is None
+    assert not (tmp_path / "checkpoint.json").exists()
+    assert not await resumed.load_progress(db)
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "10001"])
+def test_chunk_size_is_checked_before_the_import_starts(source, monkeypatch, chunk_size):
+    """Chunks import_dogs would refuse are rejected on the command line."""
+    monkeypatch.setattr(settings, "DOG_IMPORT_MAX_ROWS", 10000)
+    argv = ["registry", str(source), "--owner-email", "a@example.com", "--chunk-size", chunk_size]
+    monkeypatch.setattr("sys.argv", argv)
+
+    with pytest.raises(SystemExit) as exit_info:
+        registry.main()
+    assert exit_info.value.code == 2
@@ -0,0 +1,40 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.search import contains, fuzzy_match, normalize_text
+from app.models.breed import Breed
+from app.models.dog import Dog
+
+
+def compile_sql(clause) -> str:
+    return str(
+        clause.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+
+def test_normalize_text_strips_polish_diacritics():
+    """Case and Polish letters (including ł) should fold to plain ASCII."""
+    assert normalize_text("Owczarek Podhalański") == "owczarek podhalanski"
+    assert normalize_text("  ŁÓDŹ żółć ") == "lodz zolc"
+
+
+def test_contains_uses_indexed_search_form():
+    """Substring search should compare f_unaccent(lower(column)) with a normalized pattern."""
+    sql = compile_sql(contains([Dog.name], "Łatka"))
+    assert sql == "f_unaccent(lower(dogs.name)) LIKE '%latka%' ESCAPE '\\'"
+
+
+def test_contains_matches_wildcards_literally():
+    """A search for "_" or "%" should not match everything."""
+    sql = compile_sql(contains([Dog.name], "50%_off"))
+    assert sql == "f_unaccent(lower(dogs.name)) LIKE '%50\\%\\_off%' ESCAPE '\\'"
+
+
+def test_fuzzy_match_ranks_by_best_column():
+    """Fuzzy search should match either column and rank by the best word similarity."""
+    condition, rank = fuzzy_match([Breed.name_pl, Breed.name_en], "owczarek")
+    query = compile_sql(select(Breed.id).where(condition).order_by(rank.desc()))
+
+    assert "f_unaccent(lower(breeds.name_en)) %> 'owczarek'" in query
+    ranking = "greatest(word_similarity('owczarek', f_unaccent(lower(breeds.name_pl)))"
+    assert f"ORDER BY {ranking}" in query
@@ -0,0 +1,71 @@
+import logging
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.core.sql_metrics import SqlMetricsMiddleware, count_queries, normalize_sql
+
+engine = create_engine("sqlite://")
+
+
+def test_normalize_sql():
+    """Literals and parameters become ?, parameter lists collapse, whitespace is one line."""
+    sql = normalize_sql(
+        "SELECT dogs.id_1 FROM dogs\n  WHERE dogs.name = 'Rex'  AND dogs.id IN ($1, $2, $3)"
+        " AND dogs.breed_id = 7 LIMIT $4::INTEGER"
+    )
+    assert sql == (
+        "SELECT dogs.id_1 FROM dogs WHERE dogs.name = ? AND dogs.id IN (...)"
+        " AND dogs.breed_id = ? LIMIT ?::INTEGER"
+    )
+
+
+def test_nested_counters_see_every_statement():
+    """An outer count keeps counting while an inner one is active."""
+    with engine.connect() as conn, count_queries() as outer:
+        conn.execute(text("SELECT 1"))
+        with count_queries() as inner:
+            conn.execute(text("SELECT 2"))
+
+    assert (outer.count, inner.count) == (2, 1)
+    assert outer.duration >= inner.duration > 0
+    assert outer.slowest_statement is not None
+
+
+def test_slow_query_is_logged_with_plan(monkeypatch, caplog):
+    """Statements over the threshold are logged normalized, with their EXPLAIN output."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.core.sql_metrics"):
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT :x + 1"), {"x": 41}).all()
+
+    assert rows == [(42,)]  # EXPLAIN used its own cursor
+    record = next(r for r in caplog.records if r.getMessage().startswith("slow query"))
+    assert record.sql == "SELECT ? + ?"
+    assert record.plan
+
+
+async def test_middleware_reports_server_timing(caplog):
+    """Each response carries Server-Timing and each request one log line."""
+    test_app = FastAPI()
+    test_app.add_middleware(SqlMetricsMiddleware)
+
+    @test_app.get("/dogs/{dog_id}")
+    async def get_dog(dog_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {}
+
+    with caplog.at_level(logging.INFO, logger="app.core.sql_metrics"):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/dogs/5")
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and 'desc="2 queries"' in timing
+    assert "db-slowest;dur=" in timing and "app;dur=" in timing
+    record = next(r for r in caplog.records if r.getMessage().startswith("request"))
+    assert (record.route, record.status, record.sql_count) == ("/dogs/{dog_id}", 200, 2)
@@ -0,0 +1,92 @@
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.trie import PrefixTrie
+from app.models.dog import DogSex
+from app.services import breed_service, dog_service
+from app.services.breed_catalog import breed_catalog
+
+
+class FakeSession:
+    """Returns the given breed rows for the catalog query and counts queries."""
+
+    def __init__(self, *rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        rows = self.rows
+        return SimpleNamespace(mappings=lambda: iter(rows))
+
+
+class RecordingSession:
+    """Returns the given rows and keeps the compiled SQL of every query."""
+
+    def __init__(self, *rows):
+        self.rows = rows
+        self.sql = []
+
+    async def execute(self, query):
+        compiled = query.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True})
+        self.sql.append(str(compiled))
+        return self.rows
+
+
+def breed(breed_id, name_pl, name_en=None):
+    return {
+        "id": breed_id,
+        "name_pl": name_pl,
+        "name_en": name_en,
+        "fci_number": None,
+        "fci_group": None,
+        "fci_section": None,
+        "size_category": None,
+        "description_pl": None,
+        "image_url": None,
+    }
+
+
+def test_trie_returns_distinct_values_in_key_order():
+    """A value stored under several keys should be returned once, shortest keys first."""
+    trie = PrefixTrie()
+    trie.insert("owczarek niemiecki", "gsd")
+    trie.insert("niemiecki", "gsd")
+    trie.insert("owczarek podhalanski", "podhalan")
+    trie.insert("owca", "sheep")
+
+    assert trie.search("ow", 10) == ["sheep", "gsd", "podhalan"]
+    assert trie.search("ow", 2) == ["sheep", "gsd"]
+    assert trie.search("xyz", 10) == []
+
+
+async def test_breed_suggestions_match_any_word_without_diacritics():
+    """Breeds should match on any name word, ignoring case and Polish letters."""
+    breed_catalog.invalidate()
+    db = FakeSession(
+        breed(1, "Owczarek niemiecki", "German Shepherd Dog"),
+        breed(2, "Owczarek podhalański", "Tatra Shepherd Dog"),
+        breed(3, "Łajka rosyjsko-europejska", "Russian-European Laika"),
+    )
+
+    assert [b.id for b in await breed_service.suggest_breeds(db, "Niem")] == [1]
+    assert [b.id for b in await breed_service.suggest_breeds(db, "podhalan")] == [2]
+    assert [b.id for b in await breed_service.suggest_breeds(db, "laj")] == [3]
+    assert [b.id for b in await breed_service.suggest_breeds(db, "shepherd")] == [1, 2]
+    assert db.queries == 1
+    breed_catalog.invalidate()
+
+
+async def test_dog_suggestions_use_one_prefix_query():
+    """Dog typeahead should be a single byte-ordered prefix range scan with a limit."""
+    dog = SimpleNamespace(id=uuid.uuid4(), name="Reks z Doliny", registration_number="PKR-1")
+    db = RecordingSession(dog)
+    suggestions = await dog_service.suggest_dogs(db, "Reks_", sex=DogSex.male, limit=5)
+
+    assert [s.name for s in suggestions] == ["Reks z Doliny"]
+    assert len(db.sql) == 1
+    assert """(f_unaccent(lower(dogs.name)) COLLATE "C") LIKE 'reks\\_%'""" in db.sql[0]
+    assert 'ORDER BY f_unaccent(lower(dogs.name)) COLLATE "C"' in db.sql[0]
+    assert db.sql[0].endswith("LIMIT 5")
@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.security import decode_token
+from app.services import token_store
+
+
+class FakeSession:
+    """Answers UPDATE ... RETURNING statements from a scripted list of rows."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.added = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        rows = self.results.pop(0)
+        return SimpleNamespace(
+            scalar_one_or_none=lambda: rows[0][0] if rows else None,
+            all=lambda: rows,
+        )
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture(autouse=True)
+def empty_revoked_set():
+    token_store.revoked_tokens.replace({})
+    yield
+    token_store.revoked_tokens.replace({})
+
+
+def issued_payload():
+    db = FakeSession()
+    token = token_store.issue(db, uuid.uuid4())
+    return db.added[0], decode_token(token)
+
+
+def test_issue_records_the_token_it_returns():
+    """The JWT's jti, family and expiry should match the stored row."""
+    row, payload = issued_payload()
+
+    assert payload["type"] == "refresh"
+    assert uuid.UUID(payload["jti"]) == row.jti
+    assert uuid.UUID(payload["fam"]) == row.family_id
+    assert payload["exp"] == int(row.expires_at.timestamp())
+
+
+async def test_rotate_revokes_the_token_and_keeps_the_family():
+    """First use should revoke the token and return its family for the next one."""
+    row, payload = issued_payload()
+    db = FakeSession([(row.expires_at,)])
+
+    assert await token_store.rotate(db, payload) == row.family_id
+    assert row.jti in token_store.revoked_tokens
+    assert len(db.statements) == 1
+
+
+async def test_replayed_token_is_caught_in_memory_and_revokes_family():
+    """A token already in the revoked set should skip the UPDATE and revoke its family."""
+    row, payload = issued_payload()
+    sibling = (uuid.uuid4(), row.expires_at)
+    token_store.revoked_tokens.add(row.jti, row.expires_at)
+    db = FakeSession([sibling])
+
+    with pytest.raises(ValueError, match="już użyty"):
+        await token_store.rotate(db, payload)
+
+    assert len(db.statements) == 1
+    assert "family_id" in str(db.statements[0])
+    assert sibling[0] in token_store.revoked_tokens
+    assert db.commits == 1
+
+
+async def test_token_revoked_by_another_process_is_reuse():
+    """When the UPDATE matches nothing the token was used before."""
+    row, payload = issued_payload()
+    db = FakeSession([], [])
+
+    with pytest.raises(ValueError):
+        await token_store.rotate(db, payload)
+    assert len(db.statements) == 2
+
+
+def test_tokens_without_jti_are_rejected():
+    """Refresh tokens from before the store carry no jti."""
+    with pytest.raises(ValueError, match="Nieprawidłowy token"):
+        token_store.token_ids({"sub": str(uuid.uuid4()), "type": "refresh"})
+
+
+def test_revoked_set_forgets_expired_tokens():
+    """prune() should drop entries whose token has expired."""
+    now = datetime.now(timezone.utc)
+    revoked = token_store.RevokedTokens()
+    old, current = uuid.uuid4(), uuid.uuid4()
+    revoked.add(old, now - timedelta(minutes=1))
+    revoked.add(current, now + timedelta(days=1))
+
+    revoked.prune(now)
+
+    assert old not in revoked and current in revoked
+    assert len(revoked) == 1
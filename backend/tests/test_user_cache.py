@@ -0,0 +1,98 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.models.user import User
+from app.services import user_cache
+
+
+class FakeSession:
+    """Returns the given user for every query; merge() hands back the snapshot."""
+
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+        self.merged = []
+
+    async def execute(self, query):
+        self.queries += 1
+        user = self.user
+        return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    async def merge(self, instance, load=True):
+        self.merged.append(instance)
+        return instance
+
+
+def make_user(is_active=True):
+    return User(
+        id=uuid.uuid4(),
+        email="jan@example.com",
+        hashed_password="x",
+        first_name="Jan",
+        last_name="Kowalski",
+        is_active=is_active,
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    user_cache.user_cache.clear()
+    yield
+    user_cache.user_cache.clear()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The oldest untouched entry should go first and hits/misses are counted."""
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_ttl_cache_expires_entries():
+    """Entries older than the TTL should be treated as missing."""
+    cache = TTLCache(ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+async def test_repeat_lookup_skips_the_query():
+    """A second request by the same user should be served from the cache."""
+    user = make_user()
+    db = FakeSession(user)
+
+    first = await user_cache.get_active_user(db, user.id)
+    second = await user_cache.get_active_user(db, user.id)
+
+    assert first is user
+    assert second.id == user.id and second is not user
+    assert db.queries == 1
+    assert len(db.merged) == 1
+
+
+async def test_inactive_user_is_not_cached():
+    """Deactivated users should be rejected and never cached."""
+    user = make_user(is_active=False)
+    db = FakeSession(user)
+
+    assert await user_cache.get_active_user(db, user.id) is None
+    assert len(user_cache.user_cache) == 0
+
+
+async def test_invalidate_forces_reload():
+    """After invalidation the next lookup should query the database again."""
+    user = make_user()
+    db = FakeSession(user)
+    await user_cache.get_active_user(db, user.id)
+    user_cache.invalidate(user.id)
+    await user_cache.get_active_user(db, user.id)
+
+    assert db.queries == 2
@@ -1,7 +1,13 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 
 import { api, buildQuery } from "@/lib/api";
-import type { DogCreate, DogFilters, DogListResponse, DogResponse } from "@/lib/types";
+import type {
+  DogBatchResponse,
+  DogCreate,
+  DogFilters,
+  DogListResponse,
+  DogResponse,
+} from "@/lib/types";
 
 export function useDogs(filters: DogFilters = {}) {
   return useQuery({
@@ -19,6 +25,15 @@ export function useDog(id: string) {
   });
 }
 
+// Many dogs in one request (pedigree, litter and kennel pages)
+export function useDogsByIds(ids: string[]) {
+  return useQuery({
+    queryKey: ["dogs", "batch", ids],
+    queryFn: () => api.post<DogBatchResponse>("/api/dogs/batch", { ids }),
+    enabled: ids.length > 0,
+  });
+}
+
 export function useCreateDog() {
   const queryClient = useQueryClient();
   return useMutation({
@@ -18,6 +18,18 @@ export const tokens = {
   },
 };
 
+// ─── Read-your-writes ─────────────────────────────────────────────────────────
+
+// After a write the API answers with X-Primary-Until (unix time in seconds).
+// Sending it back keeps our reads off the lagging read replicas until then,
+// so the user sees their own changes right away.
+let primaryUntil = 0;
+
+function rememberPrimaryUntil(response: Response) {
+  const until = Number(response.headers.get("X-Primary-Until"));
+  if (until > primaryUntil) primaryUntil = until;
+}
+
 // ─── Internal fetch with auth + auto-refresh ──────────────────────────────────
 
 async function request<T>(
@@ -36,7 +48,12 @@ async function request<T>(
     headers["Authorization"] = `Bearer ${accessToken}`;
   }
 
+  if (primaryUntil > Date.now() / 1000) {
+    headers["X-Primary-Until"] = String(primaryUntil);
+  }
+
   const response = await fetch(`${BASE_URL}${path}`, { ...options, headers });
+  rememberPrimaryUntil(response);
 
   // If unauthorized and we haven't retried yet — try refreshing the token
   if (response.status === 401 && retry) {
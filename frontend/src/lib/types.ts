@@ -153,6 +153,11 @@ export interface DogUpdate {
 
 export type DogListResponse = PaginatedResponse<DogResponse>;
 
+export interface DogBatchResponse {
+  items: Record<string, DogResponse>;
+  missing: string[];
+}
+
 export interface PedigreeNode {
   id: string;
   name: string;